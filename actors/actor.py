@@ -1,6 +1,7 @@
 import pygame
 from gym_intrinsic.inventory import Inventory
 from gym_intrinsic.items import Block
+from gym_intrinsic.collision import sweep_rect
 
 class Actor:
     def __init__(self, x, y, tile_size):
@@ -41,24 +42,15 @@ class Actor:
     def apply_gravity(self, gravity):
         self.velocity[1] += gravity
 
-    def move_and_collide(self, blocks):
-        self.rect.x += int(self.velocity[0])
-        for rect, _ in blocks:
-            if self.rect.colliderect(rect):
-                if self.velocity[0] > 0:
-                    self.rect.right = rect.left
-                elif self.velocity[0] < 0:
-                    self.rect.left = rect.right
-                self.velocity[0] = 0
-
-        self.rect.y += int(self.velocity[1])
-        for rect, _ in blocks:
-            if self.rect.colliderect(rect):
-                if self.velocity[1] > 0:
-                    self.rect.bottom = rect.top
-                elif self.velocity[1] < 0:
-                    self.rect.top = rect.bottom
-                self.velocity[1] = 0
+    def move_and_collide(self, grid):
+        """Move by the current velocity, stopping at the first solid tile."""
+        hit_x, hit_y = sweep_rect(
+            grid, self.rect, int(self.velocity[0]), int(self.velocity[1]), self.tile_size
+        )
+        if hit_x:
+            self.velocity[0] = 0
+        if hit_y:
+            self.velocity[1] = 0
 
     def handle_oxygen(self, in_water):
         if in_water:
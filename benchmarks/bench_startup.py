@@ -0,0 +1,87 @@
+"""Worker startup benchmark: package import, env construction, first reset.
+
+    python benchmarks/bench_startup.py --repeat 5
+
+Every sample runs in a fresh interpreter so module caches don't hide the
+import cost; the best of ``--repeat`` samples is reported. Exits non-zero
+when a target is missed:
+
+* ``import gym_intrinsic`` costs at most IMPORT_OVERHEAD seconds on top of
+  ``import gym`` (needed for registration) and loads neither pygame nor
+  the simulation modules;
+* ``IntrinsicEnv()`` takes at most CONSTRUCT_TARGET seconds; the world is
+  generated by the first ``reset``.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_OVERHEAD = 0.05
+CONSTRUCT_TARGET = 0.005
+HEAVY_MODULES = ("pygame", "gym_intrinsic.items", "gym_intrinsic.world", "gym_intrinsic.intrinsic_env")
+
+_GYM_ONLY = """
+import json, time
+t = time.perf_counter()
+import gym
+print(json.dumps({"gym": time.perf_counter() - t}))
+"""
+
+_STARTUP = """
+import json, sys, time
+t0 = time.perf_counter()
+import gym_intrinsic
+t1 = time.perf_counter()
+loaded = [m for m in %r if m in sys.modules]
+from gym_intrinsic import IntrinsicEnv
+t2 = time.perf_counter()
+env = IntrinsicEnv()
+t3 = time.perf_counter()
+env.reset(seed=0)
+t4 = time.perf_counter()
+print(json.dumps({"package": t1 - t0, "env module": t2 - t1, "construct": t3 - t2,
+                  "first reset": t4 - t3, "loaded": loaded}))
+""" % (HEAVY_MODULES,)
+
+
+def _run(code: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=ROOT, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    out = subprocess.run([sys.executable, "-c", code], env=env, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark worker startup")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    gym_time = min(_run(_GYM_ONLY)["gym"] for _ in range(args.repeat))
+    samples = [_run(_STARTUP) for _ in range(args.repeat)]
+    best = {k: min(s[k] for s in samples) for k in ("package", "env module", "construct", "first reset")}
+    loaded = sorted({m for s in samples for m in s["loaded"]})
+
+    print(f"{'import gym':<22}{gym_time * 1000:9.1f} ms")
+    for name, value in best.items():
+        print(f"{name:<22}{value * 1000:9.1f} ms")
+
+    failures = []
+    if best["package"] - gym_time > IMPORT_OVERHEAD:
+        failures.append(f"package import adds {(best['package'] - gym_time) * 1000:.0f} ms to gym (target {IMPORT_OVERHEAD * 1000:.0f} ms)")
+    if loaded:
+        failures.append(f"package import loads {', '.join(loaded)}")
+    if best["construct"] > CONSTRUCT_TARGET:
+        failures.append(f"construction takes {best['construct'] * 1000:.1f} ms (target {CONSTRUCT_TARGET * 1000:.0f} ms)")
+    for failure in failures:
+        print("FAIL:", failure)
+    if not failures:
+        print("all startup targets met")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from gym.envs.registration import register
+import importlib
 import numpy as np
 
 # Older NumPy versions (<1.24) don't provide ``np.bool8`` which Gym
@@ -11,9 +12,32 @@ register(
     entry_point="gym_intrinsic.intrinsic_env:IntrinsicEnv",
 )
 
-from .intrinsic_env import IntrinsicEnv
-from .player import Player
-from .enemy_mobs import Enemy, Projectile
-from .passive_mobs import PassiveMob
+# Exports are imported on first access, so registering the environment
+# doesn't load pygame, the item table and the simulation modules. Light
+# submodules such as ``atlas`` load the world generator and item table but
+# not pygame.
+_EXPORTS = {
+    "IntrinsicEnv": ".intrinsic_env",
+    "Player": ".player",
+    "Enemy": ".enemy_mobs",
+    "Projectile": ".enemy_mobs",
+    "PassiveMob": ".passive_mobs",
+    "ActionRepeat": ".wrappers",
+    "NearestBlocksObservation": ".wrappers",
+    "LightObservation": ".wrappers",
+}
 
-__all__ = ["IntrinsicEnv", "Player", "Enemy", "Projectile", "PassiveMob"]
+__all__ = ["IntrinsicEnv", "Player", "Enemy", "Projectile", "PassiveMob", "ActionRepeat", "NearestBlocksObservation", "LightObservation"]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_EXPORTS])
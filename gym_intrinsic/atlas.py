@@ -0,0 +1,122 @@
+"""Pre-generated world atlases.
+
+    python -m gym_intrinsic.atlas OUT --seed 7 --x0 -4096 --x1 4096 --workers 8
+
+Builds the terrain of one seed over a global column range on a process
+pool and writes it as a chunked atlas directory:
+
+* ``meta.json``: seed, height, chunk size and the covered range ``[x0, x1)``;
+* ``chunks.npy``: ``int8`` array of shape ``(n_chunks, height, chunk_size)``,
+  one full-height stack of CHUNK_SIZE columns per entry, so each chunk
+  column is contiguous on disk.
+
+Workers write their batches straight into the memory-mapped file.
+``IntrinsicEnv(atlas=OUT)`` maps it read-only and copies columns from it
+instead of generating them.
+
+Batches are aligned to global multiples of ``BATCH_CHUNKS`` chunks and
+seed their decoration RNG from the batch index, so an atlas doesn't depend
+on the worker count or on how the range was split.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from . import world
+from .world import CHUNK_SIZE
+
+BATCH_CHUNKS = 16  # chunk columns generated per worker task
+FORMAT_VERSION = 1
+
+
+class Atlas:
+    """Read-only view of an atlas directory."""
+
+    def __init__(self, path):
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        if meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"unsupported atlas version {meta['version']}")
+        self.path = path
+        self.seed = meta["seed"]
+        self.height = meta["height"]
+        self.chunk_size = meta["chunk_size"]
+        self.x0, self.x1 = meta["x0"], meta["x1"]
+        self.chunks = np.load(path / "chunks.npy", mmap_mode="r")
+
+    def covers(self, gx: int) -> bool:
+        return self.x0 <= gx < self.x1
+
+    def columns(self, gx0: int, gx1: int) -> np.ndarray:
+        """Dense copy of the global columns [gx0, gx1) (inside the atlas)."""
+        cs = self.chunk_size
+        c0, c1 = (gx0 - self.x0) // cs, -(-(gx1 - self.x0) // cs)
+        stacks = self.chunks[c0:c1]
+        grid = stacks.transpose(1, 0, 2).reshape(self.height, -1)
+        start = gx0 - self.x0 - c0 * cs
+        return np.array(grid[:, start : start + gx1 - gx0])
+
+
+def _build_batch(path: str, seed: int, height: int, x0: int, gx0: int, gx1: int) -> int:
+    """Generate the global columns [gx0, gx1) into an atlas being built."""
+    cs = CHUNK_SIZE
+    rng = np.random.default_rng([seed & 0xFFFFFFFF, (gx0 // (BATCH_CHUNKS * cs)) & 0xFFFFFFFF])
+    grid = world.generate_world(gx1 - gx0, height, gx0, seed=seed, rng=rng)
+    chunks = np.load(Path(path) / "chunks.npy", mmap_mode="r+")
+    c0 = (gx0 - x0) // cs
+    chunks[c0 : c0 + (gx1 - gx0) // cs] = grid.reshape(height, -1, cs).transpose(1, 0, 2)
+    chunks.flush()
+    return gx1 - gx0
+
+
+def build_atlas(path, seed: int, x0: int, x1: int, height: int, workers: int | None = None) -> dict:
+    """Generate ``[x0, x1)`` (widened to whole batches) into ``path`` and
+    return build statistics."""
+    cs = CHUNK_SIZE
+    span = BATCH_CHUNKS * cs
+    x0, x1 = x0 // span * span, -(-x1 // span) * span
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    chunks = np.lib.format.open_memmap(
+        path / "chunks.npy", mode="w+", dtype=np.int8, shape=((x1 - x0) // cs, height, cs)
+    )
+    del chunks
+
+    start = time.perf_counter()
+    batches = [(str(path), seed, height, x0, gx, gx + span) for gx in range(x0, x1, span)]
+    with ProcessPoolExecutor(workers) as pool:
+        columns = sum(pool.map(_build_batch, *zip(*batches)))
+    seconds = time.perf_counter() - start
+
+    meta = {"version": FORMAT_VERSION, "seed": seed, "height": height, "chunk_size": cs, "x0": x0, "x1": x1}
+    (path / "meta.json").write_text(json.dumps(meta, indent=2))
+    return {"columns": columns, "seconds": seconds, "bytes": columns * height, **meta}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate a world atlas")
+    parser.add_argument("out", help="atlas directory to write")
+    parser.add_argument("--seed", type=int, default=0, help="terrain seed (see world.generate_world)")
+    parser.add_argument("--x0", type=int, default=-4096)
+    parser.add_argument("--x1", type=int, default=4096)
+    parser.add_argument("--depth", type=int, default=90, help="rows per column (IntrinsicEnv.grid_height)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    stats = build_atlas(args.out, args.seed, args.x0, args.x1, args.depth, args.workers)
+    print(
+        f"{stats['columns']} columns [{stats['x0']}, {stats['x1']}) x {stats['height']} rows "
+        f"in {stats['seconds']:.2f} s with {args.workers} workers: "
+        f"{stats['columns'] / stats['seconds']:.0f} columns/s, "
+        f"{stats['bytes'] / stats['seconds'] / 2**20:.1f} MiB/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Per-block-type spatial index for nearest-resource queries.
+
+Tiles of the tracked block types are kept in sets bucketed by chunk, so
+"nearest iron ore" only looks at chunks in order of distance instead of
+scanning the grid. Like ``SurfaceIndex`` the index stores global
+coordinates and its queries take and return local tiles.
+"""
+
+import numpy as np
+
+from .items import Block, ORE_TYPES
+from .world import CHUNK_SIZE
+
+# Block types indexed by default: resources an agent would go looking for
+TRACKED_BLOCKS = (*ORE_TYPES, Block.WATER, Block.WOOD, Block.CACTUS)
+
+
+class BlockIndex:
+    """Tile locations of selected block types, bucketed by chunk."""
+
+    def __init__(self, env, block_ids=TRACKED_BLOCKS, chunk_size: int = CHUNK_SIZE):
+        self.env = env
+        self.chunk_size = chunk_size
+        self.block_ids = tuple(int(b) for b in block_ids)
+        self._tracked = np.zeros(256, dtype=bool)
+        self._tracked[list(self.block_ids)] = True
+        self.chunks = {b: {} for b in self.block_ids}  # block -> (cx, cy) -> {(gx, y)}
+
+    # --- maintenance -------------------------------------------------------
+    def rebuild(self) -> None:
+        self.chunks = {b: {} for b in self.block_ids}
+        self.columns_added(0, self.env.grid_width)
+
+    def columns_added(self, x0: int, x1: int) -> None:
+        """Index the local columns [x0, x1) after generation."""
+        grid = self.env.grid[:, x0:x1]
+        ys, xs = np.nonzero(self._tracked[grid.view(np.uint8)])
+        off = self.env.world_x_offset + x0
+        for x, y, b in zip((xs + off).tolist(), ys.tolist(), grid[ys, xs].tolist()):
+            self._add(b, x, y)
+
+    def columns_removed(self, gx0: int, gx1: int) -> None:
+        """Forget the global columns [gx0, gx1), e.g. when they are evicted."""
+        c = self.chunk_size
+        for chunks in self.chunks.values():
+            for key in [k for k in chunks if gx0 // c <= k[0] <= (gx1 - 1) // c]:
+                tiles = {t for t in chunks[key] if not gx0 <= t[0] < gx1}
+                if tiles:
+                    chunks[key] = tiles
+                else:
+                    del chunks[key]
+
+    def blocks_changed(self, xs: np.ndarray, ys: np.ndarray, old: np.ndarray, new: np.ndarray) -> None:
+        """Update the index after the blocks at local (xs, ys) changed from
+        ``old`` to ``new``."""
+        old, new = old.view(np.uint8), new.view(np.uint8)
+        off = self.env.world_x_offset
+        c = self.chunk_size
+        gone = self._tracked[old]
+        for gx, y, b in zip((xs[gone] + off).tolist(), ys[gone].tolist(), old[gone].tolist()):
+            key = (gx // c, y // c)
+            tiles = self.chunks[b].get(key)
+            if tiles is not None:
+                tiles.discard((gx, y))
+                if not tiles:
+                    del self.chunks[b][key]
+        added = self._tracked[new]
+        for gx, y, b in zip((xs[added] + off).tolist(), ys[added].tolist(), new[added].tolist()):
+            self._add(b, gx, y)
+
+    def _add(self, block: int, gx: int, y: int) -> None:
+        key = (gx // self.chunk_size, y // self.chunk_size)
+        self.chunks[block].setdefault(key, set()).add((gx, y))
+
+    # --- queries -----------------------------------------------------------
+    def count(self, block: int) -> int:
+        return sum(len(t) for t in self.chunks.get(block, {}).values())
+
+    def _chunks_by_distance(self, block: int, gx: int, y: int):
+        """Chunk keys of ``block`` with their minimum distance to (gx, y),
+        nearest first."""
+        chunks = self.chunks.get(block)
+        if not chunks:
+            return [], np.zeros(0)
+        keys = list(chunks)
+        k = np.array(keys, dtype=np.int64) * self.chunk_size
+        dx = np.maximum(np.maximum(k[:, 0] - gx, gx - (k[:, 0] + self.chunk_size - 1)), 0)
+        dy = np.maximum(np.maximum(k[:, 1] - y, y - (k[:, 1] + self.chunk_size - 1)), 0)
+        dist = np.hypot(dx, dy)
+        order = np.argsort(dist, kind="stable")
+        return [keys[i] for i in order], dist[order]
+
+    def nearest(self, block: int, x: int, y: int, k: int = 1, max_dist=None):
+        """Up to ``k`` tiles of ``block`` closest to local (x, y), nearest
+        first, as ``[(x, y), ...]`` in local coordinates."""
+        off = self.env.world_x_offset
+        gx = x + off
+        keys, bounds = self._chunks_by_distance(block, gx, y)
+        best = []  # (dist², gx, y)
+        for key, bound in zip(keys, bounds):
+            if max_dist is not None and bound > max_dist:
+                break
+            if len(best) >= k and bound * bound > best[k - 1][0]:
+                break
+            for tx, ty in self.chunks[block][key]:
+                best.append(((tx - gx) ** 2 + (ty - y) ** 2, tx, ty))
+            best.sort()
+            del best[k:]
+        if max_dist is not None:
+            best = [b for b in best if b[0] <= max_dist * max_dist]
+        return [(tx - off, ty) for _, tx, ty in best]
+
+    def within(self, block: int, x: int, y: int, radius: float):
+        """All tiles of ``block`` within ``radius`` tiles of local (x, y),
+        nearest first."""
+        off = self.env.world_x_offset
+        gx = x + off
+        keys, bounds = self._chunks_by_distance(block, gx, y)
+        found = []
+        r2 = radius * radius
+        for key in keys[: int(np.searchsorted(bounds, radius, side="right"))]:
+            for tx, ty in self.chunks[block][key]:
+                d2 = (tx - gx) ** 2 + (ty - y) ** 2
+                if d2 <= r2:
+                    found.append((d2, tx, ty))
+        found.sort()
+        return [(tx - off, ty) for _, tx, ty in found]
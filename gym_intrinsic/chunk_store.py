@@ -0,0 +1,127 @@
+"""Palette-compressed storage for columns evicted from the dense grid.
+
+Evicted columns are kept per chunk (CHUNK_SIZE columns by CHUNK_SIZE
+rows). Each chunk stores the distinct values it holds (its palette) and
+the tile indices into it, bit-packed at 1, 2, 4 or 8 bits per tile.
+Chunks of a single value (open sky, solid rock, dry fluid levels) store
+no indices and are shared between all chunk stacks, so wide explored
+worlds cost a few bytes per such chunk.
+
+Columns are decoded back to dense arrays when the world grows over them
+again (see ``IntrinsicEnv._generate_columns``).
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .world import CHUNK_SIZE
+
+
+@dataclass(frozen=True, slots=True)
+class PackedChunk:
+    """``palette[index]`` per tile of a ``rows`` by ``cols`` chunk; ``bits``
+    is 0 for single-value chunks, which carry no ``data``."""
+    palette: bytes
+    bits: int
+    data: bytes
+    rows: int
+    cols: int
+
+
+@lru_cache(maxsize=None)
+def _uniform(value: int, rows: int, cols: int) -> PackedChunk:
+    return PackedChunk(bytes([value]), 0, b"", rows, cols)
+
+
+def pack(tiles: np.ndarray) -> PackedChunk:
+    """Compress a 2-D ``int8``/``uint8`` array."""
+    rows, cols = tiles.shape
+    flat = tiles.view(np.uint8).ravel()
+    palette, index = np.unique(flat, return_inverse=True)
+    if len(palette) == 1:
+        return _uniform(int(palette[0]), rows, cols)
+    bits = next(b for b in (1, 2, 4, 8) if len(palette) <= 1 << b)
+    per = 8 // bits
+    index = np.concatenate([index.astype(np.uint8), np.zeros(-len(flat) % per, dtype=np.uint8)])
+    shifts = np.arange(per, dtype=np.uint8) * bits
+    data = np.bitwise_or.reduce(index.reshape(-1, per) << shifts, axis=1).astype(np.uint8)
+    return PackedChunk(palette.tobytes(), bits, data.tobytes(), rows, cols)
+
+
+def unpack(chunk: PackedChunk, dtype=np.int8) -> np.ndarray:
+    """Dense array of a packed chunk."""
+    palette = np.frombuffer(chunk.palette, dtype=np.uint8)
+    if chunk.bits == 0:
+        return np.full((chunk.rows, chunk.cols), palette[0], dtype=np.uint8).view(dtype)
+    per = 8 // chunk.bits
+    shifts = np.arange(per, dtype=np.uint8) * chunk.bits
+    data = np.frombuffer(chunk.data, dtype=np.uint8)
+    index = ((data[:, None] >> shifts) & ((1 << chunk.bits) - 1)).ravel()[: chunk.rows * chunk.cols]
+    return palette[index].reshape(chunk.rows, chunk.cols).view(dtype)
+
+
+def packed_value(chunk: PackedChunk, y: int, x: int) -> int:
+    """Single tile of a packed chunk without decoding the rest."""
+    if chunk.bits == 0:
+        return chunk.palette[0]
+    per = 8 // chunk.bits
+    i = y * chunk.cols + x
+    index = (chunk.data[i // per] >> (i % per) * chunk.bits) & ((1 << chunk.bits) - 1)
+    return chunk.palette[index]
+
+
+class ChunkStore:
+    """Evicted columns of one environment, keyed by global chunk column.
+
+    Each entry holds the block and water level chunks of a stack of
+    CHUNK_SIZE columns (fewer at a world edge) and how many rows of each
+    column were generated.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.stacks = {}  # cx -> (grid chunks, level chunks, generated rows)
+
+    def __contains__(self, cx: int) -> bool:
+        return cx in self.stacks
+
+    def __len__(self) -> int:
+        return len(self.stacks)
+
+    def put(self, cx: int, grid: np.ndarray, level: np.ndarray, generated_rows: np.ndarray) -> None:
+        """Store the full-height columns of chunk column ``cx``."""
+        cs = self.chunk_size
+        self.stacks[cx] = (
+            tuple(pack(grid[y : y + cs]) for y in range(0, grid.shape[0], cs)),
+            tuple(pack(level[y : y + cs]) for y in range(0, level.shape[0], cs)),
+            generated_rows.astype(np.int32).tobytes(),
+        )
+
+    def pop(self, cx: int):
+        """Remove chunk column ``cx`` and return its ``(grid, level,
+        generated_rows)`` arrays."""
+        grid, level, rows = self.stacks.pop(cx)
+        return (
+            np.concatenate([unpack(c) for c in grid]),
+            np.concatenate([unpack(c, np.uint8) for c in level]),
+            np.frombuffer(rows, dtype=np.int32).copy(),
+        )
+
+    def block_at(self, gx: int, y: int):
+        """Block at global (gx, y), or None if its column isn't stored."""
+        cs = self.chunk_size
+        stack = self.stacks.get(gx // cs)
+        if stack is None or gx % cs >= stack[0][0].cols:
+            return None
+        return int(packed_value(stack[0][y // cs], y % cs, gx % cs))
+
+    def nbytes(self) -> int:
+        """Bytes held by packed data (shared single-value chunks excluded)."""
+        return sum(
+            len(c.palette) + len(c.data)
+            for grid, level, _ in self.stacks.values()
+            for c in (*grid, *level)
+            if c.bits
+        )
@@ -5,25 +5,65 @@ from dataclasses import dataclass
 from typing import List, Tuple, Optional
 from .player import Player
 from . import pathfinding
-
-
-@dataclass
-class Enemy:
-    # Body of the enemy mob
-    rect: pygame.Rect
-    health: int
-    # Colour of the enemy mob
-    color: Tuple[int, int, int]
-    speed: int
-    jump_height: int = -13  # Jump height for the enemy
-    # List of vectors for pathfinfinding
-    path: Optional[List[Tuple[int, int]]] = None
-    path_index: int = 0
-    vel_y: float = 0.0
-    # How long we've been using this pathfinding calc
-    last_path_time: int = 0
-    # Last vector the player was
-    last_player_tile: Optional[Tuple[int, int]] = None
+from . import mob_store
+from . import events
+from .mob_store import MobStore, MobView, Field
+
+
+class Enemy(MobView):
+    """Thin view onto one row of the enemy ``MobStore``.
+
+    ``rect`` returns a snapshot whose attribute assignments (``rect.x += 4``)
+    are written back to the store. ``health``, ``color`` and ``speed`` fall
+    back to the class defaults of the enemy type when not given.
+    """
+
+    # Kind codes stored in ``MobStore.kind``
+    MELEE = 1
+    RANGED = 2
+
+    # Stats of the enemy type, set by subclasses
+    default_health: Optional[int] = None
+    default_color: Optional[Tuple[int, int, int]] = None
+    default_speed: Optional[int] = None
+
+    cooldown = Field()
+
+    def __init__(
+        self,
+        rect: pygame.Rect,
+        health: Optional[int] = None,
+        color: Optional[Tuple[int, int, int]] = None,
+        speed: Optional[int] = None,
+        jump_height: int = -13,  # Jump height for the enemy
+        # List of vectors for pathfinfinding
+        path: Optional[List[Tuple[int, int]]] = None,
+        path_index: int = 0,
+        vel_y: float = 0.0,
+        # How long we've been using this pathfinding calc
+        last_path_time: int = 0,
+        # Last vector the player was
+        last_player_tile: Optional[Tuple[int, int]] = None,
+    ):
+        health = self.default_health if health is None else health
+        color = self.default_color if color is None else color
+        speed = self.default_speed if speed is None else speed
+        if health is None or color is None or speed is None:
+            raise TypeError(f"{type(self).__name__} needs health, color and speed")
+        super().__init__(
+            rect,
+            health=health,
+            color=color,
+            speed=speed,
+            jump_height=jump_height,
+            path=path,
+            path_index=path_index,
+            vel_y=vel_y,
+            last_path_time=last_path_time,
+            last_player_tile=last_player_tile,
+        )
+        # Incremental pursuit planner, created on first repath
+        self.planner: Optional[pathfinding.DStarLite] = None
 
     # Intialize enemies as none
     def is_melee(self) -> bool:
@@ -33,26 +73,22 @@ class Enemy:
         return False
 
 
-# Data classes to intialize type of enemy
-@dataclass
+# Classes to intialize type of enemy
 class MeleeEnemy(Enemy):
-    def __post_init__(self):
-        self.color = (200, 0, 0)
-        self.health = 30
-        self.speed = 3
+    kind_code = Enemy.MELEE
+    default_health = 30
+    default_color = (200, 0, 0)
+    default_speed = 3
 
     def is_melee(self) -> bool:
         return True
 
 
-@dataclass
 class RangedEnemy(Enemy):
-    cooldown: int = 0
-
-    def __post_init__(self):
-        self.color = (0, 0, 200)
-        self.health = 20
-        self.speed = 1
+    kind_code = Enemy.RANGED
+    default_health = 20
+    default_color = (0, 0, 200)
+    default_speed = 1
 
     def is_ranged(self) -> bool:
         return True
@@ -64,166 +100,211 @@ class Projectile:
     vel: Tuple[int, int]
 
 
+class ProjectileStore:
+    """Preallocated arrays of live projectiles.
+
+    Rows ``[0, len)`` are live; removal swaps tail rows into the holes so the
+    live range stays dense. Iterating yields ``Projectile`` snapshots.
+    """
+
+    def __init__(self, capacity: int = 256, size: int = 8):
+        self.size = size
+        self.n = 0
+        self._alloc(capacity)
+
+    def _alloc(self, capacity: int) -> None:
+        old = getattr(self, "x", None)
+        arrays = {name: np.zeros(capacity, dtype=np.int32) for name in ("x", "y", "vx", "vy")}
+        if old is not None:
+            for name, arr in arrays.items():
+                arr[: self.n] = getattr(self, name)[: self.n]
+        for name, arr in arrays.items():
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self):
+        for i in range(self.n):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> Projectile:
+        return Projectile(
+            rect=pygame.Rect(int(self.x[i]), int(self.y[i]), self.size, self.size),
+            vel=(int(self.vx[i]), int(self.vy[i])),
+        )
+
+    def spawn(self, x, y, vx, vy) -> None:
+        """Add a batch of projectiles from coordinate/velocity arrays."""
+        k = len(x)
+        if self.n + k > self.capacity:
+            self._alloc(max(self.capacity * 2, self.n + k))
+        sl = slice(self.n, self.n + k)
+        self.x[sl], self.y[sl], self.vx[sl], self.vy[sl] = x, y, vx, vy
+        self.n += k
+
+    def append(self, proj: Projectile) -> None:
+        self.spawn([proj.rect.x], [proj.rect.y], [proj.vel[0]], [proj.vel[1]])
+
+    def remove_mask(self, mask: np.ndarray) -> None:
+        """Swap-remove every live row where ``mask`` is set."""
+        n = self.n
+        keep = n - int(np.count_nonzero(mask))
+        holes = np.flatnonzero(mask[:keep])
+        fillers = np.flatnonzero(~mask[keep:n]) + keep
+        for arr in (self.x, self.y, self.vx, self.vy):
+            arr[holes] = arr[fillers]
+        self.n = keep
+
+    def clear(self) -> None:
+        self.n = 0
+
+    def shift_x(self, dx: int) -> None:
+        self.x[: self.n] += dx
+
+
 def spawn_random_enemies(num: int, env) -> List[Enemy]:
     # List of all enemies
     enemies: List[Enemy] = []
     # Iterate as many enemies to spawn
     for _ in range(num):
         # Random choice for type of enemy
-        etype = np.random.choice(["melee", "ranged"])
+        etype = env.spawn_rng.choice(["melee", "ranged"])
         
         # Find vector to spawn at
-        ex = np.random.randint(0, env.grid_width)
+        ex = int(env.spawn_rng.integers(0, env.grid_width))
         ey = env._find_spawn_y(ex)
         rect = pygame.Rect(ex * env.tile_size, ey, env.tile_size, env.tile_size)
         
         # Add spawned enemy to list of enemies
         if etype == "melee":
-            enemies.append(MeleeEnemy(rect=rect, health=0, color=(0, 0, 0), speed=0))  # values set in __post_init__
+            enemies.append(MeleeEnemy(rect=rect))
         else:
-            enemies.append(RangedEnemy(rect=rect, health=0, color=(0, 0, 0), speed=0))
+            enemies.append(RangedEnemy(rect=rect))
     return enemies
 
 
 
-def update_enemies(enemies: List[Enemy], player: Player, projectiles: List[Projectile], env):
+def update_enemies(enemies: MobStore, player: Player, projectiles: ProjectileStore, env, rows=None, dt=None):
+    """Step the enemies in ``rows`` (all by default) by ``dt`` ticks each."""
+    if len(enemies) == 0:
+        return
     tile_size = env.tile_size
     gravity = 0.8
     max_fall_speed = 10
 
-    # checks if tile is air (0) or water (8)
-    def is_solid(x, y):
-        return 0 <= x < env.grid_width and 0 <= y < env.grid_height and env.grid[y, x] not in (0, 8)
-
-    # get current ticks since game started
-    current_time = pygame.time.get_ticks()
+    # simulation ticks since the episode started
+    current_time = env.ticks
     # position of tile player is standing on
     player_tile = (player.rect.centerx // tile_size, player.rect.bottom // tile_size)
 
-    # logic loop for each enemies update
-    for enemy in enemies:
-        enemy_tile = (enemy.rect.centerx // tile_size, enemy.rect.bottom // tile_size)
+    rows = np.arange(len(enemies)) if rows is None else np.asarray(rows)
+    if len(rows) == 0:
+        return
 
-        # logic for deciding whether enemy should repath
+    # Repathing stays per enemy; the search itself is not batchable
+    for i in rows.tolist():
+        enemy = enemies.views[i]
+        path = enemy.path
         should_repath = (
             # no path
-            enemy.path is None or
+            path is None or
             # done path
-            enemy.path_index >= len(enemy.path) or
+            enemies.path_index[i] >= len(path) or
             # time since last path is greater than repathing time
-            current_time - enemy.last_path_time > env.repathing_time or
+            current_time - enemies.last_path_time[i] > env.repathing_time or
             # player tile has changed since last path
             enemy.last_player_tile != player_tile
         )
-
         if should_repath:
-            # recalculates new path
-            path = pathfinding.astar(env, enemy_tile, player_tile)
+            enemy_tile = (
+                int(enemies.x[i] + enemies.w[i] // 2) // tile_size,
+                int(enemies.y[i] + enemies.h[i]) // tile_size,
+            )
+            pathfinding.ensure_route(env, enemy_tile, player_tile)
+            # repairs the previous search instead of planning from scratch
+            if enemy.planner is None:
+                enemy.planner = pathfinding.DStarLite(env)
+            path = enemy.planner.plan(enemy_tile, player_tile)
             if path:
                 # updates path variables
-                enemy.path = path
-                enemy.path_index = 0
-                enemy.last_path_time = current_time
+                enemies.path_index[i] = 0
+                enemies.last_path_time[i] = current_time
                 enemy.last_player_tile = player_tile
-
-        # actions to be taken depending on next step in path
-        if enemy.path and enemy.path_index < len(enemy.path):
-            target = enemy.path[enemy.path_index]
-            target_px = target[0] * tile_size + tile_size // 2
-            target_py = target[1] * tile_size
-
-            if abs(enemy.rect.centerx - target_px) <= enemy.speed:
-                enemy.path_index += 1
-            elif enemy.rect.centerx < target_px:
-                enemy.rect.x += enemy.speed
-            else:
-                enemy.rect.x -= enemy.speed
-
-            # Check grounded
-            grounded = False
-            left = enemy.rect.left // tile_size
-            right = (enemy.rect.right - 1) // tile_size
-            bottom = enemy.rect.bottom // tile_size
-            for tx in range(left, right + 1):
-                if is_solid(tx, bottom):
-                    grounded = True
-                    break
-
-            # Jump if needed
-            if (
-                target_py + tile_size < enemy.rect.bottom and
-                abs(enemy.rect.centerx - target_px) <= tile_size and
-                grounded and abs(enemy.vel_y) < 1e-3
-            ):
-                enemy.vel_y = enemy.jump_height
-
-        # Gravity calculations
-        enemy.vel_y = min(enemy.vel_y + gravity, max_fall_speed)
-        enemy.rect.y += int(enemy.vel_y)
-
-        # Vertical collisions
-        left = enemy.rect.left // tile_size
-        right = (enemy.rect.right - 1) // tile_size
-        top = enemy.rect.top // tile_size
-        bottom = (enemy.rect.bottom - 1) // tile_size
-
-        # checks if they'll hit something going down
-        if enemy.vel_y > 0:
-            for tx in range(left, right + 1):
-                if is_solid(tx, bottom):
-                    enemy.rect.bottom = bottom * tile_size
-                    enemy.vel_y = 0
-                    break
-         # checks if they'll hit something going up
-        elif enemy.vel_y < 0:
-            for tx in range(left, right + 1):
-                if is_solid(tx, top):
-                    enemy.rect.top = (top + 1) * tile_size
-                    enemy.vel_y = 0
-                    break
-
-        # Melee attack logic
-        if enemy.is_melee() and enemy.rect.colliderect(player.rect):
-            player.health -= 1
-
-        # Ranged attack logic
-        elif enemy.is_ranged():
-            if enemy.cooldown > 0:
-                enemy.cooldown -= 1
-            dx = player.rect.centerx - enemy.rect.centerx
-            dy = player.rect.centery - enemy.rect.centery
-            if abs(dx) < 300 and abs(dy) < 100 and enemy.cooldown == 0:
-                vx = 5 if dx > 0 else -5
-                vy = int(dy / max(abs(dx), 1) * abs(vx))
-                proj = Projectile(
-                    rect=pygame.Rect(enemy.rect.centerx, enemy.rect.centery, 8, 8),
-                    vel=(vx, vy)
-                )
-                projectiles.append(proj)
-                enemy.cooldown = 90
+                enemy.path = path
+    b = enemies.gather(rows)
+    if dt is not None:
+        b.dt[:] = dt
+
+    x, y, w, h = b.x, b.y, b.w, b.h
+    speed = b.speed * b.dt
+
+    # Step towards the next tile of each path
+    act = b.has_target
+    target_px = b.tgt_x * tile_size + tile_size // 2
+    target_py = b.tgt_y * tile_size
+    centerx = x + w // 2
+    reached = act & (np.abs(centerx - target_px) <= speed)
+    step = act & ~reached
+    mob_store.move_x(b, env, np.where(step, np.where(centerx < target_px, speed, -speed), 0))
+
+    # Jump if needed
+    on_ground = mob_store.grounded(env, x // tile_size, (x + w - 1) // tile_size, (y + h) // tile_size)
+    mob_store.try_jump(b, act, target_px, target_py, on_ground, tile_size)
+
+    # Gravity and swept vertical collisions
+    mob_store.apply_gravity(b, env, gravity, max_fall_speed)
+
+    # Melee attack logic
+    hits = (b.kind == Enemy.MELEE) & mob_store.overlaps(b, player.rect)
+    damage = int(np.count_nonzero(hits))
+    if damage:
+        player.health -= damage
+        _log_player_damage(env, player, damage)
+
+    # Ranged attack logic
+    ranged = b.kind == Enemy.RANGED
+    cooldown = b.cooldown
+    cooling = ranged & (cooldown > 0)
+    cooldown[cooling] = np.maximum(cooldown[cooling] - b.dt[cooling], 0)
+    dx = player.rect.centerx - (x + w // 2)
+    dy = player.rect.centery - (y + h // 2)
+    fire = ranged & (np.abs(dx) < 300) & (np.abs(dy) < 100) & (cooldown == 0)
+    if fire.any():
+        vx = np.where(dx[fire] > 0, 5, -5)
+        vy = np.trunc(dy[fire] / np.maximum(np.abs(dx[fire]), 1) * 5).astype(np.int32)
+        projectiles.spawn((x + w // 2)[fire], (y + h // 2)[fire], vx, vy)
+    cooldown[fire] = 90
+
+    enemies.scatter(b)
+    enemies.advance_paths(b.rows[reached])
+
+
+def _log_player_damage(env, player: Player, damage: int) -> None:
+    ts = env.tile_size
+    env.events.log(events.DAMAGE, events.PLAYER_ID, player.rect.centerx // ts, player.rect.centery // ts, amount=damage)
 
 
 # moves projectiles and checks for collisions
-def update_projectiles(projectiles: List[Projectile], player: Player, world_w: int, env):
+def update_projectiles(projectiles: ProjectileStore, player: Player, world_w: int, env):
+    n = len(projectiles)
+    if n == 0:
+        return
     tile_size = env.tile_size
-
-    def is_solid(x, y):
-        return 0 <= x < env.grid_width and 0 <= y < env.grid_height and env.grid[y, x] not in (0, 8)
-
-    for proj in list(projectiles):
-        proj.rect.x += proj.vel[0]
-        proj.rect.y += proj.vel[1]
-
-        if proj.rect.right < 0 or proj.rect.left > world_w:
-            projectiles.remove(proj)
-            continue
-
-        tile_x = proj.rect.centerx // tile_size
-        tile_y = proj.rect.centery // tile_size
-        if is_solid(tile_x, tile_y):
-            projectiles.remove(proj)
-            continue
-
-        if proj.rect.colliderect(player.rect):
-            player.health -= 5
-            projectiles.remove(proj)
+    size = projectiles.size
+    x, y = projectiles.x[:n], projectiles.y[:n]
+    x += projectiles.vx[:n]
+    y += projectiles.vy[:n]
+
+    # world bounds, then solid tiles, then the player
+    gone = (x + size < 0) | (x > world_w)
+    gone |= pathfinding.solid_mask(env, (x + size // 2) // tile_size, (y + size // 2) // tile_size)
+    pr = player.rect
+    hit = ~gone & (x < pr.right) & (pr.x < x + size) & (y < pr.bottom) & (pr.y < y + size)
+    damage = 5 * int(np.count_nonzero(hit))
+    if damage:
+        player.health -= damage
+        _log_player_damage(env, player, damage)
+
+    projectiles.remove_mask(gone | hit)
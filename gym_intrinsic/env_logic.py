@@ -1,5 +1,4 @@
-import pygame
-from . import player_actions, world
+from . import player_actions, world, lod, items
 from .enemy_mobs import update_enemies, update_projectiles
 from .passive_mobs import update_passive_mobs
 from .items import Block, ORE_TYPES
@@ -20,10 +19,6 @@ def handle_input_single(env, actor, action):
     else:
         actor.velocity[0] = 0
 
-    if actor is env.player:  # only update facing if it's the player
-        keys = pygame.key.get_pressed()
-        actor.adjust_facing_from_keys(keys)
-
     if jump and (env._on_ground() or env.in_water):
         actor.velocity[1] = env.jump_velocity if not env.in_water else -5
 
@@ -32,14 +27,14 @@ def handle_input(env, action):
 
 def handle_physics(env):
     # checks if the player is in water
-    in_water = any(env.player.rect.colliderect(r) for r in env.water_blocks)
+    in_water = bool(items.IS_LIQUID[env.tiles_under(env.player.rect)].any())
     env.in_water = in_water
 
     # uses reduced gravity if in water, otherwise uses normal gravity
     gravity = 0.2 if in_water else env.gravity
 
     env.player.apply_gravity(gravity)
-    env.player.move_and_collide(env.blocks)
+    env.player.move_and_collide(env.grid)
 
     # clamps the player's position within the world except upwards
     world_w = env.grid_width * env.tile_size
@@ -77,10 +72,13 @@ def maybe_extend_world(env):
         env._extend_world_right(env.grid_width // 2)
     if env.player.rect.left < threshold:
         env._extend_world_left(env.grid_width // 2)
+    env._evict_far_columns()
 
 
 def spawn_and_update_mobs(env):
     env._spawn_mobs_randomly()
-    update_passive_mobs(env.passive_mobs, env)
-    update_enemies(env.enemies, env.player, env.projectiles, env)
+    rows, dt = lod.schedule(env, env.passive_mobs)
+    update_passive_mobs(env.passive_mobs, env, rows, dt)
+    rows, dt = lod.schedule(env, env.enemies)
+    update_enemies(env.enemies, env.player, env.projectiles, env, rows, dt)
     update_projectiles(env.projectiles, env.player, env.grid_width * env.tile_size, env)
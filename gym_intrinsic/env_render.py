@@ -1,5 +1,8 @@
+import numpy as np
 import pygame
 from . import world
+from . import fluids
+from . import weather
 from .inventory_ui import InventoryUI
 from . import items
 from .items import Block, ORE_TYPES
@@ -28,6 +31,10 @@ def render_environment(env):
         update_camera(env)
             
 
+    # only views larger than the area kept around the actors generate here
+    x0, x1, _, y1 = _visible_tiles(env)
+    env.ensure_generated(x0, x1, y1)
+
     env.screen.fill(env.weather.get_sky_color())
     light = env.weather.get_light_intensity()
 
@@ -36,36 +43,82 @@ def render_environment(env):
     draw_mining_indicator(env)
     draw_entities(env, light)
     draw_facing_indicator(env, light)
+    draw_precipitation(env, light)
     draw_ui(env)
     pygame.display.flip()
     env.clock.tick(60)
 
 
+def _visible_tiles(env):
+    """Local tile bounds ``(x0, x1, y0, y1)`` of the camera view."""
+    ts = env.tile_size
+    x0 = max(env.camera_x // ts, 0)
+    y0 = max(env.camera_y // ts, 0)
+    x1 = min((env.camera_x + env.screen.get_width()) // ts + 1, env.grid_width)
+    y1 = min((env.camera_y + env.screen.get_height()) // ts + 1, env.grid_height)
+    return x0, x1, y0, y1
+
+
 def draw_blocks(env, light):
-    for rect, block in env.blocks:
-        screen_rect = rect.move(-env.camera_x, -env.camera_y)
-        if screen_rect.bottom < 0 or screen_rect.top > env.screen.get_height():
-            continue
-        color = items.COLOR_MAP.get(block, (255, 255, 255))
-        color = tuple(int(c * light) for c in color)
-        pygame.draw.rect(env.screen, color, screen_rect)
+    x0, x1, y0, y1 = _visible_tiles(env)
+    window = env.grid[y0:y1, x0:x1]
+    ts = env.tile_size
+    shade = env.lighting.brightness(x0, x1, y0, y1, light)
+    colors = (items.COLOR_LUT[window] * shade[..., None]).astype(int)
+    # open tiles out of the sky's reach (caves) darken the backdrop
+    sky = np.array(env.weather.get_sky_color()) / light
+    for y, x in zip(*np.nonzero(~items.IS_SOLID[window] & (shade < light))):
+        rect = ((x + x0) * ts - env.camera_x, (y + y0) * ts - env.camera_y, ts, ts)
+        pygame.draw.rect(env.screen, (sky * shade[y, x]).astype(int), rect)
+    for y, x in zip(*np.nonzero(items.IS_SOLID[window])):
+        rect = ((x + x0) * ts - env.camera_x, (y + y0) * ts - env.camera_y, ts, ts)
+        pygame.draw.rect(env.screen, colors[y, x], rect)
 
 
 def draw_water(env, light):
-    for rect in env.water_blocks:
-        screen_rect = rect.move(-env.camera_x, -env.camera_y)
-        if screen_rect.bottom < 0 or screen_rect.top > env.screen.get_height():
-            continue
-        water_color = tuple(int(c * light) for c in items.COLOR_MAP[Block.WATER])
-        pygame.draw.rect(env.screen, water_color, screen_rect)
+    x0, x1, y0, y1 = _visible_tiles(env)
+    level = env.fluids.level[y0:y1, x0:x1]
+    ts = env.tile_size
+    shade = env.lighting.brightness(x0, x1, y0, y1, light)
+    colors = (items.COLOR_LUT[Block.WATER] * shade[..., None]).astype(int)
+    for y, x in zip(*np.nonzero(level)):
+        # partially filled tiles are drawn from the bottom up
+        height = max(1, ts * int(level[y, x]) // fluids.MAX_LEVEL)
+        top = (y + y0 + 1) * ts - height - env.camera_y
+        pygame.draw.rect(env.screen, colors[y, x], ((x + x0) * ts - env.camera_x, top, ts, height))
+
+
+# rain streaks are vertical runs of pixels, snowflakes small squares
+_RAIN_OFFSETS = np.array([(0, dy) for dy in range(10)])
+_SNOW_OFFSETS = np.array([(dx, dy) for dx in range(3) for dy in range(3)])
+
+
+def draw_precipitation(env, light):
+    """Draw every particle with one vectorised write into the screen pixels."""
+    p = env.precipitation
+    if p.n == 0:
+        return
+    w, h = env.screen.get_size()
+    sx = (p.x[: p.n] - env.camera_x).astype(np.int64)
+    sy = (p.y[: p.n] - env.camera_y).astype(np.int64)
+    pixels = pygame.surfarray.pixels3d(env.screen)
+    for kind, offsets, color in (
+        (weather.RAIN, _RAIN_OFFSETS, (150, 170, 230)),
+        (weather.SNOW, _SNOW_OFFSETS, (245, 245, 250)),
+    ):
+        sel = p.kind[: p.n] == kind
+        px = (sx[sel, None] + offsets[:, 0]).ravel()
+        py = (sy[sel, None] + offsets[:, 1]).ravel()
+        on = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+        pixels[px[on], py[on]] = [int(c * light) for c in color]
+    del pixels  # unlock the surface
 
 
 def draw_mining_indicator(env):
     if env._mining_target is not None and env._mining_progress > 0:
         tx, ty = env._mining_target
         block = env.grid[ty, tx]
-        info = items.BLOCK_STATS.get(block)
-        required = info.mining_time if info else 1
+        required = max(1, items.MINING_TIME[block])
         ratio = min(1.0, env._mining_progress / required)
         size = int(env.tile_size * ratio)
         if size > 0:
@@ -117,16 +170,18 @@ def draw_entities(env, light):
 
     
     # Draw mobs
-    for entity in env.enemies + env.passive_mobs:
+    for entity in [*env.enemies, *env.passive_mobs]:
         screen_rect = entity.rect.move(-env.camera_x, -env.camera_y)
         color = tuple(int(c * light) for c in entity.color)
         pygame.draw.rect(env.screen, color, screen_rect)
 
-    # Draw projectiles
-    for proj in env.projectiles:
-        screen_rect = proj.rect.move(-env.camera_x, -env.camera_y)
-        proj_color = tuple(int(c * light) for c in (0, 0, 0))
-        pygame.draw.rect(env.screen, proj_color, screen_rect)
+    # Draw projectiles straight from the projectile arrays
+    projs = env.projectiles
+    proj_color = tuple(int(c * light) for c in (0, 0, 0))
+    xs = (projs.x[: projs.n] - env.camera_x).tolist()
+    ys = (projs.y[: projs.n] - env.camera_y).tolist()
+    for sx, sy in zip(xs, ys):
+        pygame.draw.rect(env.screen, proj_color, (sx, sy, projs.size, projs.size))
 
 
 
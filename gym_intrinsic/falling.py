@@ -0,0 +1,73 @@
+"""Gravity-affected blocks (``items.FALLS``, e.g. sand).
+
+A falling block with an open tile (air or water) below drops one tile per
+tick; a stack of them drops together, so cascades settle without extra
+passes. Only *dirty* columns are scanned: a column is marked when a block
+lands in it, or when a tile directly under a falling block changes. The
+dirty columns are gathered into one array and settled together, and all
+moves of a tick are written through one ``env.set_blocks`` batch so the
+hash, indexes, light and navigation stay consistent.
+"""
+
+import numpy as np
+
+from .items import FALLS, IS_SOLID
+
+
+class FallingBlocks:
+    """Dirty-column set of one environment; columns are global x."""
+
+    def __init__(self, env):
+        self.env = env
+        self.dirty = set()
+
+    def blocks_changed(self, xs: np.ndarray, ys: np.ndarray, new: np.ndarray) -> None:
+        """Mark the columns where an edit may leave a falling block
+        unsupported."""
+        above = self.env.grid[np.maximum(ys - 1, 0), xs]
+        mark = FALLS[new] | ((ys > 0) & FALLS[above])
+        self.dirty.update((xs[mark] + self.env.world_x_offset).tolist())
+
+    def columns_removed(self, gx0: int, gx1: int) -> None:
+        self.dirty = {gx for gx in self.dirty if not gx0 <= gx < gx1}
+
+    def step(self) -> None:
+        """Drop every unsupported falling block in the dirty columns by one
+        tile."""
+        if not self.dirty:
+            return
+        env = self.env
+        xs = np.array(sorted(self.dirty), dtype=np.int64) - env.world_x_offset
+        self.dirty = set()
+        xs = xs[(xs >= 0) & (xs < env.grid_width)]
+        cols = env.grid[:, xs]
+        falls = FALLS[cols]
+        if not falls.any():
+            return
+        # first row at or below each tile that doesn't fall (h if none): a
+        # falling tile moves when the stack it is part of rests on an open
+        # tile (air or water)
+        h = cols.shape[0]
+        stop = np.where(falls, h, np.arange(h)[:, None])
+        stop = np.minimum.accumulate(stop[::-1], axis=0)[::-1]
+        below = np.take_along_axis(cols, np.minimum(stop, h - 1), axis=0)
+        moving = falls & (stop < h) & ~IS_SOLID[below]
+        if not moving.any():
+            return
+
+        # each moving run shifts down one tile; the open tile it falls into
+        # (with its water level) rises to the top of the run
+        new = cols.copy()
+        ys, cs = np.nonzero(moving)
+        new[ys + 1, cs] = cols[ys, cs]
+        top = moving.copy()
+        top[1:] &= ~moving[:-1]
+        ty, tc = np.nonzero(top)
+        target = stop[ty, tc]
+        new[ty, tc] = cols[target, tc]
+        level = env.fluids.level
+        env.fluids.set_levels(
+            np.r_[xs[tc], xs[tc]], np.r_[ty, target], np.r_[level[target, xs[tc]], np.zeros(len(ty), level.dtype)]
+        )
+        ys, cs = np.nonzero(new != cols)
+        env.set_blocks(xs[cs], ys, new[ys, cs])
@@ -0,0 +1,202 @@
+"""Flowing water as a cellular automaton over the world grid.
+
+Each water tile has a fill level (1..MAX_LEVEL) kept in a uint8 side array
+the same shape as the grid; the grid itself only says WATER or not. Water
+falls into open tiles below and, where it rests on something, evens out
+with its left and right neighbours.
+
+Only *active* chunks are simulated. A chunk wakes when a block in or next
+to it changes, when a neighbouring chunk pushes water into it, or when it
+holds unsettled water after generation, and goes back to sleep after a
+pass in which nothing moved. Resting oceans therefore cost nothing.
+
+Levels are part of the environment's incremental grid hash (see
+zobrist.py): every write goes through ``set_levels`` or XORs the keys of
+the region it replaces.
+"""
+
+import numpy as np
+
+from . import zobrist
+from .items import Block, IS_LIQUID, IS_SOLID
+from .world import CHUNK_SIZE
+
+MAX_LEVEL = 8
+
+
+class WaterSim:
+    """Water levels of one environment plus the set of awake chunks.
+
+    Chunks are keyed by global ``(cx, cy)`` like the other indexes, so the
+    active set survives the world growing to the left.
+    """
+
+    def __init__(self, env, chunk_size: int = CHUNK_SIZE):
+        self.env = env
+        self.chunk_size = chunk_size
+        self.level = np.zeros(env.grid.shape, dtype=np.uint8)
+        self.active = set()
+
+    # --- maintenance -------------------------------------------------------
+    def rebuild(self) -> None:
+        """Full levels for every liquid tile of a freshly generated grid,
+        whose generation already added them to the grid hash."""
+        self.level = np.where(IS_LIQUID[self.env.grid], MAX_LEVEL, 0).astype(np.uint8)
+        self.active = set()
+        self.wake_unsettled(0, self.env.grid_width)
+
+    def columns_added(self, x0: int, x1: int, level=None) -> None:
+        """Add levels for the new local columns [x0, x1): ``level`` as
+        generated or restored from storage (already in the grid hash),
+        otherwise full for every liquid tile."""
+        new = level
+        if new is None:
+            new = np.where(IS_LIQUID[self.env.grid[:, x0:x1]], MAX_LEVEL, 0).astype(np.uint8)
+            self.env.grid_hash ^= zobrist.region_hash(new, x0 + self.env.world_x_offset, base=zobrist.LEVEL_BASE)
+        if x0 == 0:
+            self.level = np.concatenate([new, self.level], axis=1)
+        else:
+            self.level = np.concatenate([self.level, new], axis=1)
+        self.wake_unsettled(max(0, x0 - 1), min(self.env.grid_width, x1 + 1))
+
+    def columns_removed(self, gx0: int, gx1: int) -> None:
+        """Drop the global columns [gx0, gx1) before they are evicted (their
+        levels stay in the grid hash, like their blocks)."""
+        off = self.env.world_x_offset
+        self.level = np.delete(self.level, np.s_[gx0 - off : gx1 - off], axis=1)
+        c = self.chunk_size
+        self.active = {k for k in self.active if not gx0 // c <= k[0] <= (gx1 - 1) // c}
+
+    def rows_generated(self, x0: int, x1: int, y0: int, y1: int) -> None:
+        """Set levels for a local region filled in by lazy generation."""
+        grid = self.env.grid[y0:y1, x0:x1]
+        new = np.where(IS_LIQUID[grid], MAX_LEVEL, 0).astype(np.uint8)
+        gx0 = x0 + self.env.world_x_offset
+        self.env.grid_hash ^= zobrist.region_hash(self.level[y0:y1, x0:x1], gx0, y0, zobrist.LEVEL_BASE)
+        self.env.grid_hash ^= zobrist.region_hash(new, gx0, y0, zobrist.LEVEL_BASE)
+        self.level[y0:y1, x0:x1] = new
+        self.wake_unsettled(max(0, x0 - 1), min(self.env.grid_width, x1 + 1))
+
+    def blocks_changed(self, xs: np.ndarray, ys: np.ndarray, new: np.ndarray) -> None:
+        """Keep the levels in step with the grid and wake the surroundings
+        of the local tiles (xs, ys)."""
+        level = self.level[ys, xs]
+        self.set_levels(xs, ys, np.where(IS_LIQUID[new], np.where(level == 0, MAX_LEVEL, level), 0))
+        gxs = xs + self.env.world_x_offset
+        c = self.chunk_size
+        nx = np.concatenate([gxs, gxs - 1, gxs + 1, gxs, gxs]) // c
+        ny = np.concatenate([ys, ys, ys, ys - 1, ys + 1]) // c
+        keys = np.unique(np.stack([nx, ny], axis=1), axis=0)
+        self.active.update(zip(keys[:, 0].tolist(), keys[:, 1].tolist()))
+
+    def add_water(self, xs, ys, amount: int) -> None:
+        """Raise the level of existing water tiles (e.g. rain)."""
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        self.set_levels(xs, ys, np.minimum(self.level[ys, xs] + amount, MAX_LEVEL))
+        gxs = xs + self.env.world_x_offset
+        c = self.chunk_size
+        self.active.update(zip((gxs // c).tolist(), (ys // c).tolist()))
+
+    def set_levels(self, xs, ys, levels) -> None:
+        """Write the levels of distinct local tiles and fold the change into
+        the grid hash. The grid is left to the caller."""
+        gxs = np.asarray(xs) + self.env.world_x_offset
+        self.env.grid_hash ^= zobrist.tiles_hash(gxs, ys, self.level[ys, xs], zobrist.LEVEL_BASE)
+        self.env.grid_hash ^= zobrist.tiles_hash(gxs, ys, levels, zobrist.LEVEL_BASE)
+        self.level[ys, xs] = levels
+
+    def wake_unsettled(self, x0: int, x1: int) -> None:
+        """Wake chunks of the local columns [x0, x1) holding water that
+        could still move."""
+        grid = self.env.grid[:, max(0, x0 - 1) : x1 + 1]
+        level = self.level[:, max(0, x0 - 1) : x1 + 1].astype(np.int16)
+        open_ = ~IS_SOLID[grid]
+        moving = np.zeros(level.shape, dtype=bool)
+        moving[:-1] = (level[:-1] > 0) & open_[1:] & (level[1:] < MAX_LEVEL)
+        moving[:, :-1] |= (level[:, :-1] - level[:, 1:] >= 2) & open_[:, 1:]
+        moving[:, 1:] |= (level[:, 1:] - level[:, :-1] >= 2) & open_[:, :-1]
+        ys, xs = np.nonzero(moving)
+        gxs = xs + max(0, x0 - 1) + self.env.world_x_offset
+        c = self.chunk_size
+        self.active.update(zip((gxs // c).tolist(), (ys // c).tolist()))
+
+    # --- simulation --------------------------------------------------------
+    def step(self) -> None:
+        """Advance every awake chunk by one flow update."""
+        if not self.active:
+            return
+        woken = set()
+        changed_x, changed_y = [], []
+        for key in sorted(self.active):
+            moved = self._step_chunk(key, woken, changed_x, changed_y)
+            if not moved:
+                self.active.discard(key)
+        self.active |= woken
+        if changed_x:
+            xs = np.concatenate(changed_x)
+            ys = np.concatenate(changed_y)
+            blocks = np.where(self.level[ys, xs] > 0, Block.WATER, Block.EMPTY)
+            self.env.set_blocks(xs, ys, blocks)
+
+    def _step_chunk(self, key, woken, changed_x, changed_y) -> bool:
+        env = self.env
+        c = self.chunk_size
+        x0 = key[0] * c - env.world_x_offset
+        y0 = key[1] * c
+        h, w = env.grid.shape
+        cx0, cx1 = max(x0, 0), min(x0 + c, w)
+        cy0, cy1 = max(y0, 0), min(y0 + c, h)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return False
+
+        # window = chunk plus a one-tile border that can receive water
+        wx0, wx1 = max(cx0 - 1, 0), min(cx1 + 1, w)
+        wy0, wy1 = max(cy0 - 1, 0), min(cy1 + 1, h)
+        before = self.level[wy0:wy1, wx0:wx1]
+        level = before.astype(np.int16)
+        open_ = ~IS_SOLID[env.grid[wy0:wy1, wx0:wx1]]
+        src = np.zeros(level.shape, dtype=bool)
+        src[cy0 - wy0 : cy1 - wy0, cx0 - wx0 : cx1 - wx0] = True
+        src &= level > 0
+
+        # fall into the tile below
+        room = np.where(open_[1:], MAX_LEVEL - level[1:], 0)
+        fall = np.where(src[:-1], np.minimum(level[:-1], room), 0)
+        level[:-1] -= fall
+        level[1:] += fall
+
+        # spread sideways where resting on something solid or full water
+        supported = np.ones(level.shape, dtype=bool)
+        supported[:-1] = ~open_[1:] | (level[1:] >= MAX_LEVEL)
+        if wy1 == h:
+            supported[-1] = True
+        src = src & supported & (level > 0)
+        right = np.where(src[:, :-1] & open_[:, 1:], np.maximum(level[:, :-1] - level[:, 1:] + 1, 0) // 3, 0)
+        left = np.where(src[:, 1:] & open_[:, :-1], np.maximum(level[:, 1:] - level[:, :-1] + 1, 0) // 3, 0)
+        level[:, :-1] -= right
+        level[:, 1:] += right
+        level[:, 1:] -= left
+        level[:, :-1] += left
+
+        delta = level != before
+        if not delta.any():
+            return False
+        ys, xs = np.nonzero((level > 0) != (before > 0))
+        changed_x.append(xs + wx0)
+        changed_y.append(ys + wy0)
+        ys, xs = np.nonzero(delta)
+        self.set_levels(xs + wx0, ys + wy0, level[ys, xs])
+
+        # wake neighbours whose edge tiles, or ours next to them, changed
+        ix0, ix1 = cx0 - wx0, cx1 - wx0
+        iy0, iy1 = cy0 - wy0, cy1 - wy0
+        if delta[:, : ix0 + 1].any():
+            woken.add((key[0] - 1, key[1]))
+        if delta[:, ix1 - 1 :].any():
+            woken.add((key[0] + 1, key[1]))
+        if delta[: iy0 + 1].any():
+            woken.add((key[0], key[1] - 1))
+        if delta[iy1 - 1 :].any():
+            woken.add((key[0], key[1] + 1))
+        return True
@@ -0,0 +1,222 @@
+"""Hierarchical path-finding (HPA*) over world chunks.
+
+Tiles that have a move into a neighbouring chunk become abstract nodes.
+Each chunk caches the shortest in-chunk distances between its nodes, so a
+long route is searched over the few abstract nodes and only the next
+segment (to the edge of the current chunk) is refined to tiles.
+
+Everything here uses global tile coordinates (``x + world_x_offset``) so the
+cache survives the world growing to the left.
+"""
+
+import heapq
+from collections import deque
+
+import numpy as np
+
+from . import pathfinding
+from .world import CHUNK_SIZE
+
+
+class ChunkGraph:
+    """Abstract entrance graph with per-chunk caches."""
+
+    def __init__(self, env, chunk_size: int = CHUNK_SIZE):
+        self.env = env
+        self.chunk_size = chunk_size
+        self._cross = {}  # chunk -> {exit tile: [tile in other chunk]}
+        self._intra = {}  # chunk -> {node: [(node, cost)]}
+
+    # --- coordinates -------------------------------------------------------
+    def chunk_of(self, tile):
+        return (tile[0] // self.chunk_size, tile[1] // self.chunk_size)
+
+    def _neighbors(self, tile):
+        off = self.env.world_x_offset
+        return [(x + off, y) for x, y in pathfinding.get_neighbors(self.env, tile[0] - off, tile[1])]
+
+    def _tiles(self, chunk):
+        """Tile range of a chunk clipped to the current world."""
+        cs, off = self.chunk_size, self.env.world_x_offset
+        x0 = max(chunk[0] * cs, off)
+        x1 = min(chunk[0] * cs + cs, off + self.env.grid_width)
+        y0 = max(chunk[1] * cs, 0)
+        y1 = min(chunk[1] * cs + cs, self.env.grid_height)
+        return x0, x1, y0, y1
+
+    def _generate(self, chunk) -> None:
+        """Generate the rock that moves out of ``chunk`` read."""
+        x0, x1, _, y1 = self._tiles(chunk)
+        off = self.env.world_x_offset
+        # moves out of tile u read columns u.x +- 1 and rows down to u.y + 3
+        self.env.ensure_generated(x0 - off - 1, x1 - off + 1, y1 + 3)
+
+    # --- cache maintenance -----------------------------------------------
+    def invalidate(self, chunk) -> None:
+        """Forget the cached edges of a chunk and the entry sets around it."""
+        self._cross.pop(chunk, None)
+        cx, cy = chunk
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                self._intra.pop((cx + dx, cy + dy), None)
+
+    def blocks_changed(self, gxs: np.ndarray, gys: np.ndarray) -> None:
+        """Invalidate the chunks whose moves read any of the edited global
+        tiles."""
+        # moves out of tile u read columns u.x +- 1 and rows u.y - 1 .. u.y + 3
+        cs = self.chunk_size
+        cx = np.concatenate([gxs - 1, gxs - 1, gxs + 1, gxs + 1]) // cs
+        cy = np.concatenate([gys - 3, gys + 1, gys - 3, gys + 1]) // cs
+        for chunk in np.unique(np.stack([cx, cy], axis=1), axis=0).tolist():
+            self.invalidate(tuple(chunk))
+
+    def columns_changed(self, gx0: int, gx1: int) -> None:
+        """Invalidate every chunk overlapping global columns [gx0, gx1)."""
+        cs = self.chunk_size
+        for cx in range((gx0 - 1) // cs, (gx1 + 1) // cs + 1):
+            for cy in range(self.env.grid_height // cs + 1):
+                self.invalidate((cx, cy))
+
+    def cross_edges(self, chunk):
+        """Moves from border tiles of ``chunk`` into neighbouring chunks."""
+        cross = self._cross.get(chunk)
+        if cross is not None:
+            return cross
+        cross = {}
+        x0, x1, y0, y1 = self._tiles(chunk)
+        for x in range(x0, x1):
+            for y in range(y0, y1):
+                # only tiles next to a border can leave the chunk
+                if x not in (x0, x1 - 1) and y not in (y0, y1 - 1, y1 - 2):
+                    continue
+                out = [v for v in self._neighbors((x, y)) if self.chunk_of(v) != chunk]
+                if out:
+                    cross[(x, y)] = out
+        self._cross[chunk] = cross
+        return cross
+
+    def nodes(self, chunk):
+        """Abstract nodes of ``chunk``: its exits and entries."""
+        nodes = set(self.cross_edges(chunk))
+        cx, cy = chunk
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if dx or dy:
+                    for targets in self.cross_edges((cx + dx, cy + dy)).values():
+                        nodes.update(v for v in targets if self.chunk_of(v) == chunk)
+        return nodes
+
+    def intra_edges(self, chunk):
+        """Cached shortest in-chunk distances between the chunk's nodes."""
+        edges = self._intra.get(chunk)
+        if edges is None:
+            nodes = self.nodes(chunk)
+            edges = {}
+            for a in nodes:
+                dist = self._bfs(a, chunk)
+                edges[a] = [(b, dist[b]) for b in nodes if b != a and b in dist]
+            self._intra[chunk] = edges
+        return edges
+
+    # --- in-chunk search -----------------------------------------------------
+    def _bfs(self, start, chunk, goal=None, reverse=False):
+        """Breadth-first search that never leaves ``chunk``.
+
+        Returns the distance map, or the tile path when ``goal`` is given.
+        With ``reverse`` the search follows moves backwards.
+        """
+        if reverse:
+            succ = {}
+
+            def neighbors(t):
+                if t not in succ:
+                    succ[t] = self._neighbors(t)
+                return succ[t]
+
+            step = lambda t: pathfinding.predecessors(self.env, t[0], t[1], neighbors)
+        else:
+            step = self._neighbors
+        dist = {start: 0}
+        parent = {}
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            if u == goal:
+                path = [u]
+                while u in parent:
+                    u = parent[u]
+                    path.append(u)
+                return path[::-1]
+            for v in step(u):
+                if v not in dist and self.chunk_of(v) == chunk:
+                    dist[v] = dist[u] + 1
+                    parent[v] = u
+                    queue.append(v)
+        return None if goal is not None else dist
+
+    # --- high level search -----------------------------------------------
+    def abstract_path(self, start, goal):
+        """Abstract route [start, node, ..., goal] in global tiles, or None."""
+        c_start, c_goal = self.chunk_of(start), self.chunk_of(goal)
+        from_start = self._bfs(start, c_start)
+        to_goal = self._bfs(goal, c_goal, reverse=True)
+        start_nodes = self.nodes(c_start)
+
+        def successors(u):
+            c = self.chunk_of(u)
+            if u == start:
+                out = [(n, d) for n, d in from_start.items() if n in start_nodes]
+            else:
+                out = list(self.intra_edges(c).get(u, ()))
+            out.extend((v, 1) for v in self.cross_edges(c).get(u, ()))
+            if c == c_goal and u in to_goal:
+                out.append((goal, to_goal[u]))
+            return out
+
+        open_set = [(pathfinding.lower_bound(start, goal), 0, start)]
+        g_score = {start: 0}
+        came_from = {}
+        while open_set:
+            _, cost, u = heapq.heappop(open_set)
+            if u == goal:
+                path = [u]
+                while u in came_from:
+                    u = came_from[u]
+                    path.append(u)
+                return path[::-1]
+            if cost > g_score[u]:
+                continue
+            for v, d in successors(u):
+                g = cost + d
+                if g < g_score.get(v, float("inf")):
+                    g_score[v] = g
+                    came_from[v] = u
+                    heapq.heappush(open_set, (g + pathfinding.lower_bound(v, goal), g, v))
+        return None
+
+    def next_segment(self, start, goal):
+        """Tile path from ``start`` up to the first tile outside its chunk
+        (or to ``goal``), in local grid coordinates.
+
+        Only the chunks of the two end points are generated; the abstract
+        search sees the rest of the world as far as it has been generated
+        and is corrected as later segments fill it in.
+        """
+        off = self.env.world_x_offset
+        start, goal = (start[0] + off, start[1]), (goal[0] + off, goal[1])
+        self._generate(self.chunk_of(start))
+        self._generate(self.chunk_of(goal))
+        route = self.abstract_path(start, goal)
+        if route is None:
+            return None
+        path = [start]
+        for a, b in zip(route, route[1:]):
+            chunk = self.chunk_of(a)
+            if self.chunk_of(b) != chunk:
+                path.append(b)
+                break
+            leg = self._bfs(a, chunk, goal=b)
+            if leg is None:  # stale cache; the caller will pick a new route
+                return None
+            path.extend(leg[1:])
+        return [(x - off, y) for x, y in path]
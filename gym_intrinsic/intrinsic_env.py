@@ -1,27 +1,35 @@
-import pygame
 import numpy as np
 import gym
-from typing import Optional
 from gym import spaces
 import os
 
 from . import world
 from . import items
 from .player import Player
-from .enemy_mobs import Enemy, Projectile, spawn_random_enemies, update_enemies, update_projectiles
+from .enemy_mobs import Enemy, Projectile, ProjectileStore, spawn_random_enemies, update_enemies, update_projectiles
 from .passive_mobs import PassiveMob, spawn_random_passive_mobs, update_passive_mobs
-from .weather import WeatherSystem
-from .inventory_ui import InventoryUI
-from .items import Block, ORE_TYPES
+from .mob_store import MobStore, shift_x
+from .weather import Precipitation, WeatherSystem
+from .items import ORE_TYPES
 from . import player_actions
 from . import env_logic
-from . import env_render
+from . import hpa
+from . import recording
+from . import events
+from . import zobrist
+from .surface import SurfaceIndex
+from .block_index import BlockIndex
+from .fluids import MAX_LEVEL, WaterSim
+from .lighting import LightField
+from .falling import FallingBlocks
+from .chunk_store import ChunkStore
 from ai_agents.simple_agent import SimpleAgent, AIPlayer
 
 
 # Constants
 DEFAULT_WIDTH = 1280
 DEFAULT_HEIGHT = 960
+EVICT_BATCH = 4  # chunks packed away at once, so the world edge doesn't thrash
 
 
 class IntrinsicEnv(gym.Env):
@@ -29,8 +37,15 @@ class IntrinsicEnv(gym.Env):
 
     metadata = {"render.modes": ["human"]}
 
-    def __init__(self):
+    def __init__(self, atlas=None):
+        """``atlas``: directory written by ``python -m gym_intrinsic.atlas``;
+        its columns are used instead of generating them."""
         super().__init__()
+        self.atlas = None
+        if atlas is not None:
+            from .atlas import Atlas
+
+            self.atlas = Atlas(atlas)
         
 
         self.tile_size = 64
@@ -56,10 +71,20 @@ class IntrinsicEnv(gym.Env):
         # World dimensions may extend beyond the screen
         self.grid_width = DEFAULT_WIDTH // self.tile_size
         self.grid_height = (DEFAULT_HEIGHT // self.tile_size) * 6
-
-        self.world_x_offset = 0  # total tiles offset from world origin (left side)
-        self.grid = world.generate_world(self.grid_width, self.grid_height, world_x_offset=self.world_x_offset)
-        self._update_blocks()
+        if self.atlas is not None and self.atlas.height != self.grid_height:
+            raise ValueError(f"atlas has {self.atlas.height} rows, the world has {self.grid_height}")
+        # rows generated eagerly below the surface; deeper rows are filled
+        # on first access (see ``ensure_generated``). None generates whole
+        # columns up front.
+        self.surface_band_depth = 8
+        # columns further than this from the player and AI players are
+        # packed into ``chunk_store``; None keeps the whole world dense
+        self.evict_distance = 256
+
+        # Per-environment RNG streams; the default seed keeps environments
+        # created after ``world.set_world_seed`` reproducible
+        self._seed_streams(world.get_world_seed())
+        self.grid = None  # the world is generated by the first ``reset``
         self.in_water = False
 
         # Camera offset for rendering larger worlds
@@ -73,30 +98,181 @@ class IntrinsicEnv(gym.Env):
 
         self.screen = None
         self.clock = None
-        self.inventory_ui: Optional[InventoryUI] = None
+        self.inventory_ui = None  # InventoryUI, created by the first render
         # Weather and time system
-        self.weather = WeatherSystem()
+        self.weather = WeatherSystem(rng=self.weather_rng)
 
-        # Enemies, passive mobs and projectiles lists
-        self.enemies = []
-        self.passive_mobs = []
-        self.projectiles = []
+        # Enemy, passive mob and projectile stores
+        self.enemies = MobStore(id_base=events.ENEMY_ID_BASE)
+        self.passive_mobs = MobStore(id_base=events.PASSIVE_ID_BASE)
+        self.projectiles = ProjectileStore()
 
         # mining state
         self._mining_target = None  # (x, y) of block being mined
         self._mining_progress = 0
 
+        # gameplay events, drained into ``info["events"]`` every step
+        self.events = events.EventLog(self)
+
         # spawning configuration
         self.max_enemies = 5
         self.max_passive_mobs = 5
         self.enemy_spawn_chance = 0.001
         self.passive_spawn_chance = 0.01
         
+        # simulation level of detail (radii in tiles, see lod.py)
+        self.ticks = 0
+        self.sim_near_radius = 24
+        self.sim_far_radius = 64
+        self.sim_mid_interval = 4
+        self.sim_far_policy = "freeze"  # or "despawn"
+
         # pathfinding
-        self.repathing_time = 1500
+        self.repathing_time = 90  # ticks
+
+        # optional EpisodeRecorder (see recording.py)
+        self.recorder = None
+        # optional TrajectoryWriter (see trajectory.py)
+        self.trajectory_writer = None
+
+    def _seed_streams(self, seed) -> None:
+        """Derive independent world, spawning, AI and weather generators from
+        ``seed``."""
+        world_ss, spawn_ss, ai_ss, weather_ss = np.random.SeedSequence(seed).spawn(4)
+        self.world_seed = int(world_ss.generate_state(1)[0])
+        if self.atlas is not None:
+            self.world_seed = self.atlas.seed  # terrain past the atlas edges continues it
+        self.world_rng = np.random.default_rng(world_ss)
+        self.spawn_rng = np.random.default_rng(spawn_ss)
+        self.ai_rng = np.random.default_rng(ai_ss)
+        self.weather_rng = np.random.default_rng(weather_ss)
+
+    def _generate_world(self) -> None:
+        """Generate the starting world and everything indexed from it."""
+        self.grid_width = DEFAULT_WIDTH // self.tile_size
+        self.world_x_offset = 0  # total tiles offset from world origin (left side)
+        self.chunk_store = ChunkStore()
+        self.grid_hash = 0
+        self.grid, self.generated_rows, _ = self._generate_columns(self.grid_width, self.world_x_offset)
+        self._update_blocks()
+        self.surface = SurfaceIndex(self)
+        self.surface.rebuild()
+        self.block_index = BlockIndex(self)
+        self.block_index.rebuild()
+        self.fluids = WaterSim(self)
+        self.fluids.rebuild()
+        self.lighting = LightField(self)
+        self.lighting.rebuild()
+        self.falling = FallingBlocks(self)
+        self.precipitation = Precipitation(self)
+        self.precipitation.rebuild()
+        self.chunk_graph = hpa.ChunkGraph(self)
+
+    def _generate_columns(self, width: int, world_x_offset: int):
+        """Grid columns [world_x_offset, +width) with the number of rows
+        generated in each and their water levels. Columns evicted earlier
+        come back from ``chunk_store``; the rest are read from the atlas or
+        generated, and their tiles and levels added to the grid hash
+        (evicted tiles never leave it)."""
+        cs = world.CHUNK_SIZE
+        end = world_x_offset + width
+        pieces = []
+        gx = world_x_offset
+        while gx < end:
+            if gx // cs in self.chunk_store:
+                # stored stacks start on a chunk boundary
+                grid, level, rows = self.chunk_store.pop(gx // cs)
+                piece = grid, rows, level
+            else:
+                # atlas edges are chunk aligned
+                stop = gx
+                while stop < end and stop // cs not in self.chunk_store and self._in_atlas(stop) == self._in_atlas(gx):
+                    stop = min((stop // cs + 1) * cs, end)
+                piece = self._generate_fresh(stop - gx, gx)
+            pieces.append(piece)
+            gx += piece[0].shape[1]
+        grid, rows, level = zip(*pieces)
+        return np.concatenate(grid, axis=1), np.concatenate(rows), np.concatenate(level, axis=1)
+
+    def _in_atlas(self, gx: int) -> bool:
+        return self.atlas is not None and self.atlas.covers(gx)
+
+    def _generate_fresh(self, width: int, world_x_offset: int):
+        rows = self.grid_height
+        if self._in_atlas(world_x_offset):
+            grid = self.atlas.columns(world_x_offset, world_x_offset + width)
+        else:
+            if self.surface_band_depth is not None:
+                rows = world.surface_band(width, self.grid_height, world_x_offset, self.surface_band_depth, seed=self.world_seed)
+            grid = world.generate_world(
+                width, self.grid_height, world_x_offset=world_x_offset,
+                seed=self.world_seed, rng=self.world_rng, rows=rows,
+            )
+        level = np.where(items.IS_LIQUID[grid], MAX_LEVEL, 0).astype(np.uint8)
+        self.grid_hash ^= zobrist.region_hash(grid, world_x_offset)
+        self.grid_hash ^= zobrist.region_hash(level, world_x_offset, base=zobrist.LEVEL_BASE)
+        return grid, np.full(width, rows, dtype=np.int32), level
+
+    def ensure_generated(self, x0: int, x1: int, y1: int) -> None:
+        """Generate every row above ``y1`` (rounded up to a chunk) of the
+        local columns [x0, x1) that is still placeholder rock."""
+        x0, x1 = max(x0, 0), min(x1, self.grid_width)
+        cs = world.CHUNK_SIZE
+        y1 = min(-(-y1 // cs) * cs, self.grid_height)
+        if x0 >= x1 or self.generated_rows[x0:x1].min() >= y1:
+            return
+        rows = self.generated_rows
+        top = y1
+        run = x0
+        filled = []  # (xs, ys) of each generated run
+        # fill runs of columns that were generated to the same depth
+        for x in range(x0 + 1, x1 + 1):
+            if x == x1 or rows[x] != rows[run]:
+                y0 = int(rows[run])
+                if y0 < y1:
+                    self._generate_rows(run, x, y0, y1)
+                    top = min(top, y0)
+                    fx, fy = np.meshgrid(np.arange(run, x), np.arange(y0, y1))
+                    filled.append((fx.ravel(), fy.ravel()))
+                run = x
+
+        self.surface.rows_generated(x0, x1, top, y1)
+        self.block_index.columns_added(x0, x1)
+        self.fluids.rows_generated(x0, x1, top, y1)
+        self.lighting.rows_generated(x0, x1, top, y1)
+        # filled rows are block edits of the placeholder rock; coordinates
+        # don't move, so planners repair instead of starting over
+        xs = np.concatenate([f[0] for f in filled])
+        ys = np.concatenate([f[1] for f in filled])
+        self.chunk_graph.blocks_changed(xs + self.world_x_offset, ys)
+        for enemy in self.enemies:
+            if enemy.planner is not None:
+                enemy.planner.blocks_changed(xs, ys)
+        self._update_blocks()
+
+    def _generate_rows(self, x0: int, x1: int, y0: int, y1: int) -> None:
+        gx0 = self.world_x_offset + x0
+        self.grid_hash ^= zobrist.region_hash(self.grid[y0:y1, x0:x1], gx0, y0)
+        world.generate_rows(self.grid[:, x0:x1], gx0, y0, y1, seed=self.world_seed)
+        self.grid_hash ^= zobrist.region_hash(self.grid[y0:y1, x0:x1], gx0, y0)
+        self.generated_rows[x0:x1] = y1
+
+    def _ensure_near_actors(self) -> None:
+        """Generate the rock around and below the player and AI players
+        before anything collides with it."""
+        ts, cs = self.tile_size, world.CHUNK_SIZE
+        for actor in (self.player, *self.ai_players):
+            tx = actor.rect.centerx // ts
+            self.ensure_generated(tx - cs, tx + cs + 1, actor.rect.bottom // ts + cs)
 
     def reset(self, *, seed=None, options=None):
+        """Reset the episode. A ``seed`` reseeds every RNG stream of this
+        environment and generates a fresh world from it."""
         super().reset(seed=seed)
+        if seed is not None:
+            self._seed_streams(seed)
+        if seed is not None or self.grid is None:
+            self._generate_world()
         self.player.reset(DEFAULT_HEIGHT)
         
         x_tile = 12  # just a few tiles over from the player
@@ -108,39 +284,89 @@ class IntrinsicEnv(gym.Env):
         ]
         
         self.facing = [1, 0]
-        self.weather = WeatherSystem()
+        self.weather = WeatherSystem(rng=self.weather_rng)
         # Start with an empty world and spawn mobs dynamically during gameplay
-        self.enemies = []
-        self.passive_mobs = []
-        self.projectiles = []
+        self.enemies = MobStore(id_base=events.ENEMY_ID_BASE)
+        self.passive_mobs = MobStore(id_base=events.PASSIVE_ID_BASE)
+        self.projectiles = ProjectileStore()
         self._mining_target = None
         self._mining_progress = 0
-        return self._get_obs(), {}
+        self.ticks = 0
+        self.events.clear()
+        obs = self._get_obs()
+        if self.trajectory_writer is not None:
+            self.trajectory_writer.begin_episode(self, obs)
+        return obs, {}
 
     def _get_obs(self):
         return np.array([self.player.rect.x, self.player.rect.y, self.player.velocity[0], self.player.velocity[1]], dtype=np.float32)
 
     def step(self, action):
+        return self.step_repeat(action, 1)
+
+    def step_repeat(self, action, repeat: int):
+        """Run ``repeat`` ticks with the same action and observe once.
+
+        Gives the same result as calling ``step`` ``repeat`` times, but the
+        camera and observation are only built at the end. Stops early when
+        the episode ends; ``info["ticks"]`` is the number of ticks run.
+        """
+        total_reward = 0.0
+        done = False
+        ticks = 0
+        while ticks < repeat and not done:
+            reward, done = self._tick(action)
+            total_reward += reward
+            ticks += 1
+        env_logic.update_camera(self)
+        obs = self._get_obs()
+        if self.trajectory_writer is not None:
+            self.trajectory_writer.append(self, action, total_reward, done, obs)
+        return obs, total_reward, done, False, {"ticks": ticks, "events": self.events.drain()}
+
+    def _tick(self, action):
+        """Advance the simulation by one tick; returns ``(reward, done)``."""
+        if self.recorder is not None:
+            self.recorder.record_tick(self, action)
+        self.ticks += 1
         self.weather.step()
+        self.precipitation.step()
+        self._ensure_near_actors()
         env_logic.handle_input(self, action)
         env_logic.handle_physics(self)
-        env_logic.update_camera(self)
         env_logic.maybe_extend_world(self)
         env_logic.spawn_and_update_mobs(self)
         
         player_actions.handle_actions(self, action)
-        
+        self.falling.step()
+        self.fluids.step()
+
         for ai in self.ai_players:
-            action = ai.get_action(self)
-            env_logic.handle_input_single(self, ai, action)
+            ai_action = ai.get_action(self)
+            env_logic.handle_input_single(self, ai, ai_action)
             ai.apply_gravity(self.gravity)
-            ai.move_and_collide(self.blocks)
+            ai.move_and_collide(self.grid)
             ai.handle_oxygen(self.in_water)
 
+        if self.recorder is not None:
+            self.recorder.end_tick(self)
 
         done = self.player.health <= 0
         reward = 0.0
-        return self._get_obs(), reward, done, False, {}
+        return reward, done
+
+    def state_hash(self) -> int:
+        """Hash of the world and simulation state for repeat detection and
+        determinism checks (see zobrist.py)."""
+        return zobrist.state_hash(self)
+
+    def get_state(self) -> bytes:
+        """Snapshot the full simulation state (world, actors, mobs, RNGs)."""
+        return recording.dump_state(self)
+
+    def set_state(self, state: bytes) -> None:
+        """Restore a snapshot taken with ``get_state``."""
+        recording.load_state(self, state)
 
 
     def _on_ground(self):
@@ -150,19 +376,23 @@ class IntrinsicEnv(gym.Env):
         right_x = (self.player.rect.right - 1) // self.tile_size
         if below_y >= self.grid_height:
             return True
-        def solid(val):
-            return val not in (Block.EMPTY, Block.WATER)
         return (
-            solid(self.grid[below_y, left_x])
-            or solid(self.grid[below_y, right_x])
+            items.IS_SOLID[self.grid[below_y, left_x]]
+            or items.IS_SOLID[self.grid[below_y, right_x]]
         ) and self.player.velocity[1] >= 0
 
     def render(self):
+        from . import env_render  # drawing code loads with the first frame
+
         env_render.render_environment(self)
 
         
     def handle_events(self, events) -> None:
-        """Forward pygame events to UI (e.g., inventory)."""
+        """Forward pygame events to UI (e.g., inventory) and face the player
+        along the held movement keys."""
+        import pygame
+
+        self.player.adjust_facing_from_keys(pygame.key.get_pressed())
         for event in events:
             if event.type == pygame.KEYDOWN:
                 if pygame.K_1 <= event.key <= pygame.K_9:
@@ -176,48 +406,195 @@ class IntrinsicEnv(gym.Env):
 
     def close(self):
         if self.screen is not None:
+            import pygame
+
             pygame.quit()
             self.screen = None
 
     def _extend_world_right(self, extra_cols):
         """Extend world to the right using proper x-offset for biome continuity."""
         new_offset = self.world_x_offset + self.grid_width
-        new_grid = world.generate_world(extra_cols, self.grid_height, world_x_offset=new_offset)
+        # end on a chunk boundary so evicted chunks come back whole
+        cs = world.CHUNK_SIZE
+        extra_cols = -(-(new_offset + extra_cols) // cs) * cs - new_offset
+        new_grid, new_rows, new_level = self._generate_columns(extra_cols, new_offset)
         self.grid = np.concatenate([self.grid, new_grid], axis=1)
+        self.generated_rows = np.concatenate([self.generated_rows, new_rows])
         self.grid_width += extra_cols
         self._update_blocks()
+        self.surface.extend(extra_cols, left=False)
+        self.block_index.columns_added(self.grid_width - extra_cols, self.grid_width)
+        self.fluids.columns_added(self.grid_width - extra_cols, self.grid_width, new_level)
+        self.lighting.columns_added(self.grid_width - extra_cols, self.grid_width)
+        self.precipitation.columns_added(self.grid_width - extra_cols, self.grid_width)
+        self.chunk_graph.columns_changed(new_offset, new_offset + extra_cols)
+        self._reset_planners()
 
 
     def _extend_world_left(self, extra_cols):
         """Extend world to the left and adjust global offset."""
-        new_offset = self.world_x_offset - extra_cols
-        new_grid = world.generate_world(extra_cols, self.grid_height, world_x_offset=new_offset)
+        cs = world.CHUNK_SIZE
+        new_offset = (self.world_x_offset - extra_cols) // cs * cs
+        extra_cols = self.world_x_offset - new_offset
+        new_grid, new_rows, new_level = self._generate_columns(extra_cols, new_offset)
         self.grid = np.concatenate([new_grid, self.grid], axis=1)
+        self.generated_rows = np.concatenate([new_rows, self.generated_rows])
         self.grid_width += extra_cols
         self.world_x_offset -= extra_cols  # shift global position left
+        self._shift_actors(extra_cols * self.tile_size)
 
-        shift_px = extra_cols * self.tile_size
-        self.player.rect.x += shift_px
-        for enemy in self.enemies:
-            enemy.rect.x += shift_px
-        for mob in self.passive_mobs:
-            mob.rect.x += shift_px
-        for proj in self.projectiles:
-            proj.rect.x += shift_px
+        self._update_blocks()
+        self.surface.extend(extra_cols, left=True)
+        self.block_index.columns_added(0, extra_cols)
+        self.fluids.columns_added(0, extra_cols, new_level)
+        self.lighting.columns_added(0, extra_cols)
+        self.precipitation.columns_added(0, extra_cols)
+        self.chunk_graph.columns_changed(new_offset, new_offset + extra_cols)
+        self._reset_planners()
+
+
+    def _evict_far_columns(self) -> None:
+        """Pack whole chunks of columns further than ``evict_distance`` from
+        every player into ``chunk_store``."""
+        if self.evict_distance is None:
+            return
+        cs = world.CHUNK_SIZE
+        xs = [a.rect.centerx // self.tile_size + self.world_x_offset for a in (self.player, *self.ai_players)]
+        left = (min(xs) - self.evict_distance) // cs * cs
+        if left - self.world_x_offset >= EVICT_BATCH * cs:
+            self._evict_columns(self.world_x_offset, left)
+        right = -(-(max(xs) + self.evict_distance) // cs) * cs
+        end = self.world_x_offset + self.grid_width
+        if end - right >= EVICT_BATCH * cs:
+            self._evict_columns(right, end)
+
+    def _evict_columns(self, gx0: int, gx1: int) -> None:
+        """Move the global columns [gx0, gx1) at either edge of the grid
+        into ``chunk_store``. ``gx0`` is on a chunk boundary."""
+        cs = world.CHUNK_SIZE
+        x0, x1 = gx0 - self.world_x_offset, gx1 - self.world_x_offset
+        for a in range(x0, x1, cs):
+            b = min(a + cs, x1)
+            self.chunk_store.put(
+                (a + self.world_x_offset) // cs,
+                self.grid[:, a:b], self.fluids.level[:, a:b], self.generated_rows[a:b],
+            )
+        self.surface.columns_removed(gx0, gx1)
+        self.block_index.columns_removed(gx0, gx1)
+        self.fluids.columns_removed(gx0, gx1)
+        self.precipitation.columns_removed(gx0, gx1)
+        self.falling.columns_removed(gx0, gx1)
+        self.chunk_graph.columns_changed(gx0, gx1)
+        self.grid = np.delete(self.grid, np.s_[x0:x1], axis=1)
+        self.generated_rows = np.delete(self.generated_rows, np.s_[x0:x1])
+        self.grid_width -= x1 - x0
+        if x0 == 0:
+            self.world_x_offset += x1
+            self._shift_actors(-x1 * self.tile_size)
+        self.lighting.columns_removed(x0, x1)
+
+        # mobs and projectiles in the evicted columns go with them
+        width_px = self.grid_width * self.tile_size
+        for store in (self.enemies, self.passive_mobs):
+            for mob in store:
+                if not 0 <= mob.rect.centerx < width_px:
+                    store.remove(mob)
+        n = self.projectiles.n
+        self.projectiles.remove_mask((self.projectiles.x[:n] < 0) | (self.projectiles.x[:n] >= width_px))
+        self._mining_target = None
+        self._reset_planners()
+        self._update_blocks()
 
+    def _shift_actors(self, dx: int) -> None:
+        """Move everything positioned in local pixels after the grid's left
+        edge moved."""
+        self.player.rect.x += dx
+        for ai in self.ai_players:
+            ai.rect.x += dx
+        shift_x(self.enemies, dx)
+        shift_x(self.passive_mobs, dx)
+        self.projectiles.shift_x(dx)
+        self.precipitation.shift_x(dx)
+
+    def block_at(self, gx: int, y: int):
+        """Block at global tile (gx, y) whether its column is in the grid or
+        evicted; None for columns never generated."""
+        x = gx - self.world_x_offset
+        if 0 <= x < self.grid_width:
+            return int(self.grid[y, x])
+        return self.chunk_store.block_at(gx, y)
+
+    def set_block(self, x: int, y: int, block_id: int) -> None:
+        """Write a block to the grid and refresh state derived from it."""
+        self.set_blocks((x,), (y,), (block_id,))
+
+    def set_blocks(self, xs, ys, block_ids) -> None:
+        """Write several blocks at once (local tile coordinates).
+
+        The last write to a tile wins and writes that leave a tile as it
+        was are dropped; every index is then updated once for the batch.
+        """
+        xs = np.asarray(xs, dtype=np.int64).ravel()
+        ys = np.asarray(ys, dtype=np.int64).ravel()
+        new = np.asarray(block_ids).astype(self.grid.dtype).ravel()
+        _, last = np.unique((ys * self.grid_width + xs)[::-1], return_index=True)
+        keep = len(xs) - 1 - last
+        keep = keep[self.grid[ys[keep], xs[keep]] != new[keep]]
+        if len(keep) == 0:
+            return
+        xs, ys, new = xs[keep], ys[keep], new[keep]
+        old = self.grid[ys, xs]
+        gxs = xs + self.world_x_offset
+        self.grid_hash ^= zobrist.tiles_hash(gxs, ys, old) ^ zobrist.tiles_hash(gxs, ys, new)
+        self.grid[ys, xs] = new
+        self.surface.blocks_changed(xs, ys)
+        self.block_index.blocks_changed(xs, ys, old, new)
+        self.fluids.blocks_changed(xs, ys, new)
+        self.falling.blocks_changed(xs, ys, new)
+        self.chunk_graph.blocks_changed(gxs, ys)
+        for enemy in self.enemies:
+            if enemy.planner is not None:
+                enemy.planner.blocks_changed(xs, ys)
+        self.lighting.blocks_changed(xs, ys)
         self._update_blocks()
 
+    def _reset_planners(self):
+        """Drop incremental search state after the grid is reshaped."""
+        for enemy in self.enemies:
+            enemy.planner = None
+        for mob in self.passive_mobs:
+            mob.goal = None
 
     def _update_blocks(self):
-        """Recreate block rectangles from the grid for collision and rendering."""
-        self.blocks, self.water_blocks = world.blocks_from_grid(self.grid, self.tile_size)
+        """Drop the cached block rectangles after the grid changed."""
+        self._block_rects = None
+
+    @property
+    def blocks(self):
+        """``(rect, block)`` pairs of every solid tile, built on demand."""
+        if self._block_rects is None:
+            self._block_rects = world.blocks_from_grid(self.grid, self.tile_size)
+        return self._block_rects[0]
+
+    @property
+    def water_blocks(self):
+        """Rects of every water tile, built on demand."""
+        if self._block_rects is None:
+            self._block_rects = world.blocks_from_grid(self.grid, self.tile_size)
+        return self._block_rects[1]
+
+    def tiles_under(self, rect) -> np.ndarray:
+        """Grid window covered by a pixel rect (clipped to the world)."""
+        ts = self.tile_size
+        x0, x1 = max(rect.left // ts, 0), min((rect.right - 1) // ts + 1, self.grid_width)
+        y0, y1 = max(rect.top // ts, 0), min((rect.bottom - 1) // ts + 1, self.grid_height)
+        return self.grid[y0:y1, x0:x1]
 
     def _find_spawn_y(self, tile_x: int) -> int:
         """Return the surface y position (in pixels) for spawning an enemy."""
-        for y in range(self.grid_height):
-            block = self.grid[y, tile_x]
-            if block != Block.EMPTY and block not in (Block.WOOD, Block.LEAVES):
-                return max(0, (y - 1) * self.tile_size)
+        y = self.surface.surface_y(tile_x)
+        if y >= 0:
+            return max(0, (y - 1) * self.tile_size)
         # default to ground level if nothing found
         return max(0, (self.grid_height - 2) * self.tile_size)
 
@@ -225,11 +602,11 @@ class IntrinsicEnv(gym.Env):
         """Occasionally add new mobs to the world."""
         if (
             len(self.enemies) < self.max_enemies
-            and np.random.random() < self.enemy_spawn_chance
+            and self.spawn_rng.random() < self.enemy_spawn_chance
         ):
             self.enemies.extend(spawn_random_enemies(1, self))
         if (
             len(self.passive_mobs) < self.max_passive_mobs
-            and np.random.random() < self.passive_spawn_chance
+            and self.spawn_rng.random() < self.passive_spawn_chance
         ):
             self.passive_mobs.extend(spawn_random_passive_mobs(1, self))
@@ -29,6 +29,10 @@ class Inventory(OrderedDict):
         return True
 
 
+    def __reduce__(self):
+        # OrderedDict pickles through ``cls()``; pass the slot count along
+        return type(self), (self.max_slots,), self.__dict__, None, iter(self.items())
+
     def __setitem__(self, key: str, value: int) -> None:
         if value <= 0:
             if key in self:
@@ -3,7 +3,7 @@ from typing import Dict, Optional
 import json
 import os
 
-from . import world
+import numpy as np
 
 @dataclass
 class ItemInfo:
@@ -14,6 +14,8 @@ class ItemInfo:
     block_id: Optional[int] = None
     damage: int = 0
     color: Optional[list[int]] = None
+    light: int = 0
+    falls: bool = False
 
 # Load item definitions from items.json
 _items_path = os.path.join(os.path.dirname(__file__), "items.json")
@@ -46,6 +48,30 @@ ORE_TYPES: list[int] = [
     if info.group == "ore" and info.block_id is not None
 ]
 
+# === Dense lookup tables indexed by block id ===
+# ``LUT[grid]`` turns a whole grid region into a property mask in one step.
+ITEM_NAMES: list[str] = list(ITEM_STATS)
+ITEM_IDS: Dict[str, int] = {name: i for i, name in enumerate(ITEM_NAMES)}
+
+NUM_BLOCKS = max(BLOCK_STATS) + 1
+IS_LIQUID = np.zeros(NUM_BLOCKS, dtype=bool)
+IS_SOLID = np.zeros(NUM_BLOCKS, dtype=bool)
+MINING_TIME = np.ones(NUM_BLOCKS, dtype=np.int32)
+DROP_ITEM = np.full(NUM_BLOCKS, -1, dtype=np.int16)  # index into ITEM_NAMES
+COLOR_LUT = np.full((NUM_BLOCKS, 3), 255, dtype=np.uint8)
+LIGHT_EMISSION = np.zeros(NUM_BLOCKS, dtype=np.int16)  # see lighting.py
+FALLS = np.zeros(NUM_BLOCKS, dtype=bool)  # see falling.py
+
+for block_id, info in BLOCK_STATS.items():
+    IS_LIQUID[block_id] = info.group == "liquid"
+    IS_SOLID[block_id] = block_id != 0 and not IS_LIQUID[block_id]
+    MINING_TIME[block_id] = info.mining_time
+    LIGHT_EMISSION[block_id] = info.light
+    FALLS[block_id] = info.falls
+    DROP_ITEM[block_id] = ITEM_IDS[BLOCK_TO_ITEM[block_id]]
+    if info.color is not None:
+        COLOR_LUT[block_id] = info.color
+
 # === Create Block namespace ===
 class Block:
     """Convenient access to block IDs like Block.DIRT, Block.GRASS, etc."""
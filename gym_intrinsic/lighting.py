@@ -0,0 +1,149 @@
+"""Per-tile sky light and block light.
+
+Light levels run from 0 to MAX_LIGHT. Sky light enters every column from
+the top and falls straight down until opaque blocks absorb it; block light
+starts at emitting blocks (``items.LIGHT_EMISSION``). Both then spread to
+the four neighbours, losing ``ABSORB[block]`` per tile entered.
+
+Light never travels further than MAX_LIGHT tiles, so a block edit can only
+change light within that distance of the edited tile and of the column
+segment below it whose sky exposure changed. Edits re-propagate just that
+window, with the light around it held fixed, in at most MAX_LIGHT
+relaxation sweeps.
+"""
+
+import numpy as np
+
+from .items import IS_LIQUID, IS_SOLID, LIGHT_EMISSION, NUM_BLOCKS, Block
+
+MAX_LIGHT = 15
+
+# light lost when entering a tile of each block type
+ABSORB = np.ones(NUM_BLOCKS, dtype=np.int16)
+ABSORB[IS_SOLID] = MAX_LIGHT + 1
+ABSORB[IS_LIQUID] = 2
+ABSORB[Block.LEAVES] = 2
+
+# darkest a tile is drawn, so unlit caves stay readable
+AMBIENT = 0.08
+
+
+def direct_sky(grid: np.ndarray) -> np.ndarray:
+    """Sky light reaching each tile straight from above."""
+    loss = np.cumsum(ABSORB[grid] - 1, axis=0)
+    return np.clip(MAX_LIGHT - loss, 0, MAX_LIGHT).astype(np.int16)
+
+
+def _relax(light: np.ndarray, absorb: np.ndarray, free: np.ndarray) -> np.ndarray:
+    """Spread ``light`` to neighbours until stable. Only ``free`` tiles
+    change; the others act as fixed boundary values."""
+    for _ in range(MAX_LIGHT):
+        spread = np.zeros_like(light)
+        spread[1:] = light[:-1]
+        np.maximum(spread[:-1], light[1:], out=spread[:-1])
+        np.maximum(spread[:, 1:], light[:, :-1], out=spread[:, 1:])
+        np.maximum(spread[:, :-1], light[:, 1:], out=spread[:, :-1])
+        new = np.where(free, np.maximum(light, spread - absorb), light)
+        if np.array_equal(new, light):
+            break
+        light = new
+    return light
+
+
+class LightField:
+    """Sky and block light of one environment's grid (local coordinates)."""
+
+    def __init__(self, env):
+        self.env = env
+        self.sky = np.zeros(env.grid.shape, dtype=np.uint8)
+        self.block = np.zeros(env.grid.shape, dtype=np.uint8)
+
+    # --- maintenance -------------------------------------------------------
+    def rebuild(self) -> None:
+        self.sky = np.zeros(self.env.grid.shape, dtype=np.uint8)
+        self.block = np.zeros(self.env.grid.shape, dtype=np.uint8)
+        self._relight(0, self.env.grid_width, 0, self.env.grid_height)
+
+    def columns_added(self, x0: int, x1: int) -> None:
+        """Light the freshly generated local columns [x0, x1)."""
+        pad = np.zeros((self.env.grid_height, x1 - x0), dtype=np.uint8)
+        if x0 == 0:
+            self.sky = np.concatenate([pad, self.sky], axis=1)
+            self.block = np.concatenate([pad, self.block], axis=1)
+        else:
+            self.sky = np.concatenate([self.sky, pad], axis=1)
+            self.block = np.concatenate([self.block, pad], axis=1)
+        self._relight(x0 - MAX_LIGHT, x1 + MAX_LIGHT, 0, self.env.grid_height)
+
+    def columns_removed(self, x0: int, x1: int) -> None:
+        """Drop the local columns [x0, x1) once they have been evicted from
+        the grid, and relight the new edge so light that came from them
+        fades out as it would in a rebuild."""
+        self.sky = np.delete(self.sky, np.s_[x0:x1], axis=1)
+        self.block = np.delete(self.block, np.s_[x0:x1], axis=1)
+        if x0 == 0:
+            self._relight(0, MAX_LIGHT, 0, self.env.grid_height)
+        else:
+            self._relight(x0 - MAX_LIGHT, x0, 0, self.env.grid_height)
+
+    def rows_generated(self, x0: int, x1: int, y0: int, y1: int) -> None:
+        """Relight around a local region filled in by lazy generation; the
+        rock below it stays unlit, so no sky column changes further down."""
+        self._relight(x0 - MAX_LIGHT, x1 + MAX_LIGHT, y0 - MAX_LIGHT, y1 + MAX_LIGHT)
+
+    def blocks_changed(self, xs, ys) -> None:
+        """Re-propagate light around a batch of edited tiles."""
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        if len(xs) == 0:
+            return
+        # sky exposure below an edit can change down to the next opaque tile
+        grid = self.env.grid
+        h = grid.shape[0]
+        below = IS_SOLID[grid[:, xs]] & (np.arange(h)[:, None] > ys)
+        bottom = int(np.where(below.any(axis=0), below.argmax(axis=0), h).max())
+        self._relight(
+            int(xs.min()) - MAX_LIGHT, int(xs.max()) + MAX_LIGHT + 1,
+            int(ys.min()) - MAX_LIGHT, bottom + MAX_LIGHT,
+        )
+
+    def _relight(self, x0: int, x1: int, y0: int, y1: int) -> None:
+        """Recompute light inside the local window, keeping one ring of
+        tiles around it as the boundary."""
+        h, w = self.env.grid.shape
+        x0, x1 = max(x0, 0), min(x1, w)
+        y0, y1 = max(y0, 0), min(y1, h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        rx0, rx1 = max(x0 - 1, 0), min(x1 + 1, w)
+        ry0, ry1 = max(y0 - 1, 0), min(y1 + 1, h)
+        grid = self.env.grid[ry0:ry1, rx0:rx1]
+        absorb = ABSORB[grid]
+        free = np.zeros(grid.shape, dtype=bool)
+        free[y0 - ry0 : y1 - ry0, x0 - rx0 : x1 - rx0] = True
+
+        # sky sources use the whole column above the window
+        sky = direct_sky(self.env.grid[:ry1, rx0:rx1])[ry0:]
+        sky = np.where(free, sky, self.sky[ry0:ry1, rx0:rx1])
+        block = np.where(free, LIGHT_EMISSION[grid], self.block[ry0:ry1, rx0:rx1]).astype(np.int16)
+        self.sky[y0:y1, x0:x1] = _relax(sky, absorb, free)[free].reshape(y1 - y0, x1 - x0)
+        self.block[y0:y1, x0:x1] = _relax(block, absorb, free)[free].reshape(y1 - y0, x1 - x0)
+
+    # --- queries -----------------------------------------------------------
+    def brightness(self, x0: int, x1: int, y0: int, y1: int, daylight: float) -> np.ndarray:
+        """Draw brightness (AMBIENT..1) of the local window. Opaque tiles
+        take the brightest neighbour so lit surfaces show up."""
+        h, w = self.env.grid.shape
+        rx0, rx1 = max(x0 - 1, 0), min(x1 + 1, w)
+        ry0, ry1 = max(y0 - 1, 0), min(y1 + 1, h)
+        light = np.maximum(
+            self.sky[ry0:ry1, rx0:rx1] * daylight, self.block[ry0:ry1, rx0:rx1].astype(np.float32)
+        )
+        lit = light.copy()
+        lit[1:] = np.maximum(lit[1:], light[:-1])
+        lit[:-1] = np.maximum(lit[:-1], light[1:])
+        lit[:, 1:] = np.maximum(lit[:, 1:], light[:, :-1])
+        lit[:, :-1] = np.maximum(lit[:, :-1], light[:, 1:])
+        solid = IS_SOLID[self.env.grid[ry0:ry1, rx0:rx1]]
+        light = np.where(solid, lit, light)[y0 - ry0 : y1 - ry0, x0 - rx0 : x1 - rx0]
+        return np.maximum(light / MAX_LIGHT, AMBIENT)
@@ -0,0 +1,62 @@
+"""Simulation level of detail for mobs.
+
+Mobs are bucketed by their tile distance to the nearest actor (the player
+and AI players):
+
+* near  (``<= env.sim_near_radius``): updated every tick;
+* mid   (``<= env.sim_far_radius``): updated every ``env.sim_mid_interval``
+  ticks with a coarse step covering the skipped ticks;
+* far: frozen, or despawned when ``env.sim_far_policy == "despawn"``.
+
+Each mob's ``lod_phase`` offsets its reduced-rate tick, so mid-range updates
+are spread evenly over the interval instead of all landing on one frame.
+"""
+
+import numpy as np
+
+from .mob_store import MobStore
+
+NEAR, MID, FAR = 0, 1, 2
+
+
+def actor_centres(env) -> np.ndarray:
+    """Pixel centres of every actor that keeps the world simulated."""
+    actors = [env.player, *env.ai_players]
+    return np.array([a.rect.center for a in actors], dtype=np.int64)
+
+
+def tiers(env, store: MobStore) -> np.ndarray:
+    """LOD tier of every mob in ``store``."""
+    n = len(store)
+    cx = store.x[:n] + store.w[:n] // 2
+    cy = store.y[:n] + store.h[:n] // 2
+    centres = actor_centres(env)
+    # Chebyshev distance in tiles to the closest actor
+    dist = np.max(
+        np.abs(np.stack([cx, cy], axis=1)[:, None, :] - centres[None, :, :]), axis=2
+    ).min(axis=1) // env.tile_size
+    tier = np.full(n, FAR, dtype=np.int8)
+    tier[dist <= env.sim_far_radius] = MID
+    tier[dist <= env.sim_near_radius] = NEAR
+    return tier
+
+
+def schedule(env, store: MobStore):
+    """Rows of ``store`` to update this tick and the ticks each one covers.
+
+    Applies the far policy first, which may despawn mobs.
+    """
+    if len(store) == 0:
+        return np.zeros(0, dtype=np.intp), np.ones(0, dtype=np.int32)
+    tier = tiers(env, store)
+    if env.sim_far_policy == "despawn" and (tier == FAR).any():
+        for i in sorted(np.flatnonzero(tier == FAR).tolist(), reverse=True):
+            store.remove(store.views[i])
+        tier = tiers(env, store)
+
+    interval = env.sim_mid_interval
+    n = len(store)
+    due = (tier == NEAR) | ((tier == MID) & ((env.ticks + store.lod_phase[:n]) % interval == 0))
+    rows = np.flatnonzero(due)
+    dt = np.where(tier[rows] == MID, interval, 1).astype(np.int32)
+    return rows, dt
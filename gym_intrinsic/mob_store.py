@@ -0,0 +1,315 @@
+"""Structure-of-arrays storage for mobs.
+
+Mob state lives in parallel NumPy arrays so movement, gravity and tile
+collision can run as batch operations over every mob at once. ``Enemy`` and
+``PassiveMob`` instances are thin views onto one row of a ``MobStore``.
+"""
+
+import numpy as np
+import pygame
+
+from . import collision, pathfinding
+
+
+# Array fields held per mob: name -> dtype
+FIELDS = {
+    "x": np.int32,
+    "y": np.int32,
+    "w": np.int32,
+    "h": np.int32,
+    "vel_y": np.float64,
+    "speed": np.int32,
+    "jump_height": np.int32,
+    "health": np.int32,
+    "kind": np.int16,
+    "path_index": np.int32,
+    "cooldown": np.int32,
+    "direction": np.int8,
+    "move_timer": np.int32,
+    "food_drop": np.int32,
+    "last_path_time": np.int64,
+    # tick before which a mob that found no route doesn't plan again
+    "plan_after": np.int64,
+    # offset spreading reduced-rate (mid-range) updates across ticks
+    "lod_phase": np.int32,
+    # stable id for event logs (store id base + spawn number)
+    "uid": np.int32,
+    # cached tile of the current path step, refreshed when the cursor moves
+    "has_target": np.bool_,
+    "tgt_x": np.int32,
+    "tgt_y": np.int32,
+}
+
+
+class MobRect(pygame.Rect):
+    """Rect snapshot that writes position changes back to its mob."""
+
+    __slots__ = ("_view",)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        view = getattr(self, "_view", None)
+        if name != "_view" and view is not None:
+            view.rect = self
+
+
+class Field:
+    """Descriptor reading a mob attribute from its store row (or a local
+    value while the mob is not yet part of a store)."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if obj._store is None:
+            return obj._local[self.name]
+        return getattr(obj._store, self.name)[obj._i].item()
+
+    def __set__(self, obj, value):
+        if obj._store is None:
+            obj._local[self.name] = value
+        else:
+            getattr(obj._store, self.name)[obj._i] = value
+
+
+class MobView:
+    """Base class for mobs backed by a ``MobStore`` row."""
+
+    health = Field()
+    speed = Field()
+    jump_height = Field()
+    vel_y = Field()
+    path_index = Field()
+    direction = Field()
+    move_timer = Field()
+    food_drop = Field()
+    last_path_time = Field()
+    uid = Field()
+
+    # numeric kind code written to the store, set by subclasses
+    kind_code = 0
+
+    def __init__(self, rect: pygame.Rect, **values):
+        self._store = None
+        self._i = -1
+        self._local = {name: 0 for name in FIELDS}
+        self._local.update(x=rect.x, y=rect.y, w=rect.width, h=rect.height, kind=self.kind_code)
+        self._color = (0, 0, 0)
+        # Python-side per-mob state
+        self._path = None
+        self.last_player_tile = None
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    @property
+    def rect(self) -> MobRect:
+        if self._store is None:
+            vals = self._local
+            r = MobRect(vals["x"], vals["y"], vals["w"], vals["h"])
+        else:
+            s, i = self._store, self._i
+            r = MobRect(int(s.x[i]), int(s.y[i]), int(s.w[i]), int(s.h[i]))
+        r._view = self
+        return r
+
+    @rect.setter
+    def rect(self, rect: pygame.Rect) -> None:
+        if self._store is None:
+            self._local.update(x=rect.x, y=rect.y, w=rect.width, h=rect.height)
+        else:
+            s, i = self._store, self._i
+            s.x[i], s.y[i], s.w[i], s.h[i] = rect.x, rect.y, rect.width, rect.height
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value) -> None:
+        self._color = tuple(value)
+
+    @property
+    def path(self):
+        return self._path
+
+    @path.setter
+    def path(self, value) -> None:
+        self._path = value
+        if self._store is not None:
+            self._store.refresh_targets([self._i])
+
+
+class MobStore:
+    """Growable structure-of-arrays container of mobs.
+
+    Behaves like a list of views for iteration, ``len``, indexing and
+    ``remove``; removal swaps the last mob into the freed row.
+    """
+
+    def __init__(self, capacity: int = 16, id_base: int = 0):
+        self.views = []
+        self._capacity = capacity
+        self._spawned = 0
+        self.id_base = id_base
+        for name, dtype in FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    # --- list-like interface -------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.views)
+
+    def __iter__(self):
+        return iter(list(self.views))
+
+    def __getitem__(self, i):
+        return self.views[i]
+
+    def append(self, view: MobView) -> None:
+        n = len(self.views)
+        if n == self._capacity:
+            self._grow(self._capacity * 2)
+        for name in FIELDS:
+            getattr(self, name)[n] = view._local[name]
+        self.lod_phase[n] = self._spawned
+        self.uid[n] = self.id_base + self._spawned
+        self._spawned += 1
+        view._store, view._i = self, n
+        self.views.append(view)
+        self.refresh_targets([n])
+
+    def extend(self, views) -> None:
+        for view in views:
+            self.append(view)
+
+    def remove(self, view: MobView) -> None:
+        if view._store is not self:
+            raise ValueError("mob is not in this store")
+        i, last = view._i, len(self.views) - 1
+        view._local = {name: getattr(self, name)[i].item() for name in FIELDS}
+        view._store, view._i = None, -1
+        if i != last:
+            for name in FIELDS:
+                arr = getattr(self, name)
+                arr[i] = arr[last]
+            moved = self.views[last]
+            moved._i = i
+            self.views[i] = moved
+        self.views.pop()
+
+    def clear(self) -> None:
+        for view in list(self.views):
+            self.remove(view)
+
+    def _grow(self, capacity: int) -> None:
+        for name, dtype in FIELDS.items():
+            arr = np.zeros(capacity, dtype=dtype)
+            arr[: self._capacity] = getattr(self, name)
+            setattr(self, name, arr)
+        self._capacity = capacity
+
+    # --- path cursor ---------------------------------------------------------
+    def refresh_targets(self, indices) -> None:
+        """Re-cache the current path step for the given rows."""
+        for i in indices:
+            path = self.views[i]._path if i < len(self.views) else None
+            idx = self.path_index[i]
+            if path and idx < len(path):
+                self.has_target[i] = True
+                self.tgt_x[i], self.tgt_y[i] = path[idx]
+            else:
+                self.has_target[i] = False
+
+    def advance_paths(self, rows) -> None:
+        """Move the path cursor forward for the given rows."""
+        self.path_index[rows] += 1
+        self.refresh_targets(rows)
+
+    # --- batches -------------------------------------------------------------
+    def gather(self, rows=None) -> "MobBatch":
+        if rows is None:
+            rows = np.arange(len(self.views))
+        return MobBatch(self, rows)
+
+    def scatter(self, batch: "MobBatch") -> None:
+        for name in FIELDS:
+            getattr(self, name)[batch.rows] = getattr(batch, name)
+
+
+class MobBatch:
+    """Copies of the selected rows of a ``MobStore``.
+
+    Update passes work on a batch and write it back with ``scatter`` so a
+    subset of mobs (e.g. one level-of-detail tier) can be stepped alone.
+    ``dt`` is the number of ticks each row advances.
+    """
+
+    def __init__(self, store: MobStore, rows: np.ndarray):
+        self.rows = rows
+        for name in FIELDS:
+            setattr(self, name, getattr(store, name)[rows])
+        self.dt = np.ones(len(rows), dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+# === Batch physics helpers ===================================================
+def grounded(env, left, right, bottom) -> np.ndarray:
+    """True where a solid tile lies in row ``bottom`` under either column."""
+    return pathfinding.solid_mask(env, left, bottom) | pathfinding.solid_mask(env, right, bottom)
+
+
+def try_jump(b: MobBatch, act, target_px, target_py, grounded_now, tile_size: int) -> None:
+    """Start a jump for mobs whose current path step is above them."""
+    x, y, w, h, vel_y = b.x, b.y, b.w, b.h, b.vel_y
+    centerx = x + w // 2
+    jump = (
+        act
+        & (target_py + tile_size < y + h)
+        & (np.abs(centerx - target_px) <= tile_size)
+        & grounded_now
+        & (np.abs(vel_y) < 1e-3)
+    )
+    vel_y[jump] = b.jump_height[jump]
+
+
+def move_x(b: MobBatch, env, dx) -> None:
+    """Move mobs horizontally by ``dx``, stopping at the first solid column."""
+    collision.sweep_boxes(env, b.x, b.y, b.w, b.h, dx, np.zeros_like(dx))
+
+
+def apply_gravity(b: MobBatch, env, gravity: float, max_fall_speed: float) -> None:
+    """Integrate ``dt`` ticks of gravity and sweep the fall against the grid.
+
+    Reduced-rate rows take one coarse step, which the sweep keeps from
+    tunnelling through floors.
+    """
+    ts = env.tile_size
+    x, y, w, h, vel_y = b.x, b.y, b.w, b.h, b.vel_y
+    np.minimum(vel_y + gravity * b.dt, max_fall_speed, out=vel_y)
+
+    # mobs embedded in a solid tile (e.g. spawned in a tree trunk) climb
+    # out one tile per tick instead of falling
+    bottom = (y + h - 1) // ts
+    stuck = grounded(env, x // ts, (x + w - 1) // ts, bottom)
+    y[stuck] = bottom[stuck] * ts - h[stuck]
+
+    dy = np.where(stuck, 0, vel_y * b.dt).astype(np.int32)
+    _, hit = collision.sweep_boxes(env, x, y, w, h, np.zeros_like(dy), dy)
+    vel_y[hit | stuck] = 0
+
+
+def overlaps(b, rect: pygame.Rect) -> np.ndarray:
+    """Vectorised ``Rect.colliderect`` of every mob against ``rect``."""
+    x, y, w, h = b.x, b.y, b.w, b.h
+    return (
+        (x < rect.right) & (rect.x < x + w)
+        & (y < rect.bottom) & (rect.y < y + h)
+        & (w > 0) & (h > 0)
+    )
+
+
+def shift_x(store: MobStore, dx: int) -> None:
+    store.x[: len(store)] += dx
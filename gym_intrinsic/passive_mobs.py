@@ -1,35 +1,75 @@
 import pygame
 import numpy as np
-from dataclasses import dataclass
 from typing import List, Dict, Tuple
 from . import pathfinding  # Make sure this module exists
-
-@dataclass
-class PassiveMob:
-    rect: pygame.Rect
-    type: str
-    health: int
-    color: tuple
-    food_drop: int
-    direction: int = 0
-    move_timer: int = 0
-    speed: int = 2
-    jump_height: int = -13
-    vel_y: float = 0.0
-    path: List[Tuple[int, int]] = None
-    path_index: int = 0
+from .world import CHUNK_SIZE
+from . import mob_store
+from .mob_store import MobStore, MobView
 
 PASSIVE_TYPES: Dict[str, Dict] = {
     "bunny": {"color": (255, 200, 200), "health": 10, "food": 1},
     "chicken": {"color": (255, 255, 0), "health": 15, "food": 2},
 }
+_TYPE_NAMES = list(PASSIVE_TYPES)
+# ticks a mob waits after finding no route before it plans again
+REPLAN_BACKOFF = 60
+
+
+class PassiveMob(MobView):
+    """Thin view onto one row of the passive mob ``MobStore``."""
+
+    def __init__(
+        self,
+        rect: pygame.Rect,
+        type: str,
+        health: int,
+        color: tuple,
+        food_drop: int,
+        direction: int = 0,
+        move_timer: int = 0,
+        speed: int = 2,
+        jump_height: int = -13,
+        vel_y: float = 0.0,
+        path: List[Tuple[int, int]] = None,
+        path_index: int = 0,
+    ):
+        super().__init__(
+            rect,
+            type=type,
+            health=health,
+            color=color,
+            food_drop=food_drop,
+            direction=direction,
+            move_timer=move_timer,
+            speed=speed,
+            jump_height=jump_height,
+            vel_y=vel_y,
+            path=path,
+            path_index=path_index,
+        )
+        # Final wander target; long routes are followed one segment at a time
+        self.goal = None
+
+    @property
+    def type(self) -> str:
+        kind = self._local["kind"] if self._store is None else self._store.kind[self._i]
+        return _TYPE_NAMES[kind]
+
+    @type.setter
+    def type(self, value: str) -> None:
+        kind = _TYPE_NAMES.index(value)
+        if self._store is None:
+            self._local["kind"] = kind
+        else:
+            self._store.kind[self._i] = kind
+
 
 def spawn_random_passive_mobs(num: int, env) -> List[PassiveMob]:
     mobs: List[PassiveMob] = []
     types = list(PASSIVE_TYPES.keys())
     for _ in range(num):
-        mtype = np.random.choice(types)
-        ex = np.random.randint(0, env.grid_width)
+        mtype = str(env.spawn_rng.choice(types))
+        ex = int(env.spawn_rng.integers(0, env.grid_width))
         ey = env._find_spawn_y(ex)
         info = PASSIVE_TYPES[mtype]
         rect = pygame.Rect(ex * env.tile_size, ey, env.tile_size, env.tile_size)
@@ -44,100 +84,76 @@ def spawn_random_passive_mobs(num: int, env) -> List[PassiveMob]:
         )
     return mobs
 
-def update_passive_mobs(mobs: List[PassiveMob], env) -> None:
+def update_passive_mobs(mobs: MobStore, env, rows=None, dt=None) -> None:
+    """Step the mobs in ``rows`` (all by default) by ``dt`` ticks each."""
+    if len(mobs) == 0:
+        return
     gravity = 0.8
     max_fall_speed = 10
     tile_size = env.tile_size
     world_w = env.grid_width * tile_size
     world_h = env.grid_height * tile_size
-
-    def is_solid(x: int, y: int) -> bool:
-        if 0 <= x < env.grid_width and 0 <= y < env.grid_height:
-            block = env.grid[y, x]
-            return block not in (0, 8)  # not EMPTY or WATER
-        return False
-
-    for mob in mobs:
-        # Assign a new path if needed
-        if mob.path is None or mob.path_index >= len(mob.path):
-            start_tile = (mob.rect.centerx // tile_size, mob.rect.bottom // tile_size)
-            target_tile = pathfinding.find_random_air_target(env)
+    rows = np.arange(len(mobs)) if rows is None else np.asarray(rows)
+    if len(rows) == 0:
+        return
+
+    # Assign a new path if needed
+    for i in rows.tolist():
+        mob = mobs.views[i]
+        if (mob.path is None or mobs.path_index[i] >= len(mob.path)) and env.ticks >= mobs.plan_after[i]:
+            start_tile = (
+                int(mobs.x[i] + mobs.w[i] // 2) // tile_size,
+                int(mobs.y[i] + mobs.h[i]) // tile_size,
+            )
+            # wander targets come from the region the mob can walk in
+            target_tile = mob.goal or pathfinding.find_random_air_target(env, start=start_tile)
+            mob.goal = None
             if target_tile and target_tile != start_tile:
-                mob.path = pathfinding.astar(env, start_tile, target_tile)
-                mob.path_index = 0
-
-        # Path following logic
-        if mob.path and mob.path_index < len(mob.path):
-            target = mob.path[mob.path_index]
-            target_px = target[0] * tile_size + tile_size // 2
-            target_py = target[1] * tile_size
-
-            mob_bottom_tile = mob.rect.bottom // tile_size
-            tile_left = mob.rect.left // tile_size
-            tile_right = (mob.rect.right - 1) // tile_size
-
-            # Determine direction
-            if mob.rect.centerx < target_px - 2:
-                mob.direction = 1
-            elif mob.rect.centerx > target_px + 2:
-                mob.direction = -1
-            else:
-                mob.direction = 0
-                mob.path_index += 1  # reached the tile
-
-            # Horizontal movement
-            mob.rect.x += mob.direction * mob.speed
-            mob.rect.x = max(0, min(mob.rect.x, world_w - tile_size))
-
-            # Check if grounded
-            grounded = False
-            for tx in range(tile_left, tile_right + 1):
-                if 0 <= mob_bottom_tile < env.grid_height and env.grid[mob_bottom_tile, tx] not in (0, 8):
-                    grounded = True
-                    break
-
-            # Jump if the target is above
-            if (
-                target_py + tile_size < mob.rect.bottom and
-                abs(mob.rect.centerx - target_px) <= tile_size and
-                grounded and abs(mob.vel_y) < 1e-3
-            ):
-                mob.vel_y = mob.jump_height  # small jump to climb
-
-        # Horizontal collision
-        tile_left = mob.rect.left // tile_size
-        tile_right = (mob.rect.right - 1) // tile_size
-        tile_top = mob.rect.top // tile_size
-        tile_bottom = (mob.rect.bottom - 1) // tile_size
-
-        for ty in range(tile_top, tile_bottom + 1):
-            if mob.direction > 0 and is_solid(tile_right, ty):
-                mob.rect.right = tile_right * tile_size
-                break
-            elif mob.direction < 0 and is_solid(tile_left, ty):
-                mob.rect.left = (tile_left + 1) * tile_size
-                break
-
-        # Apply gravity
-        mob.vel_y = min(mob.vel_y + gravity, max_fall_speed)
-        mob.rect.y += int(mob.vel_y)
-        mob.rect.y = max(0, min(mob.rect.y, world_h - tile_size))
-
-        # Vertical collision
-        tile_left = mob.rect.left // tile_size
-        tile_right = (mob.rect.right - 1) // tile_size
-        tile_top = mob.rect.top // tile_size
-        tile_bottom = (mob.rect.bottom - 1) // tile_size
-
-        if mob.vel_y > 0:
-            for tx in range(tile_left, tile_right + 1):
-                if is_solid(tx, tile_bottom):
-                    mob.rect.bottom = tile_bottom * tile_size
-                    mob.vel_y = 0
-                    break
-        elif mob.vel_y < 0:
-            for tx in range(tile_left, tile_right + 1):
-                if is_solid(tx, tile_top):
-                    mob.rect.top = (tile_top + 1) * tile_size
-                    mob.vel_y = 0
-                    break
+                mobs.path_index[i] = 0
+                if pathfinding.lower_bound(start_tile, target_tile) <= CHUNK_SIZE:
+                    mob.path = pathfinding.astar(env, start_tile, target_tile)
+                else:
+                    # long route: plan over chunks, refine only the next leg
+                    mob.path = env.chunk_graph.next_segment(start_tile, target_tile)
+                    if mob.path and mob.path[-1] != target_tile:
+                        mob.goal = target_tile
+            if not mob.path:
+                mobs.plan_after[i] = env.ticks + REPLAN_BACKOFF
+
+    b = mobs.gather(rows)
+    if dt is not None:
+        b.dt[:] = dt
+    x, y, w, h = b.x, b.y, b.w, b.h
+    direction = b.direction
+    speed = b.speed * b.dt
+
+    # Path following logic
+    act = b.has_target
+    target_px = b.tgt_x * tile_size + tile_size // 2
+    target_py = b.tgt_y * tile_size
+    mob_bottom_tile = (y + h) // tile_size
+    tile_left = x // tile_size
+    tile_right = (x + w - 1) // tile_size
+
+    # Determine direction; coarse steps widen the arrival window
+    centerx = x + w // 2
+    near = np.maximum(2, speed // 2)
+    direction[act] = np.where(
+        centerx < target_px - near, 1, np.where(centerx > target_px + near, -1, 0)
+    )[act]
+    reached = act & (direction == 0)  # reached the tile
+
+    # Horizontal movement, clamped to the world and swept against walls
+    dx = np.where(act, direction * speed, 0)
+    mob_store.move_x(b, env, np.clip(x + dx, 0, world_w - tile_size) - x)
+
+    # Jump if the target is above (grounded is taken before moving)
+    on_ground = mob_store.grounded(env, tile_left, tile_right, mob_bottom_tile)
+    mob_store.try_jump(b, act, target_px, target_py, on_ground, tile_size)
+
+    # Gravity and swept vertical collisions
+    mob_store.apply_gravity(b, env, gravity, max_fall_speed)
+    np.clip(y, 0, world_h - tile_size, out=y)
+
+    mobs.scatter(b)
+    mobs.advance_paths(b.rows[reached])
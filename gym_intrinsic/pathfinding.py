@@ -1,12 +1,19 @@
 import heapq
 import numpy as np
+from .items import IS_SOLID
 
 def is_solid(env, x, y):
     if 0 <= x < env.grid_width and 0 <= y < env.grid_height:
-        block = env.grid[y, x]
-        return block not in (0, 8)  # not EMPTY or WATER
+        return IS_SOLID[env.grid[y, x]]
     return False
 
+def solid_mask(env, xs, ys):
+    """Vectorised ``is_solid`` over integer coordinate arrays."""
+    xs = np.asarray(xs)
+    ys = np.asarray(ys)
+    inside = (xs >= 0) & (xs < env.grid_width) & (ys >= 0) & (ys < env.grid_height)
+    return inside & IS_SOLID[env.grid[np.where(inside, ys, 0), np.where(inside, xs, 0)]]
+
 def is_walkable(env, x, y):
     """Tile is air and has solid ground underneath."""
     return (
@@ -48,18 +55,32 @@ def get_neighbors(env, x, y):
 
     return neighbors
 
-def find_random_air_target(env, max_attempts=100):
-    for _ in range(max_attempts):
-        x = np.random.randint(0, env.grid_width)
-        for y in range(env.grid_height):
-            if is_walkable(env, x, y):
-                return (x, y)
-    return None
+def find_random_air_target(env, max_attempts=100, start=None, **filters):
+    """Random walkable tile from the env's surface index.
+
+    With ``start`` (a local tile) the target is drawn from the largest
+    region (see ``SurfaceIndex``) one move away from it, so a route to it
+    exists; None if no move leads anywhere. ``filters`` are passed to
+    ``SurfaceIndex.sample_walkable`` (``near``, ``min_dist``,
+    ``max_dist``, ``biome``).
+    """
+    if start is not None:
+        first = max(get_neighbors(env, *start), key=env.surface.region_size, default=None)
+        if first is None:
+            return None
+        filters["region"] = first
+    return env.surface.sample_walkable(attempts=max_attempts, **filters)
 
 def heuristic(a, b):
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
+def ensure_route(env, start, goal):
+    """Generate the rock a search between two tiles may look at."""
+    x0, x1 = sorted((start[0], goal[0]))
+    env.ensure_generated(x0 - 1, x1 + 2, max(start[1], goal[1]) + 3)
+
 def astar(env, start, goal):
+    ensure_route(env, start, goal)
     open_set = []
     heapq.heappush(open_set, (0 + heuristic(start, goal), 0, start))
     came_from = {}
@@ -84,3 +105,183 @@ def astar(env, start, goal):
                 came_from[neighbor] = current
 
     return None  # No path found
+
+
+# === Incremental replanning (D* Lite) ========================================
+INF = float("inf")
+
+
+def lower_bound(a, b):
+    """Admissible, consistent step estimate from tile ``a`` to ``b``.
+
+    Every move shifts x by one tile, climbs at most one tile or drops at
+    most two, so each of these terms alone bounds the remaining moves.
+    """
+    dx = abs(a[0] - b[0])
+    dy = b[1] - a[1]
+    return max(dx, -dy, (dy + 1) // 2)
+
+
+def predecessors(env, x, y, neighbors=None):
+    """Tiles with a move onto (x, y); the inverse of ``get_neighbors``."""
+    neighbors = neighbors or (lambda p: get_neighbors(env, p[0], p[1]))
+    for dx in (-1, 1):
+        # walk, step up onto (x, y), drop of one or two tiles
+        for dy in (0, 1, -1, -2):
+            p = (x + dx, y + dy)
+            if (x, y) in neighbors(p):
+                yield p
+
+
+class DStarLite:
+    """Incremental planner for one pursuer.
+
+    Distances are kept towards the goal, with the goal tile treated as
+    having a free edge to a virtual root. Moving the pursuer only shifts
+    the key modifier, while moving the goal or editing blocks are edge
+    changes; both repair only the vertices whose distances change and
+    reuse the rest of the previous search.
+    """
+
+    def __init__(self, env, max_states: int = 20000):
+        self.env = env
+        self.max_states = max_states
+        self.reset()
+
+    def reset(self) -> None:
+        self.g = {}
+        self.rhs = {}
+        self.heap = []
+        self.open = {}
+        self.km = 0
+        self.start = None
+        self.goal = None
+        self._succ = {}
+        # bounding box (x0, x1, y0, y1) of every vertex in ``rhs``
+        self._bounds = None
+
+    # --- core --------------------------------------------------------------
+    def _key(self, s):
+        m = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (m + lower_bound(self.start, s) + self.km, m)
+
+    def _neighbors(self, s):
+        succ = self._succ.get(s)
+        if succ is None:
+            succ = self._succ[s] = get_neighbors(self.env, s[0], s[1])
+        return succ
+
+    def _update_vertex(self, s) -> None:
+        if s == self.goal:
+            rhs = 0
+        else:
+            rhs = INF
+            for n in self._neighbors(s):
+                rhs = min(rhs, self.g.get(n, INF) + 1)
+        if s not in self.rhs:
+            if rhs == INF:
+                self.open.pop(s, None)
+                return
+            self._grow_bounds(s)
+        self.rhs[s] = rhs
+        if self.g.get(s, INF) != rhs:
+            key = self._key(s)
+            self.open[s] = key
+            heapq.heappush(self.heap, (key, s))
+        else:
+            self.open.pop(s, None)
+
+    def _grow_bounds(self, s) -> None:
+        b = self._bounds
+        if b is None:
+            self._bounds = (s[0], s[0], s[1], s[1])
+        elif not (b[0] <= s[0] <= b[1] and b[2] <= s[1] <= b[3]):
+            self._bounds = (min(b[0], s[0]), max(b[1], s[0]), min(b[2], s[1]), max(b[3], s[1]))
+
+    def _compute(self) -> None:
+        g, rhs, heap, start = self.g, self.rhs, self.heap, self.start
+        while heap:
+            k_old, u = heap[0]
+            if self.open.get(u) != k_old:
+                heapq.heappop(heap)  # stale entry
+                continue
+            if k_old >= self._key(start) and rhs.get(start, INF) == g.get(start, INF):
+                break
+            heapq.heappop(heap)
+            k_new = self._key(u)
+            if k_old < k_new:
+                self.open[u] = k_new
+                heapq.heappush(heap, (k_new, u))
+                continue
+            del self.open[u]
+            if g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+                for p in predecessors(self.env, u[0], u[1], self._neighbors):
+                    self._update_vertex(p)
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+                for p in predecessors(self.env, u[0], u[1], self._neighbors):
+                    self._update_vertex(p)
+
+    # --- public API ----------------------------------------------------------
+    def plan(self, start, goal):
+        """Return a tile path from ``start`` to ``goal`` (like ``astar``)."""
+        if self.goal is None or len(self.g) > self.max_states:
+            self.reset()
+            self.start, self.goal = start, goal
+            self._update_vertex(goal)
+        else:
+            if start != self.start:
+                self.km += lower_bound(self.start, start)
+                self.start = start
+            if goal != self.goal:
+                old, self.goal = self.goal, goal
+                self._update_vertex(old)
+                self._update_vertex(goal)
+        self._compute()
+        return self._extract_path()
+
+    def blocks_changed(self, xs, ys) -> None:
+        """Queue repairs for vertices whose moves read any of the edited
+        tiles; they are processed on the next ``plan`` call.
+
+        Edits away from the searched region are skipped: a vertex that was
+        never reached keeps an infinite distance unless one of the tiles it
+        could move to has already been expanded.
+        """
+        if self.goal is None or self._bounds is None:
+            return
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        # get_neighbors(u) inspects columns u.x +- 1, rows u.y - 1 .. u.y + 3,
+        # and moves to columns u.x +- 1, rows u.y - 1 .. u.y + 2
+        bx0, bx1, by0, by1 = self._bounds
+        near = (xs >= bx0 - 2) & (xs <= bx1 + 2) & (ys >= by0 - 3) & (ys <= by1 + 4)
+        if not near.any():
+            return
+        touched = set()
+        for x, y in zip(xs[near].tolist(), ys[near].tolist()):
+            for ux in (x - 1, x + 1):
+                for uy in range(y - 3, y + 2):
+                    touched.add((ux, uy))
+        g, rhs = self.g, self.rhs
+        for u in touched:
+            self._succ.pop(u, None)
+            ux, uy = u
+            if u in rhs or any(
+                (vx, vy) in g for vx in (ux - 1, ux + 1) for vy in range(uy - 1, uy + 3)
+            ):
+                self._update_vertex(u)
+
+    def _extract_path(self):
+        s, goal = self.start, self.goal
+        if self.g.get(s, INF) == INF and s != goal:
+            return None
+        path = [s]
+        while s != goal and len(path) <= len(self.g):
+            s = min(self._neighbors(s), key=lambda n: self.g.get(n, INF), default=None)
+            if s is None or self.g.get(s, INF) == INF:
+                return None
+            path.append(s)
+        return path if s == goal else None
@@ -1,8 +1,8 @@
 import pygame
-from . import world, items
+from . import world, items, events as ev
 from .items import Block
 
-def place_block(player, grid, target_x, target_y, update_blocks):
+def place_block(player, grid, target_x, target_y, set_block, events=None):
     selected = player.current_item()
     if (
         selected in items.ITEM_STATS
@@ -10,9 +10,10 @@ def place_block(player, grid, target_x, target_y, update_blocks):
     ):
         info = items.ITEM_STATS[selected]
         if info.category == "block" and grid[target_y, target_x] == Block.EMPTY:
-            grid[target_y, target_x] = info.block_id
+            set_block(target_x, target_y, info.block_id)
             player.inventory[selected] -= 1
-            update_blocks()
+            if events is not None:
+                events.log(ev.BLOCK_PLACED, ev.PLAYER_ID, target_x, target_y, info.block_id)
         elif info.category == "food" and player.food < player.max_food:
             player.inventory[selected] -= 1
             player.food = player.max_food
@@ -20,32 +21,38 @@ def place_block(player, grid, target_x, target_y, update_blocks):
             return info.damage
     return None
 
-def attack_entities(attack_rect, enemies, passive_mobs, player, damage):
-    for enemy in list(enemies):
-        if enemy.rect.colliderect(attack_rect):
-            enemy.health -= damage
-            if enemy.health <= 0:
-                enemies.remove(enemy)
-
-    for mob in list(passive_mobs):
-        if mob.rect.colliderect(attack_rect):
+def attack_entities(attack_rect, enemies, passive_mobs, player, damage, events=None, tile_size=1):
+    for mobs in (enemies, passive_mobs):
+        for mob in list(mobs):
+            if not mob.rect.colliderect(attack_rect):
+                continue
             mob.health -= damage
+            if events is not None:
+                tx, ty = mob.rect.centerx // tile_size, mob.rect.centery // tile_size
+                events.log(ev.DAMAGE, mob.uid, tx, ty, amount=damage)
             if mob.health <= 0:
-                player.inventory.add_item("food", mob.food_drop)
-                passive_mobs.remove(mob)
+                if mobs is passive_mobs:
+                    player.inventory.add_item("food", mob.food_drop)
+                    if events is not None:
+                        events.log(ev.ITEM_PICKED, ev.PLAYER_ID, tx, ty, items.ITEM_IDS["food"], mob.food_drop)
+                if events is not None:
+                    events.log(ev.KILL, mob.uid, tx, ty)
+                mobs.remove(mob)
 
-def mine_block(grid, target, mining_progress, player, update_blocks):
+def mine_block(grid, target, mining_progress, player, set_block, events=None):
     target_x, target_y = target
     block = grid[target_y, target_x]
-    info = items.BLOCK_STATS.get(block)
-    required = info.mining_time if info else 1
+    required = items.MINING_TIME[block]
     mining_progress += 1
     if mining_progress >= required:
-        grid[target_y, target_x] = Block.EMPTY
-        item_name = items.BLOCK_TO_ITEM.get(block)
-        if item_name:
-            player.inventory.add_item(item_name)
-        update_blocks()
+        set_block(target_x, target_y, Block.EMPTY)
+        drop = items.DROP_ITEM[block]
+        if drop >= 0:
+            player.inventory.add_item(items.ITEM_NAMES[drop])
+        if events is not None:
+            events.log(ev.BLOCK_MINED, ev.PLAYER_ID, target_x, target_y, block)
+            if drop >= 0:
+                events.log(ev.ITEM_PICKED, ev.PLAYER_ID, target_x, target_y, drop, 1)
         return None, 0
     return target, mining_progress
 
@@ -71,7 +78,7 @@ def handle_actions(env, action):
             if env.grid[cand[1], cand[0]] == Block.EMPTY:
                 tx, ty = cand
                 break
-        dmg = place_block(env.player, env.grid, tx, ty, env._update_blocks)
+        dmg = place_block(env.player, env.grid, tx, ty, env.set_block, env.events)
         if dmg:
             attack_rect = pygame.Rect(
                 tx * env.tile_size,
@@ -79,7 +86,9 @@ def handle_actions(env, action):
                 env.tile_size,
                 env.tile_size,
             )
-            attack_entities(attack_rect, env.enemies, env.passive_mobs, env.player, dmg)
+            attack_entities(
+                attack_rect, env.enemies, env.passive_mobs, env.player, dmg, env.events, env.tile_size
+            )
 
     if destroy:
         # Try to find a block to mine
@@ -91,12 +100,13 @@ def handle_actions(env, action):
 
         if block_target is not None:
             target_x, target_y = block_target
+            env.ensure_generated(target_x, target_x + 1, target_y + 1)
             if (target_x, target_y) != env._mining_target:
                 env._mining_target = (target_x, target_y)
                 env._mining_progress = 0
             env._mining_target, env._mining_progress = mine_block(
                 env.grid, (target_x, target_y),
-                env._mining_progress, env.player, env._update_blocks
+                env._mining_progress, env.player, env.set_block, env.events
             )
         else:
             # No block found → reset mining
@@ -112,7 +122,7 @@ def handle_actions(env, action):
                     env.tile_size,
                 )
                 attack_entities(
-                    attack_rect, env.enemies, env.passive_mobs, env.player, 10
+                    attack_rect, env.enemies, env.passive_mobs, env.player, 10, env.events, env.tile_size
                 )
 
     else:
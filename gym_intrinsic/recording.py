@@ -0,0 +1,235 @@
+"""Deterministic episode recording and replay.
+
+A recording is a binary file holding a header, the packed per-tick actions
+and periodic state checkpoints::
+
+    header      magic "IREC", format version, checkpoint interval
+    chunk*      kind (b"A" actions / b"K" controls / b"C" checkpoint),
+                first tick, length, payload
+
+Action chunks hold one byte per tick (the five action bits). Control
+chunks hold two bytes, the player's facing (index into FACINGS) and
+hotbar slot, set from the keyboard before the given tick. Checkpoints
+are zlib-compressed pickles of the environment state taken *before* the
+given tick. Replaying restores the nearest checkpoint and fast-forwards
+headless through the recorded actions; checkpoints carry every RNG, so
+the environment's seed isn't needed.
+"""
+
+import io
+import pickle
+import struct
+import zlib
+
+import numpy as np
+
+MAGIC = b"IREC"
+VERSION = 3
+_HEADER = struct.Struct("<4sHI")
+_CHUNK = struct.Struct("<cQI")
+FACINGS = ((1, 0), (-1, 0), (0, -1), (0, 1))
+
+# Environment attributes that are rebuilt or belong to the display, not to
+# the simulation state
+_TRANSIENT = frozenset(
+    ["screen", "clock", "font", "inventory_ui", "_block_rects", "recorder", "trajectory_writer", "atlas"]
+)
+
+
+# === State snapshots ===
+class _StatePickler(pickle.Pickler):
+    """Pickles references to the environment itself as a placeholder so the
+    snapshot can be loaded back into the same object."""
+
+    def __init__(self, file, env):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.env = env
+
+    def persistent_id(self, obj):
+        return "env" if obj is self.env else None
+
+
+class _StateUnpickler(pickle.Unpickler):
+    def __init__(self, file, env):
+        super().__init__(file)
+        self.env = env
+
+    def persistent_load(self, pid):
+        if pid != "env":
+            raise pickle.UnpicklingError(f"unknown persistent id {pid!r}")
+        return self.env
+
+
+def dump_state(env) -> bytes:
+    """Serialise the simulation state of ``env`` to compressed bytes."""
+    state = {k: v for k, v in env.__dict__.items() if k not in _TRANSIENT}
+    buf = io.BytesIO()
+    _StatePickler(buf, env).dump(state)
+    return zlib.compress(buf.getvalue(), 1)
+
+
+def load_state(env, blob: bytes) -> None:
+    """Restore a state produced by ``dump_state`` into ``env``."""
+    state = _StateUnpickler(io.BytesIO(zlib.decompress(blob)), env).load()
+    env.__dict__.update(state)
+    env._update_blocks()
+    if env.inventory_ui is not None:
+        env.inventory_ui.player = env.player
+
+
+def pack_action(action) -> int:
+    return int(np.packbits(np.asarray(action, dtype=bool), bitorder="little")[0])
+
+
+def unpack_actions(packed: np.ndarray) -> np.ndarray:
+    bits = np.unpackbits(packed[:, None], axis=1, bitorder="little")
+    return bits[:, :5].astype(np.int8)
+
+
+# === Recording ===
+class EpisodeRecorder:
+    """Write the actions and state checkpoints of one episode to ``path``.
+
+    Attach it after ``reset``; the environment calls ``record_tick`` at the
+    start of every tick. Facing and hotbar slot changes made between ticks
+    are written as control chunks; besides the periodic checkpoints, a
+    checkpoint is also written whenever the hotbar or inventory was edited
+    through the UI.
+    """
+
+    def __init__(self, path, checkpoint_every: int = 1000):
+        self.file = open(path, "wb")
+        self.file.write(_HEADER.pack(MAGIC, VERSION, checkpoint_every))
+        self.checkpoint_every = checkpoint_every
+        self._actions = bytearray()
+        self._first_tick = 0
+        self._last_checkpoint = None
+        self._controls = None
+        self._items = None
+
+    def attach(self, env) -> None:
+        env.recorder = self
+        self._first_tick = env.ticks
+        self._checkpoint(env)
+
+    def record_tick(self, env, action) -> None:
+        due = env.ticks % self.checkpoint_every == 0 or self._item_state(env) != self._items
+        if due and env.ticks != self._last_checkpoint:
+            self._checkpoint(env)
+        controls = self._control_state(env)
+        if controls != self._controls:
+            self.file.write(_CHUNK.pack(b"K", env.ticks, len(controls)))
+            self.file.write(controls)
+            self._controls = controls
+        self._actions.append(pack_action(action))
+
+    def end_tick(self, env) -> None:
+        self._controls = self._control_state(env)
+        self._items = self._item_state(env)
+
+    @staticmethod
+    def _control_state(env) -> bytes:
+        player = env.player
+        return bytes([FACINGS.index(tuple(player.facing)), player.selected_slot])
+
+    @staticmethod
+    def _item_state(env):
+        player = env.player
+        return (tuple(player.hotbar), tuple(player.inventory.items()))
+
+    def _checkpoint(self, env) -> None:
+        self._flush_actions(env.ticks)
+        blob = env.get_state()
+        self.file.write(_CHUNK.pack(b"C", env.ticks, len(blob)))
+        self.file.write(blob)
+        self._last_checkpoint = env.ticks
+        self._controls = self._control_state(env)
+        self._items = self._item_state(env)
+
+    def _flush_actions(self, next_tick: int) -> None:
+        if self._actions:
+            self.file.write(_CHUNK.pack(b"A", self._first_tick, len(self._actions)))
+            self.file.write(self._actions)
+            self._actions = bytearray()
+        self._first_tick = next_tick
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self._flush_actions(0)
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EpisodeReader:
+    """Index a recording and seek an environment to any recorded tick."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, self.checkpoint_every = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} episode recording")
+        self._data = data
+        self.checkpoints = {}  # tick -> (offset, length)
+        self.controls = {}  # tick -> (facing, selected slot)
+        chunks = []
+        pos = _HEADER.size
+        while pos < len(data):
+            kind, tick, length = _CHUNK.unpack_from(data, pos)
+            pos += _CHUNK.size
+            if kind == b"C":
+                self.checkpoints[tick] = (pos, length)
+            elif kind == b"K":
+                self.controls[tick] = tuple(data[pos : pos + length])
+            else:
+                chunks.append((tick, np.frombuffer(data, np.uint8, length, pos)))
+            pos += length
+        self.first_tick = min(self.checkpoints)
+        self.end_tick = max([t + len(a) for t, a in chunks], default=self.first_tick)
+        self.actions = np.zeros((self.end_tick - self.first_tick, 5), dtype=np.int8)
+        for tick, packed in chunks:
+            start = tick - self.first_tick
+            self.actions[start : start + len(packed)] = unpack_actions(packed)
+        self._ticks = np.array(sorted(self.checkpoints))
+
+    def action(self, tick: int) -> np.ndarray:
+        """Action applied in the tick that starts at ``tick``."""
+        return self.actions[tick - self.first_tick]
+
+    def seek(self, env, tick: int) -> None:
+        """Restore the state before ``tick`` from the nearest earlier
+        checkpoint, fast-forwarding headless through the recorded actions."""
+        if not self.first_tick <= tick <= self.end_tick:
+            raise ValueError(f"tick {tick} outside recording [{self.first_tick}, {self.end_tick}]")
+        start = int(self._ticks[np.searchsorted(self._ticks, tick, side="right") - 1])
+        offset, length = self.checkpoints[start]
+        env.set_state(self._data[offset : offset + length])
+        for t in range(start, tick):
+            self._apply_controls(env, t)
+            env._tick(self.action(t))
+        self._apply_controls(env, tick)
+
+    def advance(self, env) -> bool:
+        """Replay the tick starting at ``env.ticks``; False once the
+        recording is exhausted. Checkpoints passed on the way are applied,
+        which carries over player changes made through the UI."""
+        tick = env.ticks
+        if tick >= self.end_tick:
+            return False
+        if tick in self.checkpoints:
+            offset, length = self.checkpoints[tick]
+            env.set_state(self._data[offset : offset + length])
+        self._apply_controls(env, tick)
+        env._tick(self.action(tick))
+        return True
+
+    def _apply_controls(self, env, tick: int) -> None:
+        controls = self.controls.get(tick)
+        if controls is not None:
+            facing, env.player.selected_slot = controls
+            env.player.facing = list(FACINGS[facing])
@@ -0,0 +1,145 @@
+"""Procedural structures stamped into generated terrain.
+
+Templates are drawn as text, compiled once into block-id arrays plus a
+mask of the cells they own (blank cells keep the terrain), and stamped
+with a masked slice assignment. Which structures a region gets, and
+where, is decided from the seed and the region index alone, so a
+structure crossing a chunk boundary comes out identical whichever side
+is generated first.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .items import Block
+
+STRUCTURE_REGION = 64    # Width of a placement region in tiles (global coordinates)
+SURFACE_CHANCE   = 0.35  # Chance that a region gets a surface structure
+DUNGEON_CHANCE   = 0.5   # Chance that a region gets a dungeon
+DUNGEON_DEPTH    = 10    # Minimum tiles between the surface and a dungeon
+
+# ' ' keeps the terrain, '.' carves air
+LEGEND = {
+    ".": Block.EMPTY,
+    "#": Block.STONE,
+    "w": Block.WOOD,
+    "s": Block.SAND,
+    "c": Block.COPPER,
+    "i": Block.IRON,
+    "g": Block.GOLD,
+}
+
+
+@dataclass(frozen=True)
+class Template:
+    """Compiled structure: ``blocks[y, x]`` where ``mask`` is set."""
+    name: str
+    blocks: np.ndarray
+    mask: np.ndarray
+    floor: int = 0                          # row placed on the surface
+    underground: bool = False
+    biomes: tuple[str, ...] = ()            # biomes a surface structure may sit in
+
+    @property
+    def height(self) -> int:
+        return self.blocks.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.blocks.shape[1]
+
+
+def compile_template(name: str, rows: list[str], **kwargs) -> Template:
+    width = max(len(r) for r in rows)
+    rows = [r.ljust(width) for r in rows]
+    chars = np.array([list(r) for r in rows])
+    blocks = np.zeros(chars.shape, dtype=np.int8)
+    for ch, block in LEGEND.items():
+        blocks[chars == ch] = block
+    return Template(name, blocks, chars != " ", **kwargs)
+
+
+# === Templates ===============================================================
+RUIN = compile_template("ruin", [
+    " #  ##   ",
+    " #   #   ",
+    "##...#.# ",
+    "#.....w.#",
+    "#########",
+    " ####### ",
+], floor=4, biomes=("forest", "plains", "mountains"))
+
+PYRAMID = compile_template("pyramid", [
+    "     s     ",
+    "    sss    ",
+    "   ss.ss   ",
+    "  ss...ss  ",
+    " ss..g..ss ",
+    "sssssssssss",
+], floor=5, biomes=("desert",))
+
+DUNGEON = compile_template("dungeon", [
+    "###########",
+    "#.........#",
+    "#.........#",
+    "#..#...#..#",
+    "#.g#.c.#i.#",
+    "###########",
+], underground=True)
+
+SURFACE_TEMPLATES = (RUIN, PYRAMID)
+
+
+# === Placement ===============================================================
+@lru_cache(maxsize=1024)
+def region_plan(region: int, seed: int, height: int, profile) -> tuple:
+    """Structures of one region as ``(template, gx0, y0)`` top-left
+    placements. ``profile`` is ``world.column_profile``."""
+    rng = np.random.default_rng([seed & 0xFFFFFFFF, region & 0xFFFFFFFF, 0x57C7])
+    base = region * STRUCTURE_REGION
+    plan = []
+
+    widest = max(t.width for t in SURFACE_TEMPLATES)
+    gx0 = base + int(rng.integers(0, STRUCTURE_REGION - widest))
+    pick = rng.random()
+    if rng.random() < SURFACE_CHANCE:
+        biome = profile(gx0, height, seed)[1]
+        choices = [t for t in SURFACE_TEMPLATES if biome in t.biomes]
+        if choices:
+            tpl = choices[int(pick * len(choices))]
+            columns = [profile(gx, height, seed) for gx in range(gx0, gx0 + tpl.width)]
+            # skip sites that straddle a biome the template doesn't suit
+            if {c[1] for c in columns} | {c[2] for c in columns} <= set(tpl.biomes):
+                floor_y = max(c[0] for c in columns)
+                plan.append((tpl, gx0, floor_y - tpl.floor))
+
+    gx0 = base + int(rng.integers(0, STRUCTURE_REGION - DUNGEON.width))
+    u = rng.random()
+    if rng.random() < DUNGEON_CHANCE:
+        top = max(profile(gx, height, seed)[0] for gx in (gx0, gx0 + DUNGEON.width - 1)) + DUNGEON_DEPTH
+        bottom = height - 1 - DUNGEON.height
+        if top < bottom:
+            plan.append((DUNGEON, gx0, top + int(u * (bottom - top))))
+    return tuple(plan)
+
+
+def stamp(grid: np.ndarray, world_x_offset: int, seed: int, profile, rows=None) -> None:
+    """Stamp every structure overlapping ``grid`` (the columns starting at
+    global ``world_x_offset``), limited to the row range ``rows`` if given.
+    The bottom row is left alone."""
+    height, width = grid.shape
+    r_top, r_bottom = rows if rows is not None else (0, height)
+    widest = max(t.width for t in (*SURFACE_TEMPLATES, DUNGEON))
+    r0 = (world_x_offset - widest) // STRUCTURE_REGION
+    r1 = (world_x_offset + width) // STRUCTURE_REGION
+    for region in range(r0, r1 + 1):
+        for tpl, gx0, y0 in region_plan(region, seed, height, profile):
+            x0, x1 = max(gx0, world_x_offset), min(gx0 + tpl.width, world_x_offset + width)
+            ya, yb = max(y0, r_top), min(y0 + tpl.height, r_bottom, height - 1)
+            if x0 >= x1 or ya >= yb:
+                continue
+            tx, ty = slice(x0 - gx0, x1 - gx0), slice(ya - y0, yb - y0)
+            target = grid[ya:yb, x0 - world_x_offset : x1 - world_x_offset]
+            np.copyto(target, tpl.blocks[ty, tx], where=tpl.mask[ty, tx])
@@ -0,0 +1,295 @@
+"""Maintained surface heightmap and walkable-tile index.
+
+The heightmap holds, per column, the first row that spawns can stand on.
+Walkable tiles (air with solid ground below, as in ``pathfinding``) are
+kept in per-chunk sets plus one global set, all supporting O(1) insert,
+delete and uniform sampling. Both are updated incrementally from block
+edits and world extension instead of being rescanned.
+
+Walkable tiles joined by moves that work both ways (walks, and one-tile
+steps up or down) form *regions*; every tile of a region can reach every
+other. Regions are labelled on demand and dropped whenever the walkable
+set changes.
+"""
+
+import numpy as np
+
+from . import world
+from .items import Block, IS_SOLID
+from .world import CHUNK_SIZE
+
+# Blocks that spawns ignore when looking for the surface
+_NOT_GROUND = (Block.EMPTY, Block.WOOD, Block.LEAVES)
+
+
+class TileSet:
+    """Set of tiles with O(1) add, discard and random choice."""
+
+    def __init__(self):
+        self.items = []
+        self.index = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, tile) -> bool:
+        return tile in self.index
+
+    def add(self, tile) -> None:
+        if tile not in self.index:
+            self.index[tile] = len(self.items)
+            self.items.append(tile)
+
+    def discard(self, tile) -> None:
+        i = self.index.pop(tile, None)
+        if i is None:
+            return
+        last = self.items.pop()
+        if i < len(self.items):
+            self.items[i] = last
+            self.index[last] = i
+
+    def choice(self, rng: np.random.Generator):
+        return self.items[rng.integers(len(self.items))]
+
+
+class SurfaceIndex:
+    """Surface heightmap and walkable tiles for one environment's grid."""
+
+    def __init__(self, env):
+        self.env = env
+        self.heights = np.zeros(0, dtype=np.int32)
+        self.walkable = TileSet()  # global (x, y) tiles
+        self.chunks = {}  # (cx, cy) -> TileSet
+        self._biomes = {}  # cx -> biome name, filled by biome-filtered queries
+        self._regions = None  # (tile -> region id, [tiles of each region])
+
+    # --- maintenance -------------------------------------------------------
+    def rebuild(self) -> None:
+        self.heights = np.zeros(self.env.grid_width, dtype=np.int32)
+        self.walkable = TileSet()
+        self.chunks = {}
+        self._regions = None
+        self._index_columns(0, self.env.grid_width)
+
+    def extend(self, extra_cols: int, left: bool) -> None:
+        """Index columns added by world extension."""
+        pad = np.zeros(extra_cols, dtype=np.int32)
+        if left:
+            self.heights = np.concatenate([pad, self.heights])
+            self._index_columns(0, extra_cols)
+        else:
+            self.heights = np.concatenate([self.heights, pad])
+            self._index_columns(len(self.heights) - extra_cols, len(self.heights))
+
+    def columns_removed(self, gx0: int, gx1: int) -> None:
+        """Forget the global columns [gx0, gx1) before they are evicted."""
+        off = self.env.world_x_offset
+        self.heights = np.delete(self.heights, np.s_[gx0 - off : gx1 - off])
+        c = CHUNK_SIZE
+        for key in [k for k in self.chunks if gx0 // c <= k[0] <= (gx1 - 1) // c]:
+            for tile in [t for t in self.chunks[key].items if gx0 <= t[0] < gx1]:
+                self._discard(tile)
+
+    def _index_columns(self, x0: int, x1: int) -> None:
+        """Compute heights and walkable tiles for new local columns [x0, x1)."""
+        grid = self.env.grid[:, x0:x1]
+        ground = ~np.isin(grid, _NOT_GROUND)
+        found = ground.any(axis=0)
+        self.heights[x0:x1] = np.where(found, ground.argmax(axis=0), -1)
+
+        off = self.env.world_x_offset
+        ys, xs = np.nonzero(self._walkable_mask(grid))
+        for x, y in zip((xs + x0 + off).tolist(), ys.tolist()):
+            self._add((x, y))
+
+    def rows_generated(self, x0: int, x1: int, y0: int, y1: int) -> None:
+        """Re-index the local region [x0, x1) x [y0, y1) after it was filled
+        in by lazy generation."""
+        grid = self.env.grid[:, x0:x1]
+        ground = ~np.isin(grid, _NOT_GROUND)
+        found = ground.any(axis=0)
+        self.heights[x0:x1] = np.where(found, ground.argmax(axis=0), -1)
+
+        # walkability of a row also depends on the row below it
+        ya, yb = max(y0 - 1, 0), min(y1, self.env.grid_height - 1)
+        mask = self._walkable_mask(grid[ya : yb + 1])
+        off = self.env.world_x_offset + x0
+        for (y, x), walkable in np.ndenumerate(mask):
+            (self._add if walkable else self._discard)((x + off, y + ya))
+
+    def blocks_changed(self, xs: np.ndarray, ys: np.ndarray) -> None:
+        """Update the index after the blocks at local (xs, ys) changed."""
+        grid = self.env.grid
+        cols = np.unique(xs)
+        ground = ~np.isin(grid[:, cols], _NOT_GROUND)
+        self.heights[cols] = np.where(ground.any(axis=0), ground.argmax(axis=0), -1)
+        # an edit can only change walkability of its tile and the one above
+        tiles = np.unique(np.stack([np.r_[xs, xs], np.r_[ys - 1, ys]], axis=1), axis=0)
+        tx, ty = tiles[:, 0], tiles[:, 1]
+        inside = (ty >= 0) & (ty < self.env.grid_height - 1)
+        tx, ty = tx[inside], ty[inside]
+        walkable = (grid[ty, tx] == Block.EMPTY) & IS_SOLID[grid[ty + 1, tx]]
+        off = self.env.world_x_offset
+        for x, y, w in zip((tx + off).tolist(), ty.tolist(), walkable.tolist()):
+            (self._add if w else self._discard)((x, y))
+
+    @staticmethod
+    def _walkable_mask(grid: np.ndarray) -> np.ndarray:
+        """Walkable flags for all rows but the last of a grid region."""
+        return (grid[:-1] == Block.EMPTY) & IS_SOLID[grid[1:]]
+
+    def _add(self, tile) -> None:
+        if tile in self.walkable:
+            return
+        self.walkable.add(tile)
+        key = (tile[0] // CHUNK_SIZE, tile[1] // CHUNK_SIZE)
+        self.chunks.setdefault(key, TileSet()).add(tile)
+        self._regions = None
+
+    def _discard(self, tile) -> None:
+        if tile in self.walkable:
+            self.walkable.discard(tile)
+            self.chunks[(tile[0] // CHUNK_SIZE, tile[1] // CHUNK_SIZE)].discard(tile)
+            self._regions = None
+
+    def _label_regions(self):
+        """Union walkable tiles over the two-way moves of ``get_neighbors``:
+        walks, and steps up (the reverse of one-tile drops) onto rows >= 1.
+        Two-tile drops can't be climbed back and join nothing."""
+        parent = {t: t for t in self.walkable.items}
+
+        def find(t):
+            while parent[t] != t:
+                parent[t] = t = parent[parent[t]]
+            return t
+
+        for x, y in self.walkable.items:
+            for n in ((x + 1, y), (x + 1, y - 1), (x + 1, y + 1)):
+                if n in parent and (n[1] == y or min(y, n[1]) >= 1):
+                    a, b = find((x, y)), find(n)
+                    if a != b:
+                        parent[a] = b
+        ids, tiles = {}, []
+        for t in self.walkable.items:
+            root = find(t)
+            if root not in ids:
+                ids[root] = len(tiles)
+                tiles.append([])
+            ids[t] = ids[root]
+            tiles[ids[t]].append(t)
+        return ids, tiles
+
+    # --- queries -------------------------------------------------------------
+    def surface_y(self, x: int) -> int:
+        """First ground row of local column ``x`` or -1 if it has none."""
+        return int(self.heights[x])
+
+    def region_size(self, tile) -> int:
+        """Number of tiles in the region of local ``tile`` (0 if it isn't
+        walkable)."""
+        region = self._region_tiles(tile)
+        return len(region) if region is not None else 0
+
+    def _region_tiles(self, tile):
+        gtile = (tile[0] + self.env.world_x_offset, tile[1])
+        if gtile not in self.walkable:
+            return None
+        if self._regions is None:
+            self._regions = self._label_regions()
+        ids, tiles = self._regions
+        return tiles[ids[gtile]]
+
+    def sample_walkable(self, near=None, max_dist=None, min_dist=0.0, biome=None, region=None, rng=None, attempts=32):
+        """Uniformly pick a walkable tile in local coordinates.
+
+        ``near`` (a local tile) with ``min_dist``/``max_dist`` restricts the
+        distance in tiles; ``biome`` restricts to one biome; ``region`` (a
+        local walkable tile) restricts to the tiles it can walk to and back.
+        Returns None when nothing matches. Draws from the environment's AI
+        stream unless ``rng`` is given.
+        """
+        if rng is None:
+            rng = self.env.ai_rng
+        off = self.env.world_x_offset
+        if region is not None:
+            return self._sample_region(region, near, max_dist, min_dist, biome, rng, attempts)
+        if near is None and biome is None:
+            if not len(self.walkable):
+                return None
+            x, y = self.walkable.choice(rng)
+            return (x - off, y)
+
+        keys, weights = [], []
+        for key, tiles in self._candidate_chunks(near, max_dist):
+            if not len(tiles):
+                continue
+            if biome is not None and self._chunk_biome(key[0]) != biome:
+                continue
+            if near is not None and not self._chunk_in_range(key, (near[0] + off, near[1]), min_dist, max_dist):
+                continue
+            keys.append(key)
+            weights.append(len(tiles))
+        if not keys:
+            return None
+        p = np.asarray(weights, dtype=np.float64)
+        p /= p.sum()
+        for _ in range(attempts):
+            x, y = self.chunks[keys[rng.choice(len(keys), p=p)]].choice(rng)
+            if near is not None:
+                d = np.hypot(x - off - near[0], y - near[1])
+                if d < min_dist or (max_dist is not None and d > max_dist):
+                    continue
+            return (x - off, y)
+        return None
+
+    def _sample_region(self, region, near, max_dist, min_dist, biome, rng, attempts):
+        tiles = self._region_tiles(region)
+        if not tiles:
+            return None
+        off = self.env.world_x_offset
+        for _ in range(attempts):
+            x, y = tiles[rng.integers(len(tiles))]
+            if biome is not None and self._chunk_biome(x // CHUNK_SIZE) != biome:
+                continue
+            if near is not None:
+                d = np.hypot(x - off - near[0], y - near[1])
+                if d < min_dist or (max_dist is not None and d > max_dist):
+                    continue
+            return (x - off, y)
+        return None
+
+    def _candidate_chunks(self, near, max_dist):
+        """``(key, tiles)`` of the chunks a query may draw from: those
+        ``max_dist`` can reach around ``near``, or all of them."""
+        if near is None or max_dist is None:
+            return self.chunks.items()
+        c = CHUNK_SIZE
+        gx, y = near[0] + self.env.world_x_offset, near[1]
+        r = int(np.ceil(max_dist))
+        found = []
+        for cx in range((gx - r) // c, (gx + r) // c + 1):
+            for cy in range(max(y - r, 0) // c, (y + r) // c + 1):
+                tiles = self.chunks.get((cx, cy))
+                if tiles is not None:
+                    found.append(((cx, cy), tiles))
+        return found
+
+    def _chunk_biome(self, cx: int) -> str:
+        """Biome of chunk column ``cx`` (cached; it depends on x only)."""
+        biome = self._biomes.get(cx)
+        if biome is None:
+            biome = self._biomes[cx] = world._biome_for_x(cx * CHUNK_SIZE, self.env.world_seed)
+        return biome
+
+    @staticmethod
+    def _chunk_in_range(key, centre, min_dist, max_dist) -> bool:
+        x0, y0 = key[0] * CHUNK_SIZE, key[1] * CHUNK_SIZE
+        # nearest and farthest distance from centre to the chunk's box
+        dx = max(x0 - centre[0], 0, centre[0] - (x0 + CHUNK_SIZE - 1))
+        dy = max(y0 - centre[1], 0, centre[1] - (y0 + CHUNK_SIZE - 1))
+        fx = max(abs(centre[0] - x0), abs(centre[0] - (x0 + CHUNK_SIZE - 1)))
+        fy = max(abs(centre[1] - y0), abs(centre[1] - (y0 + CHUNK_SIZE - 1)))
+        if max_dist is not None and np.hypot(dx, dy) > max_dist:
+            return False
+        return np.hypot(fx, fy) >= min_dist
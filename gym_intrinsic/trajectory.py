@@ -0,0 +1,161 @@
+"""Memory-mapped trajectory storage for offline RL datasets.
+
+A dataset is a directory holding one raw binary file per field plus
+``meta.json`` (dtypes, per-row shapes, row count) and ``episodes.npy``
+(the first row of every episode). Files are preallocated and doubled in
+place when full, so collecting never holds the dataset in memory, and
+``TrajectoryDataset`` samples minibatches straight from the maps.
+"""
+
+import json
+import os
+
+import numpy as np
+
+META_FILE = "meta.json"
+EPISODES_FILE = "episodes.npy"
+
+
+def local_window(env, radius: int) -> np.ndarray:
+    """Blocks in a (2r+1)² window centred on the player's tile; -1 outside
+    the world."""
+    size = 2 * radius + 1
+    window = np.full((size, size), -1, dtype=np.int8)
+    cx = env.player.rect.centerx // env.tile_size
+    cy = env.player.rect.centery // env.tile_size
+    x0, y0 = cx - radius, cy - radius
+    gx0, gy0 = max(x0, 0), max(y0, 0)
+    gx1, gy1 = min(x0 + size, env.grid_width), min(y0 + size, env.grid_height)
+    if gx0 < gx1 and gy0 < gy1:
+        window[gy0 - y0 : gy1 - y0, gx0 - x0 : gx1 - x0] = env.grid[gy0:gy1, gx0:gx1]
+    return window
+
+
+class TrajectoryWriter:
+    """Append transitions to growable memory-mapped arrays.
+
+    Attach to an environment with ``attach``; ``IntrinsicEnv.reset`` then
+    opens a new episode and every ``step`` appends one transition. With
+    ``window_radius`` set, the local grid window around the player is stored
+    alongside each observation.
+    """
+
+    def __init__(self, directory, obs_dim: int = 4, action_dim: int = 5, window_radius=None, capacity: int = 4096):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.window_radius = window_radius
+        self.fields = {
+            "obs": (np.float32, (obs_dim,)),
+            "next_obs": (np.float32, (obs_dim,)),
+            "action": (np.int8, (action_dim,)),
+            "reward": (np.float32, ()),
+            "done": (np.bool_, ()),
+        }
+        if window_radius is not None:
+            size = 2 * window_radius + 1
+            self.fields["window"] = (np.int8, (size, size))
+        self.size = 0
+        self.capacity = 0
+        self.arrays = {}
+        self.episode_starts = []
+        self._obs = None
+        self._window = None
+        self._grow(capacity)
+
+    def attach(self, env) -> None:
+        env.trajectory_writer = self
+
+    # --- storage -------------------------------------------------------------
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name + ".bin")
+
+    def _grow(self, capacity: int) -> None:
+        """Extend every file to ``capacity`` rows and map it again."""
+        for name, (dtype, shape) in self.fields.items():
+            if name in self.arrays:
+                self.arrays[name].flush()
+                del self.arrays[name]
+            row_bytes = np.dtype(dtype).itemsize * int(np.prod(shape))
+            with open(self._path(name), "ab") as f:
+                f.truncate(capacity * row_bytes)
+            self.arrays[name] = np.memmap(self._path(name), dtype=dtype, mode="r+", shape=(capacity, *shape))
+        self.capacity = capacity
+
+    # --- recording -----------------------------------------------------------
+    def begin_episode(self, env, obs) -> None:
+        self.episode_starts.append(self.size)
+        self._observe(env, obs)
+
+    def _observe(self, env, obs) -> None:
+        self._obs = obs
+        if self.window_radius is not None:
+            self._window = local_window(env, self.window_radius)
+
+    def append(self, env, action, reward: float, done: bool, next_obs) -> None:
+        if self._obs is None:
+            raise RuntimeError("reset the environment before recording steps")
+        if self.size == self.capacity:
+            self._grow(self.capacity * 2)
+        i, a = self.size, self.arrays
+        a["obs"][i] = self._obs
+        a["next_obs"][i] = next_obs
+        a["action"][i] = action
+        a["reward"][i] = reward
+        a["done"][i] = done
+        if self._window is not None:
+            a["window"][i] = self._window
+        self.size += 1
+        self._observe(env, next_obs)
+
+    def flush(self) -> None:
+        for arr in self.arrays.values():
+            arr.flush()
+        meta = {
+            "size": self.size,
+            "capacity": self.capacity,
+            "fields": {name: [np.dtype(dtype).str, list(shape)] for name, (dtype, shape) in self.fields.items()},
+        }
+        with open(os.path.join(self.directory, META_FILE), "w") as f:
+            json.dump(meta, f)
+        np.save(os.path.join(self.directory, EPISODES_FILE), np.asarray(self.episode_starts, dtype=np.int64))
+
+    def close(self) -> None:
+        self.flush()
+        self.arrays.clear()
+
+
+class TrajectoryDataset:
+    """Read-only view of a dataset written by ``TrajectoryWriter``."""
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        self.size = meta["size"]
+        self.arrays = {}
+        for name, (dtype, shape) in meta["fields"].items():
+            arr = np.memmap(
+                os.path.join(directory, name + ".bin"),
+                dtype=np.dtype(dtype),
+                mode="r",
+                shape=(meta["capacity"], *shape),
+            )
+            self.arrays[name] = arr[: self.size]
+        self.episode_starts = np.load(os.path.join(directory, EPISODES_FILE))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def episode(self, k: int) -> slice:
+        """Row range of episode ``k``."""
+        end = self.episode_starts[k + 1] if k + 1 < len(self.episode_starts) else self.size
+        return slice(int(self.episode_starts[k]), int(end))
+
+    def sample(self, batch_size: int, rng=None) -> dict:
+        """Uniform random minibatch; only the sampled rows are read."""
+        if rng is None:
+            rng = np.random.default_rng()
+        idx = np.sort(rng.integers(0, self.size, size=batch_size))
+        return {name: arr[idx] for name, arr in self.arrays.items()}
@@ -1,16 +1,37 @@
 import math
+from typing import Optional
+
+import numpy as np
+
+from . import world
+from .items import Block, IS_SOLID
+
+# === Precipitation settings ===
+WEATHER_PERIOD = 1200   # ticks between changes of the weather target
+RAIN_CHANCE = {"spring": 0.4, "summer": 0.2, "autumn": 0.5, "winter": 0.4}
+RAMP = 1 / 600          # intensity change per tick towards the target
+LAYER_TICKS = 2000      # ticks of full-intensity precipitation per snow layer / water level
+
+NONE, RAIN, SNOW = 0, 1, 2
 
 
 class WeatherSystem:
     """Simple day/night cycle and seasonal weather manager."""
 
-    def __init__(self, day_length=12000, season_length=48000):
+    def __init__(self, day_length=12000, season_length=48000, rng: Optional[np.random.Generator] = None):
         # Number of environment steps that make up one day and one season
         self.day_length = day_length
         self.season_length = season_length
         self.tick = day_length / 4
         self.seasons = ["spring", "summer", "autumn", "winter"]
         self._season_index = 0
+        # precipitation strength (0..1) and wind (tiles per tick), easing
+        # towards targets drawn every WEATHER_PERIOD ticks
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.intensity = 0.0
+        self.wind = 0.0
+        self._target_intensity = 0.0
+        self._target_wind = 0.0
 
     @property
     def time_of_day(self) -> int:
@@ -30,6 +51,12 @@ class WeatherSystem:
         self.tick += 1
         if self.tick % self.season_length == 0:
             self._season_index = (self._season_index + 1) % len(self.seasons)
+        if self.tick % WEATHER_PERIOD == 0:
+            raining = self.rng.random() < RAIN_CHANCE[self.current_season]
+            self._target_intensity = float(self.rng.uniform(0.3, 1.0)) if raining else 0.0
+            self._target_wind = float(self.rng.normal(0.0, 0.05))
+        self.intensity += float(np.clip(self._target_intensity - self.intensity, -RAMP, RAMP))
+        self.wind += float(np.clip(self._target_wind - self.wind, -RAMP / 10, RAMP / 10))
 
     def get_light_intensity(self) -> float:
         """Return a lighting factor between 0 (dark) and 1 (full daylight)."""
@@ -46,5 +73,138 @@ class WeatherSystem:
             "winter": (180, 220, 255),
         }
         base = base_colors[self.current_season]
-        light = self.get_light_intensity()
+        light = self.get_light_intensity() * (1 - 0.3 * self.intensity)
         return tuple(int(c * light) for c in base)
+
+    def kind(self, biome: str) -> int:
+        """Precipitation falling over ``biome`` this season."""
+        if biome == "desert":
+            return NONE
+        if biome == "mountains" or self.current_season == "winter":
+            return SNOW
+        return RAIN
+
+
+class Precipitation:
+    """Rain and snow over one environment's world.
+
+    Gameplay effects don't depend on particles: every column accumulates
+    ``intensity / LAYER_TICKS`` per tick and on reaching 1 either lays a
+    snow layer on exposed ground or tops up a water tile it falls on.
+    Rain on dry ground soaks in and has no gameplay effect: nothing dries
+    water up again, so puddles would spread until the ground is no longer
+    walkable. Rain therefore only raises existing lakes, rivers and seas.
+    Particles are purely visual. They live in NumPy arrays (pixel
+    coordinates), are advected by the wind and die on the surface
+    heightmap. They are only simulated once the environment has a screen,
+    so headless training pays for the accumulation alone.
+    """
+
+    def __init__(self, env, capacity: int = 2048):
+        self.env = env
+        self.capacity = capacity
+        self.accum = np.zeros(0, dtype=np.float32)
+        self.n = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self._biomes = {}  # biome segment -> biome name
+        self._rng = np.random.default_rng(0)  # visual only, never gameplay
+
+    # --- maintenance -------------------------------------------------------
+    def rebuild(self) -> None:
+        self.accum = self._phase(0, self.env.grid_width)
+        self.n = 0
+
+    def columns_added(self, x0: int, x1: int) -> None:
+        new = self._phase(x0, x1)
+        if x0 == 0:
+            self.accum = np.concatenate([new, self.accum])
+        else:
+            self.accum = np.concatenate([self.accum, new])
+
+    def columns_removed(self, gx0: int, gx1: int) -> None:
+        off = self.env.world_x_offset
+        self.accum = np.delete(self.accum, np.s_[gx0 - off : gx1 - off])
+
+    def _phase(self, x0: int, x1: int) -> np.ndarray:
+        # spread columns over the cycle so they don't all fill at once
+        gx = np.arange(x0, x1) + self.env.world_x_offset
+        return ((gx * 0.6180339887) % 1.0).astype(np.float32)
+
+    def shift_x(self, dx: float) -> None:
+        self.x[: self.n] += dx
+
+    def column_kinds(self, xs: np.ndarray) -> np.ndarray:
+        """Precipitation kind over each of the local columns ``xs``."""
+        env = self.env
+        segs = (xs + env.world_x_offset) // world.BIOME_SEGMENT
+        kinds = {}
+        for seg in np.unique(segs).tolist():
+            if seg not in self._biomes:
+                self._biomes[seg] = world._biome_for_x(seg * world.BIOME_SEGMENT, env.world_seed)
+            kinds[seg] = env.weather.kind(self._biomes[seg])
+        return np.array([kinds[s] for s in segs.tolist()], dtype=np.int8)
+
+    # --- simulation --------------------------------------------------------
+    def step(self) -> None:
+        intensity = self.env.weather.intensity
+        if intensity > 0:
+            self.accum += intensity / LAYER_TICKS
+            full = np.flatnonzero(self.accum >= 1.0)
+            if len(full):
+                self.accum[full] -= 1.0
+                self._land(full)
+        if self.env.screen is not None:
+            self._step_particles(intensity)
+
+    def _land(self, xs: np.ndarray) -> None:
+        env = self.env
+        heights = env.surface.heights[xs]
+        kinds = self.column_kinds(xs)
+        ok = heights > 0
+        xs, ys, kinds = xs[ok], heights[ok], kinds[ok]
+        ground = env.grid[ys, xs]
+
+        snow = (kinds == SNOW) & IS_SOLID[ground] & (ground != Block.SNOW) & (env.grid[ys - 1, xs] == Block.EMPTY)
+        if snow.any():
+            env.set_blocks(xs[snow], ys[snow] - 1, np.full(int(snow.sum()), Block.SNOW))
+        # rain on dry ground soaks in (see the class docstring)
+        rain = (kinds == RAIN) & (ground == Block.WATER)
+        if rain.any():
+            env.fluids.add_water(xs[rain], ys[rain], 1)
+
+    def _step_particles(self, intensity: float) -> None:
+        env = self.env
+        ts = env.tile_size
+        n = self.n
+        x, y, kind = self.x[:n], self.y[:n], self.kind[:n]
+        # advect: rain falls fast and straight, snow drifts
+        x += env.weather.wind * ts * np.where(kind == SNOW, 2.0, 1.0)
+        x += np.where(kind == SNOW, np.sin(y * 0.05), 0.0).astype(np.float32)
+        y += np.where(kind == SNOW, 3.0, 14.0).astype(np.float32)
+
+        # die on the heightmap or outside the world
+        col = (x // ts).astype(np.int64)
+        inside = (col >= 0) & (col < env.grid_width)
+        ground = np.where(inside, env.surface.heights[np.clip(col, 0, env.grid_width - 1)], -1)
+        bottom = env.camera_y + env.screen.get_height() + 2 * ts
+        alive = inside & ((ground < 0) | (y < ground * ts)) & (y < bottom)
+        keep = np.flatnonzero(alive)
+        m = len(keep)
+        self.x[:m], self.y[:m], self.kind[:m] = x[keep], y[keep], kind[keep]
+
+        # spawn along the top of the view
+        spawn = min(int(self._rng.poisson(intensity * 6)), self.capacity - m)
+        if spawn > 0:
+            width = env.screen.get_width() + 4 * ts
+            sx = env.camera_x - 2 * ts + self._rng.random(spawn) * width
+            cols = np.clip((sx // ts).astype(np.int64), 0, env.grid_width - 1)
+            kinds = self.column_kinds(cols)
+            ok = kinds != NONE
+            k = int(ok.sum())
+            self.x[m : m + k] = sx[ok]
+            self.y[m : m + k] = env.camera_y - self._rng.random(k) * ts
+            self.kind[m : m + k] = kinds[ok]
+            m += k
+        self.n = m
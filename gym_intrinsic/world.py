@@ -1,7 +1,11 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
 import numpy as np
-import pygame
 import random
-from .items import Block, ORE_TYPES
+from .items import Block, ORE_TYPES, IS_LIQUID
+from . import structures
 
 
 EMPTY = 0
@@ -16,31 +20,116 @@ SEA_LEVEL_FRACT = 0.30   # Sea level as a fraction of total world height
 BLEND_WIDTH     = 16     # Width of the biome blend zone
 BLEND_NOISE     = 0.35   # Randomness in biome blending
 
-# === Cave generation settings (2D value noise) ===
-CAVE_FREQ   = 6          # Grid cell size for noise interpolation (lower = tighter variation)
-CAVE_THRESH = 0.45       # Noise threshold under which tiles become empty (caves)
-
-# === Value noise for caves ===================================================
-def _valrand(ix: int, iy: int) -> float:
-    """Repeatable pseudo-random value for grid point (ix, iy)."""
-    return _rand_unit(ix * 374761393 + iy * 668265263)
-
-def _value_noise(x: int, y: int, freq: int = CAVE_FREQ) -> float:
-    """
-    2D bilinear-interpolated value noise.
-    Produces smooth pseudo-random values from a coarse grid.
-    """
-    gx, gy = x // freq, y // freq
-    fx, fy = (x % freq) / freq, (y % freq) / freq
-
-    v00 = _valrand(gx,     gy    )
-    v10 = _valrand(gx + 1, gy    )
-    v01 = _valrand(gx,     gy + 1)
-    v11 = _valrand(gx + 1, gy + 1)
-
-    vx0 = _lerp(v00, v10, fx)
-    vx1 = _lerp(v01, v11, fx)
-    return _lerp(vx0, vx1, fy)
+# === Chunking ===
+CHUNK_SIZE      = 16     # Width/height of a world chunk in tiles (global coordinates)
+
+# === Cave generation settings (2D fBm noise) ===
+CAVE_FREQ    = 12        # Cell size of the coarsest octave in tiles (lower = tighter variation)
+CAVE_OCTAVES = 3
+CAVE_THRESH  = 0.46      # Noise threshold under which tiles become empty (caves)
+
+# === Climate settings (1D fBm noise over global x) ===
+TEMP_CELL  = 512         # Cell sizes of the coarsest octave in tiles
+HUMID_CELL = 384
+CONT_CELL  = 768         # "continentalness": low values become ocean
+CLIMATE_OCTAVES = 3
+
+# === Noise engine ============================================================
+# Value noise whose lattice values are hashed once per LATTICE_TILE² block
+# and kept in an LRU cache, so neighbouring chunks and later octaves reuse
+# them. All samplers take whole coordinate arrays.
+LATTICE_TILE = 16        # Lattice points per cached tile side
+LATTICE_CACHE_TILES = 1024
+
+def _hash32_array(n: np.ndarray) -> np.ndarray:
+    """Vectorised ``_hash32`` on uint32 arrays."""
+    x = n.astype(np.uint32)
+    x = (x ^ np.uint32(61)) ^ (x >> np.uint32(16))
+    x = x + (x << np.uint32(3))
+    x = x ^ (x >> np.uint32(4))
+    x = x * np.uint32(0x27D4EB2D)
+    return x ^ (x >> np.uint32(15))
+
+class LatticeCache:
+    """LRU cache of value-noise lattice tiles keyed by (seed, tx, ty)."""
+
+    def __init__(self, max_tiles: int = LATTICE_CACHE_TILES, tile: int = LATTICE_TILE):
+        self.max_tiles = max_tiles
+        self.tile = tile
+        self.tiles = OrderedDict()
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+
+    def _make(self, seed: int, tx: int, ty: int) -> np.ndarray:
+        t = self.tile
+        ix = np.arange(tx * t, tx * t + t, dtype=np.int64)
+        iy = np.arange(ty * t, ty * t + t, dtype=np.int64)
+        n = (iy[:, None] * 668265263 + ix[None, :] * 374761393 + seed) & 0xFFFFFFFF
+        return (_hash32_array(n) / 0xFFFFFFFF).astype(np.float32)
+
+    def get(self, seed: int, tx: int, ty: int) -> np.ndarray:
+        key = (seed, tx, ty)
+        with self._lock:
+            tile = self.tiles.get(key)
+            if tile is not None:
+                self.tiles.move_to_end(key)
+                self.hits += 1
+                return tile
+            self.misses += 1
+        tile = self._make(seed, tx, ty)
+        with self._lock:
+            self.tiles[key] = tile
+            if len(self.tiles) > self.max_tiles:
+                self.tiles.popitem(last=False)
+        return tile
+
+    def patch(self, seed: int, ix0: int, ix1: int, iy0: int, iy1: int):
+        """Lattice values covering points [ix0, ix1] × [iy0, iy1], as
+        ``(values[y, x], x_origin, y_origin)``."""
+        t = self.tile
+        tx0, tx1, ty0, ty1 = ix0 // t, ix1 // t, iy0 // t, iy1 // t
+        out = np.empty(((ty1 - ty0 + 1) * t, (tx1 - tx0 + 1) * t), dtype=np.float32)
+        for ty in range(ty0, ty1 + 1):
+            for tx in range(tx0, tx1 + 1):
+                out[(ty - ty0) * t : (ty - ty0 + 1) * t, (tx - tx0) * t : (tx - tx0 + 1) * t] = self.get(seed, tx, ty)
+        return out, tx0 * t, ty0 * t
+
+LATTICE = LatticeCache()
+
+def value_noise(x, y, seed: int) -> np.ndarray:
+    """Smoothly interpolated value noise in [0, 1) at lattice-space
+    coordinates ``x``, ``y`` (arrays, one lattice cell per unit)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x, y = np.broadcast_arrays(x, y)
+    ix = np.floor(x).astype(np.int64)
+    iy = np.floor(y).astype(np.int64)
+    fx, fy = x - ix, y - iy
+    fx = fx * fx * (3 - 2 * fx)
+    fy = fy * fy * (3 - 2 * fy)
+    lat, ox, oy = LATTICE.patch(seed & 0xFFFFFFFF, int(ix.min()), int(ix.max()) + 1, int(iy.min()), int(iy.max()) + 1)
+    px, py = ix - ox, iy - oy
+    v0 = _lerp(lat[py, px], lat[py, px + 1], fx)
+    v1 = _lerp(lat[py + 1, px], lat[py + 1, px + 1], fx)
+    return _lerp(v0, v1, fy)
+
+def fbm2(x, y, seed: int, cell: float, octaves: int = 4, lacunarity: float = 2.0, gain: float = 0.5) -> np.ndarray:
+    """Fractal (multi-octave) value noise in [0, 1) over tile coordinates.
+    ``cell`` is the lattice spacing of the coarsest octave in tiles."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    total, norm, amp = 0.0, 0.0, 1.0
+    for o in range(octaves):
+        c = cell / lacunarity ** o
+        # fractional shifts keep the octaves' lattice lines from lining up
+        total = total + amp * value_noise(x / c + o * 0.618, y / c + o * 0.382, seed + o * 0x9E3779B1)
+        norm += amp
+        amp *= gain
+    return total / norm
+
+def fbm1(x, seed: int, cell: float, octaves: int = 4, lacunarity: float = 2.0, gain: float = 0.5) -> np.ndarray:
+    """1D ``fbm2`` along a single lattice row."""
+    return fbm2(x, 0.0, seed, cell, octaves, lacunarity, gain)
 
 # === Hash-based utilities for deterministic generation =======================
 def _hash32(x: int) -> int:
@@ -52,34 +141,61 @@ def _hash32(x: int) -> int:
     x = x ^ (x >> 15)
     return x & 0xFFFFFFFF
 
-def _rand_unit(n: int) -> float:
+def _rand_unit(n: int, seed: int) -> float:
     """Convert hashed int to float in [0, 1)."""
-    return _hash32(n + WORLD_SEED) / 0xFFFFFFFF
+    return _hash32(n + seed) / 0xFFFFFFFF
 
-def _anchor_elevation(anchor_idx: int, h_min: int, h_max: int) -> int:
+def _anchor_elevation(anchor_idx: int, h_min: int, h_max: int, seed: int) -> int:
     """Return base elevation for a terrain anchor point."""
-    return int(h_min + _rand_unit(anchor_idx * 17) * (h_max - h_min))
+    return int(h_min + _rand_unit(anchor_idx * 17, seed) * (h_max - h_min))
 
 def _lerp(a: float, b: float, t: float) -> float:
     """Linear interpolation between a and b."""
     return a + t * (b - a)
 
-# === Biome selection and blending ============================================
-def _biome_for_x(global_x: int) -> str:
-    """Choose a biome based on tile's global X coordinate."""
-    segment = global_x // BIOME_SEGMENT
-    return BIOMES[_hash32(segment * 97 + WORLD_SEED) % len(BIOMES)]
-
-def _biome_blend(global_x: int) -> tuple[str, str, float]:
+# === Climate and biome selection ============================================
+def climate(global_x, seed: int):
+    """Temperature, humidity and continentalness (each in [0, 1)) at the
+    global columns ``global_x``."""
+    gx = np.asarray(global_x, dtype=np.float64)
+    temperature = fbm1(gx, seed + 101, TEMP_CELL, CLIMATE_OCTAVES)
+    humidity = fbm1(gx, seed + 202, HUMID_CELL, CLIMATE_OCTAVES)
+    continental = fbm1(gx, seed + 303, CONT_CELL, CLIMATE_OCTAVES)
+    return temperature, humidity, continental
+
+def biome_from_climate(temperature: float, humidity: float, continental: float) -> str:
+    """Whittaker-style lookup; thresholds give each biome roughly a fifth
+    of the world."""
+    if continental < 0.35:
+        return "ocean"
+    if temperature < 0.38:
+        return "mountains"
+    if temperature > 0.52 and humidity < 0.48:
+        return "desert"
+    if humidity > 0.56:
+        return "forest"
+    return "plains"
+
+@lru_cache(maxsize=4096)
+def _segment_biome(segment: int, seed: int) -> str:
+    t, h, c = climate(segment * BIOME_SEGMENT + BIOME_SEGMENT // 2, seed)
+    return biome_from_climate(float(t), float(h), float(c))
+
+def _biome_for_x(global_x: int, seed: int) -> str:
+    """Choose a biome from the climate at the centre of the tile's
+    BIOME_SEGMENT-wide segment."""
+    return _segment_biome(global_x // BIOME_SEGMENT, seed)
+
+def _biome_blend(global_x: int, seed: int) -> tuple[str, str, float]:
     """
     Returns (left_biome, right_biome, blend_t)
     where blend_t ∈ [0, 1] indicates position within blend zone.
     """
     seg  = global_x // BIOME_SEGMENT
     pos  = global_x % BIOME_SEGMENT
-    b_left  = _biome_for_x((seg - 1) * BIOME_SEGMENT)
-    b_mid   = _biome_for_x(seg * BIOME_SEGMENT)
-    b_right = _biome_for_x((seg + 1) * BIOME_SEGMENT)
+    b_left  = _biome_for_x((seg - 1) * BIOME_SEGMENT, seed)
+    b_mid   = _biome_for_x(seg * BIOME_SEGMENT, seed)
+    b_right = _biome_for_x((seg + 1) * BIOME_SEGMENT, seed)
 
     if pos >= BIOME_SEGMENT - BLEND_WIDTH:
         t = (pos - (BIOME_SEGMENT - BLEND_WIDTH)) / (2 * BLEND_WIDTH)
@@ -91,109 +207,169 @@ def _biome_blend(global_x: int) -> tuple[str, str, float]:
     return b_mid, b_mid, 0.0
 
 # === Set the world seed ======================================================
+WORLD_SEED = None  # picked on first use, see get_world_seed
+
 def set_world_seed(seed: int | None = None):
-    """Set global WORLD_SEED. If none, generate a new random one."""
+    """Set the default WORLD_SEED used by environments created without a
+    seed. If none, generate a new random one.
+
+    Environments keep their own seed and RNG streams (see
+    ``IntrinsicEnv.reset``); the process-global ``random`` and ``np.random``
+    states are left untouched.
+    """
     global WORLD_SEED
     if seed is None:
         seed = random.randint(0, 2**31 - 1)
     WORLD_SEED = seed & 0xFFFFFFFF
-    random.seed(seed)
-    np.random.seed(seed)
-set_world_seed()
+
+def get_world_seed() -> int:
+    """The default seed; a random one is picked on first use."""
+    if WORLD_SEED is None:
+        set_world_seed()
+    return WORLD_SEED
+
+# === Terrain profile =========================================================
+def column_profile(global_x: int, height: int, seed: int):
+    """Surface row and biome blend of a column, from the seed alone:
+    ``(surface_y, biome, biome2, blend_t)``."""
+    sea_level = int(height * SEA_LEVEL_FRACT)
+    min_elev, max_elev = int(height * 0.35), int(height * 0.55)
+    biome, biome2, blend_t = _biome_blend(global_x, seed)
+
+    # Determine elevation anchors for smooth terrain
+    base_segment = global_x // BIOME_SEGMENT if biome == _biome_for_x(global_x, seed) else (global_x // BIOME_SEGMENT) - 1
+    base_origin_x = base_segment * BIOME_SEGMENT
+    anchor_idx0 = (base_origin_x + (global_x - base_origin_x)) // COARSE_STEP
+    anchor_idx1 = anchor_idx0 + 1
+    anchor_x0   = anchor_idx0 * COARSE_STEP
+    t_elev      = (global_x - anchor_x0) / COARSE_STEP
+
+    elev0 = _anchor_elevation(anchor_idx0, min_elev, max_elev, seed)
+    elev1 = _anchor_elevation(anchor_idx1, min_elev, max_elev, seed)
+    base_y = _lerp(elev0, elev1, t_elev)
+
+    # Apply biome-specific elevation offsets
+    def _bias(b: str, base: float) -> float:
+        if b == "ocean": return sea_level - base
+        if b == "plains": return _lerp(base, sea_level, 0.4) - base
+        if b == "mountains": return -8.0
+        return 0.0
+
+    bias_left  = _bias(biome,  base_y)
+    bias_right = _bias(biome2, base_y)
+    w = (1 - np.cos(blend_t * np.pi)) * 0.5
+    surface_y_f = base_y + (1 - w) * bias_left + w * bias_right
+    surface_y = max(0, min(height - 2, int(round(surface_y_f))))
+    return surface_y, biome, biome2, blend_t
 
 # === Main world generation function ==========================================
+TOP_BLOCKS = {"desert": Block.SAND, "plains": Block.GRASS, "mountains": Block.SNOW, "ocean": Block.SAND}
+WATER_DEPTH = 6          # Depth of ocean water above the sea floor
+
+def _tile_hash(gx, y, seed: int) -> np.ndarray:
+    """Per-tile 32-bit hash of global (gx, y)."""
+    n = np.asarray(gx, dtype=np.int64) * 0x9E3779B1 + np.asarray(y, dtype=np.int64) * 0x85EBCA77 + seed
+    return _hash32_array(n & 0xFFFFFFFF)
+
+def _terrain_rows(grid, world_x_offset, y0, y1, seed, dirt_depth, stone_depth, ore_chance) -> None:
+    """Fill rows [y0, y1) of ``grid`` with terrain (no decorations or
+    structures). Depends only on the seed and tile positions."""
+    height, width = grid.shape
+    gxs = np.arange(world_x_offset, world_x_offset + width)
+    ys = np.arange(y0, y1)[:, None]
+    profiles = [column_profile(gx, height, seed) for gx in gxs.tolist()]
+    surface = np.array([p[0] for p in profiles])
+    biome = np.array([p[1] for p in profiles])
+
+    # surface block, blended between neighbouring biomes
+    top1 = np.array([TOP_BLOCKS.get(p[1], Block.DIRT) for p in profiles], dtype=np.int8)
+    top2 = np.array([TOP_BLOCKS.get(p[2], Block.DIRT) for p in profiles], dtype=np.int8)
+    blend = np.array([p[3] for p in profiles])
+    jitter = (_hash32_array((gxs + seed + 0xB1E) & 0xFFFFFFFF) / 0xFFFFFFFF - 0.5) * BLEND_NOISE
+    top = np.where((blend > 0) & (blend + jitter > 0.5), top2, top1)
+
+    depth = ys - surface
+    out = np.full(depth.shape, Block.STONE, dtype=np.int8)
+    h = _tile_hash(gxs, ys, seed)
+    ores = np.asarray(ORE_TYPES, dtype=np.int8)
+    ore = (depth >= dirt_depth) & (depth < stone_depth) & (h < ore_chance * 0xFFFFFFFF)
+    out[ore] = ores[_hash32_array(h[ore]) % len(ores)]
+    out[(depth > 0) & (depth < dirt_depth)] = Block.DIRT
+    out[(depth > 0) & (depth < dirt_depth) & (biome == "desert")] = Block.SAND
+    out[depth == 0] = np.broadcast_to(top, depth.shape)[depth == 0]
+    out[(biome == "ocean") & (depth >= 0) & (depth < WATER_DEPTH)] = Block.WATER
+    caves = fbm2(gxs[None, :], ys, seed + 404, CAVE_FREQ, CAVE_OCTAVES) < CAVE_THRESH
+    out[(depth >= dirt_depth) & caves] = EMPTY
+    out[depth < 0] = EMPTY
+    grid[y0:y1] = out
+    if y1 == height:
+        grid[-1] = Block.STONE  # bedrock
+
+def generate_rows(
+    grid: np.ndarray,
+    world_x_offset: int,
+    y0: int,
+    y1: int,
+    *,
+    seed: int | None = None,
+    dirt_depth: int = 4,
+    stone_depth: int = 30,
+    ore_chance: float = 0.03,
+) -> None:
+    """Fill rows [y0, y1) of ``grid`` (the full-height columns starting at
+    global ``world_x_offset``) below the surface band: terrain, caves, ores
+    and the parts of structures in those rows. Pure function of the seed
+    and position, so rows can be filled lazily and in any order."""
+    if seed is None:
+        seed = get_world_seed()
+    _terrain_rows(grid, world_x_offset, y0, y1, seed, dirt_depth, stone_depth, ore_chance)
+    structures.stamp(grid, world_x_offset, seed, column_profile, rows=(y0, y1))
+
+def surface_band(width: int, height: int, world_x_offset: int, depth: int, seed: int | None = None) -> int:
+    """Rows to generate eagerly for a slice: down to ``depth`` tiles below
+    its deepest surface, rounded up to whole chunks."""
+    if seed is None:
+        seed = get_world_seed()
+    deepest = max(column_profile(gx, height, seed)[0] for gx in range(world_x_offset, world_x_offset + width))
+    return min(height, -(-(deepest + depth) // CHUNK_SIZE) * CHUNK_SIZE)
+
 def generate_world(
     width: int,
     height: int,
     world_x_offset: int = 0,
     *,
+    seed: int | None = None,
+    rng: np.random.Generator | None = None,
     dirt_depth: int = 4,
     stone_depth: int = 30,
     ore_chance: float = 0.03,
     tree_chance: float = 0.05,
+    rows: int | None = None,
 ):
     """
     Generate a terrain slice of width × height starting at world_x_offset.
-    Includes biome blending, surface materials, ores, and cave carving.
+    Includes biome blending, surface materials, ores, cave carving and
+    structures.
+
+    ``seed`` drives the deterministic terrain hashes (defaults to
+    WORLD_SEED); ``rng`` supplies the random decorations. With ``rows``
+    only the top rows are generated and the rest is left as stone, to be
+    filled later with ``generate_rows``.
     """
-    grid = np.zeros((height, width), dtype=np.int8)
-    sea_level = int(height * SEA_LEVEL_FRACT)
-    min_elev, max_elev = int(height * 0.35), int(height * 0.55)
+    if seed is None:
+        seed = get_world_seed()
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    rows = height if rows is None else rows
+    grid = np.full((height, width), Block.STONE, dtype=np.int8)
+    _terrain_rows(grid, world_x_offset, 0, rows, seed, dirt_depth, stone_depth, ore_chance)
 
     for local_x in range(width):
-        global_x = world_x_offset + local_x
-        biome, biome2, blend_t = _biome_blend(global_x)
-
-        # Determine elevation anchors for smooth terrain
-        base_segment = global_x // BIOME_SEGMENT if biome == _biome_for_x(global_x) else (global_x // BIOME_SEGMENT) - 1
-        base_origin_x = base_segment * BIOME_SEGMENT
-        anchor_idx0 = (base_origin_x + (global_x - base_origin_x)) // COARSE_STEP
-        anchor_idx1 = anchor_idx0 + 1
-        anchor_x0   = anchor_idx0 * COARSE_STEP
-        t_elev      = (global_x - anchor_x0) / COARSE_STEP
-
-        elev0 = _anchor_elevation(anchor_idx0, min_elev, max_elev)
-        elev1 = _anchor_elevation(anchor_idx1, min_elev, max_elev)
-        base_y = _lerp(elev0, elev1, t_elev)
-
-        # Apply biome-specific elevation offsets
-        def _bias(b: str, base: float) -> float:
-            if b == "ocean": return sea_level - base
-            if b == "plains": return _lerp(base, sea_level, 0.4) - base
-            if b == "mountains": return -8.0
-            return 0.0
-
-        bias_left  = _bias(biome,  base_y)
-        bias_right = _bias(biome2, base_y)
-        w = (1 - np.cos(blend_t * np.pi)) * 0.5
-        surface_y_f = base_y + (1 - w) * bias_left + w * bias_right
-        surface_y = max(0, min(height - 2, int(round(surface_y_f))))
-
-        # Fill column from surface downward
-        water_depth = 6
-        for y in range(surface_y, height):
-            depth = y - surface_y
-
-            # === Carve out caves using value noise ===
-            if depth >= dirt_depth:
-                n = _value_noise(global_x, y)
-                if n < CAVE_THRESH:
-                    continue  # leave cell empty and skip material placement
-
-            # === Ocean water surface ===
-            if biome == "ocean" and depth < water_depth:
-                grid[y, local_x] = Block.WATER
-                continue
-
-            # === Surface block ===
-            if depth == 0:
-                def _top(b: str):
-                    return {
-                        "desert": Block.SAND,
-                        "plains": Block.GRASS,
-                        "mountains": Block.SNOW,
-                        "ocean": Block.SAND,
-                    }.get(b, Block.DIRT)
-
-                if blend_t == 0:
-                    grid[y, local_x] = _top(biome)
-                else:
-                    prob = blend_t + (np.random.rand() - 0.5) * BLEND_NOISE
-                    grid[y, local_x] = _top(biome2) if prob > 0.5 else _top(biome)
-
-            # === Subsurface layer ===
-            elif depth < dirt_depth:
-                grid[y, local_x] = Block.SAND if biome == "desert" else Block.DIRT
-
-            # === Stone and ores ===
-            elif depth < stone_depth:
-                grid[y, local_x] = np.random.choice(ORE_TYPES) if np.random.rand() < ore_chance else Block.STONE
-            else:
-                grid[y, local_x] = Block.STONE
+        surface_y, biome, _, _ = column_profile(world_x_offset + local_x, height, seed)
 
         # === Tree decoration (forest) ===
-        if biome == "forest" and grid[surface_y, local_x] == Block.DIRT and np.random.rand() < tree_chance:
-            trunk_h = np.random.randint(3, 6)
+        if biome == "forest" and grid[surface_y, local_x] == Block.DIRT and rng.random() < tree_chance:
+            trunk_h = rng.integers(3, 6)
             for h in range(trunk_h):
                 y = surface_y - h
                 if y >= 0:
@@ -206,32 +382,32 @@ def generate_world(
                         grid[ny, nx] = Block.LEAVES
 
         # === Cactus decoration (desert) ===
-        elif biome == "desert" and grid[surface_y, local_x] == Block.SAND and np.random.rand() < 0.03:
-            c_h = np.random.randint(2, 4)
+        elif biome == "desert" and grid[surface_y, local_x] == Block.SAND and rng.random() < 0.03:
+            c_h = rng.integers(2, 4)
             for h in range(c_h):
                 y = surface_y - h
                 if y >= 0:
                     grid[y, local_x] = Block.CACTUS
 
-    # Final bedrock row
-    grid[-1, :] = Block.STONE
+    # === Structures (ruins, dungeons) ===
+    structures.stamp(grid, world_x_offset, seed, column_profile, rows=(0, rows))
     return grid
 
 # === Block rect conversion ===================================================
 def blocks_from_grid(grid: np.ndarray, tile_size: int):
     """
     Converts grid to Pygame rects for collisions and rendering.
-    Returns solid block rects and water rects separately.
+    Returns solid block rects and liquid (water) rects separately.
     """
-    height, width = grid.shape
-    solid, water = [], []
+    import pygame
 
-    for y in range(height):
-        for x in range(width):
-            block = grid[y, x]
-            if block == EMPTY:
-                continue
-            rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
-            (water if block == Block.WATER else solid).append((rect, block) if block != Block.WATER else rect)
+    solid, water = [], []
+    liquid = IS_LIQUID[grid]
+    for y, x in zip(*np.nonzero(grid != EMPTY)):
+        rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+        if liquid[y, x]:
+            water.append(rect)
+        else:
+            solid.append((rect, grid[y, x]))
 
     return solid, water
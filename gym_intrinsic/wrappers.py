@@ -0,0 +1,89 @@
+import gym
+import numpy as np
+from gym import spaces
+
+
+class ActionRepeat(gym.Wrapper):
+    """Repeat each action for ``repeat`` ticks (frame skip).
+
+    Uses the environment's native ``step_repeat`` when available so the
+    observation is only built once per call; otherwise falls back to
+    stepping ``repeat`` times and summing the rewards.
+    """
+
+    def __init__(self, env: gym.Env, repeat: int = 4):
+        super().__init__(env)
+        if repeat < 1:
+            raise ValueError("repeat must be at least 1")
+        self.repeat = repeat
+
+    def step(self, action):
+        step_repeat = getattr(self.env.unwrapped, "step_repeat", None)
+        if step_repeat is not None:
+            return step_repeat(action, self.repeat)
+
+        total_reward = 0.0
+        for _ in range(self.repeat):
+            obs, reward, done, truncated, info = self.env.step(action)
+            total_reward += reward
+            if done or truncated:
+                break
+        return obs, total_reward, done, truncated, info
+
+
+class NearestBlocksObservation(gym.ObservationWrapper):
+    """Append the offset to the nearest tile of each block type to the
+    observation: ``(dx, dy, found)`` in tiles from the player's tile, taken
+    from the environment's ``BlockIndex``."""
+
+    def __init__(self, env: gym.Env, block_ids, max_dist: float = 64):
+        super().__init__(env)
+        self.block_ids = list(block_ids)
+        self.max_dist = max_dist
+        n = 3 * len(self.block_ids)
+        base = env.observation_space
+        low = np.concatenate([base.low, np.tile([-max_dist, -max_dist, 0], len(self.block_ids))])
+        high = np.concatenate([base.high, np.tile([max_dist, max_dist, 1], len(self.block_ids))])
+        self.observation_space = spaces.Box(low=low.astype(np.float32), high=high.astype(np.float32), dtype=np.float32)
+        self._features = np.zeros(n, dtype=np.float32)
+
+    def observation(self, obs):
+        env = self.env.unwrapped
+        px = env.player.rect.centerx // env.tile_size
+        py = env.player.rect.centery // env.tile_size
+        feats = self._features
+        feats[:] = 0
+        for i, block in enumerate(self.block_ids):
+            hit = env.block_index.nearest(block, px, py, k=1, max_dist=self.max_dist)
+            if hit:
+                feats[3 * i : 3 * i + 3] = (hit[0][0] - px, hit[0][1] - py, 1)
+        return np.concatenate([obs, feats])
+
+
+class LightObservation(gym.ObservationWrapper):
+    """Append the brightness (0..1, see ``lighting.py``) of the
+    ``(2r+1)²`` tiles around the player to the observation; 0 outside the
+    world."""
+
+    def __init__(self, env: gym.Env, radius: int = 4):
+        super().__init__(env)
+        self.radius = radius
+        n = (2 * radius + 1) ** 2
+        base = env.observation_space
+        low = np.concatenate([base.low, np.zeros(n, dtype=np.float32)])
+        high = np.concatenate([base.high, np.ones(n, dtype=np.float32)])
+        self.observation_space = spaces.Box(low=low, high=high, dtype=np.float32)
+
+    def observation(self, obs):
+        env = self.env.unwrapped
+        r = self.radius
+        size = 2 * r + 1
+        window = np.zeros((size, size), dtype=np.float32)
+        x0 = env.player.rect.centerx // env.tile_size - r
+        y0 = env.player.rect.centery // env.tile_size - r
+        gx0, gy0 = max(x0, 0), max(y0, 0)
+        gx1, gy1 = min(x0 + size, env.grid_width), min(y0 + size, env.grid_height)
+        if gx0 < gx1 and gy0 < gy1:
+            daylight = env.weather.get_light_intensity()
+            window[gy0 - y0 : gy1 - y0, gx0 - x0 : gx1 - x0] = env.lighting.brightness(gx0, gx1, gy0, gy1, daylight)
+        return np.concatenate([obs, window.ravel()])
@@ -0,0 +1,90 @@
+"""Zobrist-style hashing of the world grid and simulation state.
+
+Every (global x, y, block) triple maps to a fixed 64-bit key and the grid
+hash is the XOR of the keys of all non-empty tiles. Water levels are keyed
+the same way with codes past every block id (``LEVEL_BASE + level``).
+Empty tiles and dry levels contribute nothing, so generating new columns,
+writing blocks and moving water update the hash in O(changed tiles)
+without rescanning the grid.
+"""
+
+import hashlib
+
+import numpy as np
+
+MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_M1 = 0xBF58476D1CE4E5B9
+_M2 = 0x94D049BB133111EB
+# per-coordinate multipliers spreading (x, y, block) before mixing
+_CX = 0xD6E8FEB86659FD93
+_CY = 0xA0761D6478BD642F
+_CB = 0xE7037ED1A0B428DB
+
+# key code of water level n is LEVEL_BASE + n, clear of every block id
+LEVEL_BASE = 256
+
+
+def tile_key(gx: int, y: int, block: int) -> int:
+    """Key of one tile (splitmix64 finaliser); 0 for empty tiles."""
+    if block == 0:
+        return 0
+    z = ((gx & MASK) * _CX + y * _CY + block * _CB + _GOLDEN) & MASK
+    z = ((z ^ (z >> 30)) * _M1) & MASK
+    z = ((z ^ (z >> 27)) * _M2) & MASK
+    return z ^ (z >> 31)
+
+
+def tiles_hash(gxs, ys, blocks, base: int = 0) -> int:
+    """XOR of ``tile_key`` over arrays of global tiles (vectorised); non-zero
+    values are keyed as ``base + value``."""
+    blocks = np.asarray(blocks)
+    nonzero = blocks != 0
+    if not nonzero.any():
+        return 0
+    u = np.uint64
+    gx = np.asarray(gxs, dtype=np.int64)[nonzero].astype(u)
+    y = np.asarray(ys, dtype=np.int64)[nonzero].astype(u)
+    codes = blocks[nonzero].astype(np.int64) + base
+    z = gx * u(_CX) + y * u(_CY) + codes.astype(u) * u(_CB) + u(_GOLDEN)
+    z = (z ^ (z >> u(30))) * u(_M1)
+    z = (z ^ (z >> u(27))) * u(_M2)
+    z ^= z >> u(31)
+    return int(np.bitwise_xor.reduce(z))
+
+
+def region_hash(grid: np.ndarray, x_offset: int, y_offset: int = 0, base: int = 0) -> int:
+    """XOR of the keys of every tile in ``grid`` (or of water levels with
+    ``base=LEVEL_BASE``)."""
+    ys, xs = np.nonzero(grid)
+    return tiles_hash(xs.astype(np.int64) + x_offset, ys + y_offset, grid[ys, xs], base)
+
+
+def state_hash(env) -> int:
+    """64-bit hash of the grid and water levels plus player, AI, mob,
+    projectile and weather state. Equal simulations give equal hashes."""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(env.grid_hash.to_bytes(8, "little"))
+    w = env.weather
+    h.update(
+        np.array(
+            [env.ticks, env.world_x_offset, w.tick, w._season_index, w.intensity, w.wind], dtype=np.float64
+        ).tobytes()
+    )
+    for actor in (env.player, *env.ai_players):
+        r = actor.rect
+        h.update(
+            np.array(
+                [r.x, r.y, *actor.velocity, actor.health, actor.food, actor.oxygen, *actor.facing],
+                dtype=np.float64,
+            ).tobytes()
+        )
+    h.update(repr(sorted(env.player.inventory.items())).encode())
+    for store in (env.enemies, env.passive_mobs):
+        n = len(store)
+        for name in ("x", "y", "vel_y", "health", "uid"):
+            h.update(getattr(store, name)[:n].tobytes())
+    p = env.projectiles
+    for arr in (p.x, p.y, p.vx, p.vy):
+        h.update(arr[: p.n].tobytes())
+    return int.from_bytes(h.digest(), "little")
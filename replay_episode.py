@@ -0,0 +1,35 @@
+"""Replay a recorded episode, optionally starting from a given tick."""
+
+import argparse
+import pygame
+from gym_intrinsic import IntrinsicEnv
+from gym_intrinsic.recording import EpisodeReader
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded episode")
+    parser.add_argument("recording", help="file written by EpisodeRecorder")
+    parser.add_argument(
+        "--tick",
+        type=int,
+        default=None,
+        help="tick to start rendering from (fast-forwarded headless)",
+    )
+    args = parser.parse_args()
+
+    reader = EpisodeReader(args.recording)
+    env = IntrinsicEnv()
+    reader.seek(env, reader.first_tick if args.tick is None else args.tick)
+    print(f"replaying ticks {env.ticks}..{reader.end_tick}")
+
+    pygame.init()
+    env.render()
+    while env.screen is not None and reader.advance(env):
+        env.render()
+        env.clock.tick(60)
+    env.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
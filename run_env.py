@@ -6,6 +6,7 @@ import gym
 import gym_intrinsic
 import numpy as np
 from ai_agents.simple_agent import SimpleAgent
+from gym_intrinsic.recording import EpisodeRecorder
  
 def main():
     parser = argparse.ArgumentParser(description="Run the gym environment")
@@ -15,11 +16,21 @@ def main():
         default="ai",
         help="Choose control mode: 'ai' uses random actions, 'manual' uses the keyboard",
     )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        default=None,
+        help="Record the episode to PATH for replay_episode.py",
+    )
     args = parser.parse_args()
 
     pygame.init()
     env = gym.make("Intrinsic-v0")
     obs, info = env.reset()
+    recorder = None
+    if args.record:
+        recorder = EpisodeRecorder(args.record)
+        recorder.attach(env.unwrapped)
     done = False
  
     while not done:
@@ -45,6 +56,8 @@ def main():
 
         obs, reward, done, truncated, info = env.step(action)
         env.render()
+    if recorder is not None:
+        recorder.close()
     env.close()
     pygame.quit()
 
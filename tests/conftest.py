@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from gym_intrinsic.intrinsic_env import IntrinsicEnv
+from gym_intrinsic.items import Block
+from gym_intrinsic.world import CHUNK_SIZE
+
+EDIT_BLOCKS = (Block.EMPTY, Block.STONE, Block.WATER, Block.SAND, Block.IRON, Block.WOOD, Block.LEAVES)
+
+
+@pytest.fixture
+def edited_env():
+    """A fully generated world after random block edits with falling sand
+    and flowing water in between, grown on the right and evicted on the
+    left so every incremental index path has run."""
+    env = IntrinsicEnv()
+    env.evict_distance = None
+    env.reset(seed=5)
+    env._extend_world_right(2 * CHUNK_SIZE)
+    env.ensure_generated(0, env.grid_width, env.grid_height)
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        n = int(rng.integers(1, 30))
+        xs = rng.integers(0, env.grid_width, n)
+        ys = rng.integers(0, env.grid_height, n)
+        env.set_blocks(xs, ys, rng.choice(EDIT_BLOCKS, n))
+        env.falling.step()
+        env.fluids.step()
+    env._evict_columns(env.world_x_offset, env.world_x_offset + CHUNK_SIZE)
+    return env
@@ -0,0 +1,23 @@
+import numpy as np
+
+from gym_intrinsic.block_index import BlockIndex
+from gym_intrinsic.items import Block
+
+
+def test_incremental_block_index_matches_rebuild(edited_env):
+    env = edited_env
+    rebuilt = BlockIndex(env)
+    rebuilt.rebuild()
+
+    assert env.block_index.chunks == rebuilt.chunks
+    for block in rebuilt.block_ids:
+        assert env.block_index.count(block) == np.count_nonzero(env.grid == block)
+
+
+def test_nearest_returns_the_closest_tile(edited_env):
+    env = edited_env
+    x, y = env.grid_width // 2, 40
+    ys, xs = np.nonzero(env.grid == Block.IRON)
+    (tx, ty), = env.block_index.nearest(Block.IRON, x, y)
+    assert env.grid[ty, tx] == Block.IRON
+    assert np.hypot(tx - x, ty - y) == np.min(np.hypot(xs - x, ys - y))
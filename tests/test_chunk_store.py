@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from gym_intrinsic.intrinsic_env import IntrinsicEnv
+from gym_intrinsic.chunk_store import ChunkStore, pack, unpack
+from gym_intrinsic.world import CHUNK_SIZE
+
+
+@pytest.mark.parametrize("values", [1, 2, 3, 4, 9, 16, 17, 200])
+def test_pack_round_trips(values):
+    rng = np.random.default_rng(values)
+    tiles = rng.integers(0, values, size=(CHUNK_SIZE, 11)).astype(np.int8)
+    np.testing.assert_array_equal(unpack(pack(tiles)), tiles)
+
+
+def test_store_round_trips_columns():
+    rng = np.random.default_rng(0)
+    grid = rng.integers(0, 12, size=(90, CHUNK_SIZE)).astype(np.int8)
+    level = rng.integers(0, 9, size=(90, CHUNK_SIZE)).astype(np.uint8)
+    rows = rng.integers(8, 90, size=CHUNK_SIZE).astype(np.int32)
+    store = ChunkStore()
+    store.put(-3, grid, level, rows)
+    assert store.block_at(-3 * CHUNK_SIZE + 5, 40) == grid[40, 5]
+    out = store.pop(-3)
+    for a, b in zip(out, (grid, level, rows)):
+        np.testing.assert_array_equal(a, b)
+    assert len(store) == 0
+
+
+def test_evicted_columns_come_back_unchanged():
+    env = IntrinsicEnv()
+    env.evict_distance = None
+    env.reset(seed=5)
+    env._extend_world_right(6 * CHUNK_SIZE)
+    env.ensure_generated(env.grid_width - 2 * CHUNK_SIZE, env.grid_width, env.grid_height)
+    for _ in range(30):
+        env.fluids.step()
+
+    end = env.world_x_offset + env.grid_width
+    gx0 = end - 4 * CHUNK_SIZE
+    x0 = gx0 - env.world_x_offset
+    grid = env.grid[:, x0:].copy()
+    level = env.fluids.level[:, x0:].copy()
+    rows = env.generated_rows[x0:].copy()
+    grid_hash = env.grid_hash
+
+    env._evict_columns(gx0, end)
+    assert env.world_x_offset + env.grid_width == gx0
+    assert len(env.chunk_store) == 4
+    assert env.block_at(gx0 + 3, 50) == grid[50, 3]
+    assert env.grid_hash == grid_hash
+
+    env._extend_world_right(4 * CHUNK_SIZE)
+    np.testing.assert_array_equal(env.grid[:, x0:], grid)
+    np.testing.assert_array_equal(env.fluids.level[:, x0:], level)
+    np.testing.assert_array_equal(env.generated_rows[x0:], rows)
+    assert env.grid_hash == grid_hash
+    assert len(env.chunk_store) == 0
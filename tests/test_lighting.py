@@ -0,0 +1,32 @@
+import numpy as np
+
+from gym_intrinsic.items import Block
+from gym_intrinsic.lighting import LightField
+
+
+def _assert_matches_rebuild(env):
+    rebuilt = LightField(env)
+    rebuilt.rebuild()
+    np.testing.assert_array_equal(env.lighting.sky, rebuilt.sky)
+    np.testing.assert_array_equal(env.lighting.block, rebuilt.block)
+
+
+def test_incremental_lighting_matches_rebuild(edited_env):
+    _assert_matches_rebuild(edited_env)
+
+
+def test_shaft_lights_up_and_darkens_again(edited_env):
+    env = edited_env
+    x = env.grid_width // 2
+    top = env.surface.surface_y(x)
+    sky, block = env.lighting.sky.copy(), env.lighting.block.copy()
+    ys = np.arange(top, top + 20)
+    old = env.grid[ys, x].copy()
+
+    env.set_blocks(np.full(len(ys), x), ys, np.full(len(ys), Block.EMPTY))
+    assert env.lighting.sky[ys[-1], x] > sky[ys[-1], x]
+    _assert_matches_rebuild(env)
+
+    env.set_blocks(np.full(len(ys), x), ys, old)
+    np.testing.assert_array_equal(env.lighting.sky, sky)
+    np.testing.assert_array_equal(env.lighting.block, block)
@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import gym_intrinsic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = (
+    "items", "world", "pathfinding", "lighting", "fluids", "falling", "block_index",
+    "hpa", "lod", "mob_store", "enemy_mobs", "passive_mobs", "atlas",
+)
+
+
+def _fresh_import(code):
+    env = dict(os.environ, PYTHONPATH=ROOT, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    result = subprocess.run([sys.executable, "-c", code], env=env, cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.parametrize("name", sorted(gym_intrinsic._EXPORTS))
+def test_export_imports_in_a_fresh_interpreter(name):
+    _fresh_import(f"from gym_intrinsic import {name}")
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_submodule_imports_in_a_fresh_interpreter(module):
+    _fresh_import(f"import gym_intrinsic.{module}")
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from gym_intrinsic.intrinsic_env import IntrinsicEnv
+from gym_intrinsic import pathfinding
+from gym_intrinsic.items import Block
+
+
+@pytest.fixture
+def env():
+    env = IntrinsicEnv()
+    env.reset(seed=3)
+    env.ensure_generated(0, env.grid_width, env.grid_height)
+    return env
+
+
+def _random_walkable(env, rng):
+    x, y = env.surface.walkable.choice(rng)
+    return (x - env.world_x_offset, y)
+
+
+def _length(path):
+    return None if path is None else len(path)
+
+
+def test_dstar_matches_astar_after_goal_moves_and_block_edits(env):
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        planner = pathfinding.DStarLite(env)
+        start = _random_walkable(env, rng)
+        for _ in range(5):
+            goal = _random_walkable(env, rng)
+            path = planner.plan(start, goal)
+            assert _length(path) == _length(pathfinding.astar(env, start, goal))
+
+            # edit a few tiles anywhere and a few right next to the route
+            xs = rng.integers(0, env.grid_width, 6)
+            ys = rng.integers(1, env.grid_height - 1, 6)
+            if path:
+                near = np.array(path)[rng.integers(len(path), size=3)]
+                xs[:3] = np.clip(near[:, 0] + rng.integers(-1, 2, 3), 0, env.grid_width - 1)
+                ys[:3] = np.clip(near[:, 1] + rng.integers(-1, 2, 3), 1, env.grid_height - 2)
+            env.set_blocks(xs, ys, rng.choice([Block.EMPTY, Block.STONE], 6))
+            planner.blocks_changed(xs, ys)
+
+
+def test_dstar_repairs_when_the_route_is_walled_off(env):
+    rng = np.random.default_rng(1)
+    planner = pathfinding.DStarLite(env)
+    for _ in range(10):
+        start, goal = _random_walkable(env, rng), _random_walkable(env, rng)
+        path = planner.plan(start, goal)
+        if path is None or len(path) < 4:
+            continue
+        # wall the middle of the route from the ground to the top of the world
+        x = path[len(path) // 2][0]
+        ys = np.arange(0, path[len(path) // 2][1] + 1)
+        env.set_blocks(np.full(len(ys), x), ys, np.full(len(ys), Block.STONE))
+        planner.blocks_changed(np.full(len(ys), x), ys)
+        assert _length(planner.plan(start, goal)) == _length(pathfinding.astar(env, start, goal))
+
+
+def test_lazy_generation_repairs_planners_instead_of_resetting_them():
+    env = IntrinsicEnv()
+    env.reset(seed=3)
+    env.enemy_spawn_chance = 1.0
+    env.passive_spawn_chance = 1.0
+    for _ in range(300):
+        env.step([0, 0, 0, 0, 0])
+        if any(enemy.planner is not None for enemy in env.enemies):
+            break
+    enemies = [enemy for enemy in env.enemies if enemy.planner is not None]
+    assert enemies and (env.generated_rows < env.grid_height).any()
+    planners = [enemy.planner for enemy in enemies]
+    goals = [mob.goal for mob in env.passive_mobs]
+
+    env.ensure_generated(0, env.grid_width, env.grid_height)
+    assert [enemy.planner for enemy in enemies] == planners
+    assert [mob.goal for mob in env.passive_mobs] == goals
+    for planner in planners:
+        start, goal = planner.start, planner.goal
+        assert _length(planner.plan(start, goal)) == _length(pathfinding.astar(env, start, goal))
+
+
+def test_long_route_generates_only_its_end_chunks():
+    env = IntrinsicEnv()
+    env.evict_distance = None
+    env.reset(seed=4)
+    env._extend_world_right(256)
+    # a deep goal at the far end, as a wander target in a cave would be
+    env.ensure_generated(env.grid_width - 16, env.grid_width, env.grid_height)
+    rows = env.generated_rows.copy()
+    off = env.world_x_offset
+    tiles = sorted((x - off, y) for x, y in env.surface.walkable.items)
+    start = tiles[0]
+    goal = max((t for t in tiles if t[0] >= env.grid_width - 16), key=lambda t: t[1])
+    env.chunk_graph.next_segment(start, goal)
+
+    cs = env.chunk_graph.chunk_size
+    filled = np.flatnonzero(env.generated_rows != rows)
+    ends = [(x + off) // cs for x in (start[0], goal[0])]
+    assert all(any(abs((x + off) // cs - c) <= 1 for c in ends) for x in filled.tolist())
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from gym_intrinsic.intrinsic_env import IntrinsicEnv
+from gym_intrinsic.recording import FACINGS, EpisodeReader, EpisodeRecorder, pack_action, unpack_actions
+
+
+def test_actions_pack_round_trip():
+    actions = np.array(np.meshgrid(*[[0, 1]] * 5)).reshape(5, -1).T.astype(np.int8)
+    packed = np.array([pack_action(a) for a in actions], dtype=np.uint8)
+    np.testing.assert_array_equal(unpack_actions(packed), actions)
+
+
+def test_seek_matches_live_state_hashes(tmp_path):
+    path = tmp_path / "episode.irec"
+    env = IntrinsicEnv()
+    env.reset(seed=2)
+    env.passive_spawn_chance = 1.0
+    recorder = EpisodeRecorder(path, checkpoint_every=50)
+    recorder.attach(env)
+    hashes = {}
+    for action in np.random.default_rng(0).integers(0, 2, (300, 5)):
+        hashes[env.ticks] = env.state_hash()
+        env.step(action)
+    hashes[env.ticks] = env.state_hash()
+    recorder.close()
+
+    reader = EpisodeReader(path)
+    assert (reader.first_tick, reader.end_tick) == (0, 300)
+    replay = IntrinsicEnv()
+    for tick in (263, 0, 37, 50, 149, 300):
+        reader.seek(replay, tick)
+        assert replay.ticks == tick
+        assert replay.state_hash() == hashes[tick]
+
+    reader.seek(replay, 120)
+    while reader.advance(replay):
+        assert replay.state_hash() == hashes[replay.ticks]
+    assert replay.ticks == 300
+
+    with pytest.raises(ValueError):
+        reader.seek(replay, 301)
+
+
+def test_facing_and_hotbar_changes_are_replayed_without_checkpoints(tmp_path):
+    path = tmp_path / "episode.irec"
+    env = IntrinsicEnv()
+    env.reset(seed=2)
+    recorder = EpisodeRecorder(path, checkpoint_every=100)
+    recorder.attach(env)
+    rng = np.random.default_rng(3)
+    hashes = {}
+    for action in rng.integers(0, 2, (200, 5)):
+        # what the keyboard handler changes between ticks
+        env.player.facing = list(FACINGS[rng.integers(len(FACINGS))])
+        env.player.selected_slot = int(rng.integers(10))
+        hashes[env.ticks] = (env.state_hash(), tuple(env.player.facing), env.player.selected_slot)
+        env.step(action)
+    recorder.close()
+
+    reader = EpisodeReader(path)
+    assert sorted(reader.checkpoints) == [0, 100]
+    replay = IntrinsicEnv()
+    for tick in (0, 63, 100, 199):
+        reader.seek(replay, tick)
+        assert (replay.state_hash(), tuple(replay.player.facing), replay.player.selected_slot) == hashes[tick]
@@ -0,0 +1,30 @@
+import numpy as np
+
+from gym_intrinsic.intrinsic_env import IntrinsicEnv
+
+
+def _env():
+    env = IntrinsicEnv()
+    env.reset(seed=4)
+    env.passive_spawn_chance = 1.0
+    return env
+
+
+def test_step_repeat_matches_repeated_steps():
+    stepped, repeated = _env(), _env()
+    rng = np.random.default_rng(1)
+    for action, n in zip(rng.integers(0, 2, (40, 5)), rng.integers(1, 9, 40)):
+        total, events = 0.0, []
+        for _ in range(n):
+            obs, reward, done, _, info = stepped.step(action)
+            total += reward
+            events.append(info["events"])
+        obs_r, reward_r, done_r, _, info_r = repeated.step_repeat(action, n)
+
+        assert info_r["ticks"] == n and not done
+        assert repeated.ticks == stepped.ticks
+        assert repeated.state_hash() == stepped.state_hash()
+        np.testing.assert_array_equal(obs_r, obs)
+        assert reward_r == total and done_r == done
+        np.testing.assert_array_equal(info_r["events"], np.concatenate(events))
+        assert (repeated.camera_x, repeated.camera_y) == (stepped.camera_x, stepped.camera_y)
@@ -0,0 +1,16 @@
+import numpy as np
+
+from gym_intrinsic.surface import SurfaceIndex
+
+
+def test_incremental_surface_matches_rebuild(edited_env):
+    env = edited_env
+    rebuilt = SurfaceIndex(env)
+    rebuilt.rebuild()
+
+    np.testing.assert_array_equal(env.surface.heights, rebuilt.heights)
+    assert set(env.surface.walkable.items) == set(rebuilt.walkable.items)
+    chunks = {cx: set(c.items) for cx, c in env.surface.chunks.items() if len(c)}
+    assert chunks == {cx: set(c.items) for cx, c in rebuilt.chunks.items() if len(c)}
+    for tile in list(rebuilt.walkable.items)[::25]:
+        assert env.surface.region_size(tile) == rebuilt.region_size(tile)
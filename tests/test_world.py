@@ -0,0 +1,42 @@
+import numpy as np
+
+from gym_intrinsic.intrinsic_env import IntrinsicEnv
+
+
+def _env(surface_band_depth):
+    env = IntrinsicEnv()
+    env.surface_band_depth = surface_band_depth
+    env.evict_distance = None
+    env.reset(seed=11)
+    env._extend_world_right(64)
+    env._extend_world_left(32)
+    return env
+
+
+def _assert_same_world(a, b):
+    assert a.world_x_offset == b.world_x_offset
+    np.testing.assert_array_equal(a.grid, b.grid)
+    assert a.grid_hash == b.grid_hash
+    np.testing.assert_array_equal(a.fluids.level, b.fluids.level)
+    np.testing.assert_array_equal(a.surface.heights, b.surface.heights)
+    assert set(a.surface.walkable.items) == set(b.surface.walkable.items)
+    assert a.block_index.chunks == b.block_index.chunks
+    np.testing.assert_array_equal(a.lighting.sky, b.lighting.sky)
+    np.testing.assert_array_equal(a.lighting.block, b.lighting.block)
+
+
+def test_lazy_rows_match_eager_generation():
+    eager, lazy = _env(None), _env(8)
+    assert (lazy.generated_rows < lazy.grid_height).any()
+    lazy.ensure_generated(0, lazy.grid_width, lazy.grid_height)
+    _assert_same_world(lazy, eager)
+
+
+def test_lazy_rows_filled_piecewise_match_eager_generation():
+    eager, lazy = _env(None), _env(8)
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        x0 = int(rng.integers(0, lazy.grid_width))
+        lazy.ensure_generated(x0, x0 + int(rng.integers(1, 24)), int(rng.integers(0, lazy.grid_height)))
+    lazy.ensure_generated(0, lazy.grid_width, lazy.grid_height)
+    _assert_same_world(lazy, eager)